@@ -0,0 +1,35 @@
+"""Compare two benchmark results files stage by stage."""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('baseline', help='results file to compare against')
+    parser.add_argument('current', help='results file to compare')
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    current = json.loads(Path(args.current).read_text(encoding='utf-8'))
+    if baseline['params'] != current['params']:
+        print('Warning: the runs used different parameters.\n')
+
+    print(
+        f'{"stage":<22}{"baseline s":>12}{"current s":>12}{"speedup":>10}{"peak MB":>18}'
+    )
+    for name, stage in current['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            print(f'{name:<22}{"-":>12}{stage["best"]:>12.3f}')
+            continue
+        print(
+            f'{name:<22}{base["best"]:>12.3f}{stage["best"]:>12.3f}'
+            f'{base["best"] / stage["best"]:>9.2f}x'
+            f'{base["peak_mb"]:>9.1f} -> {stage["peak_mb"]:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Write synthetic Hyperion test stand CSV files for the benchmarks."""
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.time_parser import TIME_FORMAT
+
+# The raw headers written by the test stands, before DataLoader renames them
+HEADERS = [
+    'Time',
+    'Angular Intensity (mA/str)',
+    'Beam Voltage (kV)',
+    'Extractor Voltage (kV)',
+    'Extractor Current (uA)',
+    'Beam Supply Current (uA)',
+    'Lens #1 Current (uA)',
+    'Lens #1 Voltage (kV)',
+    'Total Current (uA)',
+    'Source Pressure (mBar)',
+]
+BLOCK_ROWS = 250_000
+MANIFEST_FILE = 'manifest.json'
+START_TIME = datetime(2025, 1, 6, 6, 0, 0)
+
+
+def _channels(rng: np.random.Generator, rows: int) -> dict[str, np.ndarray]:
+    """Slowly drifting channels with noise, rounded like the stand's logger."""
+
+    def walk(level: float, step: float, digits: int) -> np.ndarray:
+        return np.round(level + np.cumsum(rng.normal(0, step, rows)), digits)
+
+    pressure = 2e-9 * np.exp(np.cumsum(rng.normal(0, 1e-3, rows)))
+    return {
+        'Angular Intensity (mA/str)': walk(0.15, 1e-4, 4),
+        'Beam Voltage (kV)': walk(30.0, 1e-3, 3),
+        'Extractor Voltage (kV)': walk(5.5, 5e-4, 3),
+        'Extractor Current (uA)': walk(120.0, 0.05, 2),
+        'Beam Supply Current (uA)': walk(140.0, 0.05, 2),
+        'Lens #1 Current (uA)': walk(2.0, 1e-3, 3),
+        'Lens #1 Voltage (kV)': walk(12.0, 1e-3, 3),
+        'Total Current (uA)': walk(260.0, 0.1, 2),
+        'Source Pressure (mBar)': np.array([f'{p:.2E}' for p in pressure]),
+    }
+
+
+def _write_file(path: Path, start: datetime, rows: int, seed: int) -> None:
+    """Write one file in blocks, one timestamp per second."""
+    rng = np.random.default_rng(seed)
+    channels = _channels(rng, rows)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for first in range(0, rows, BLOCK_ROWS):
+            last = min(first + BLOCK_ROWS, rows)
+            times = pd.date_range(
+                start + timedelta(seconds=first), periods=last - first, freq='s'
+            )
+            block = pd.DataFrame({'Time': times.strftime(TIME_FORMAT)})
+            for name, values in channels.items():
+                block[name] = values[first:last]
+            block.to_csv(f, header=first == 0, index=False, columns=HEADERS)
+
+
+def generate_csvs(
+    out_dir: str | Path, files: int, rows: int, seed: int = 0
+) -> list[str]:
+    """
+    Write `files` CSV files of `rows` rows each, unless the same set is already there.
+
+    The files follow each other in time, like a stand's daily logs. A manifest
+    records how they were made, so repeated benchmark runs reuse them.
+
+    Args:
+        out_dir (str | Path): The directory to write to.
+        files (int): The number of files.
+        rows (int): The number of rows in each file.
+        seed (int): The random seed for the channel values.
+
+    Returns:
+        list[str]: The paths of the files, in time order.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = [out_dir / f'hyperion_{i:04d}.csv' for i in range(files)]
+    spec = {'files': files, 'rows': rows, 'seed': seed, 'headers': HEADERS}
+
+    manifest = out_dir / MANIFEST_FILE
+    if manifest.is_file() and all(path.is_file() for path in paths):
+        if json.loads(manifest.read_text(encoding='utf-8')) == spec:
+            return [str(path) for path in paths]
+
+    manifest.unlink(missing_ok=True)
+    for path in out_dir.glob('hyperion_*.csv'):
+        path.unlink()
+    for i, path in enumerate(paths):
+        _write_file(path, START_TIME + timedelta(seconds=i * rows), rows, seed + i)
+    manifest.write_text(json.dumps(spec), encoding='utf-8')
+
+    return [str(path) for path in paths]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('out_dir', help='directory to write the files to')
+    parser.add_argument('--files', type=int, default=1, help='number of files')
+    parser.add_argument('--rows', type=int, default=100_000, help='rows per file')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+
+    paths = generate_csvs(args.out_dir, args.files, args.rows, args.seed)
+    print(f'{len(paths)} files of {args.rows:,} rows in {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Check that loading CSV files peaks at close to the size of the loaded table.
+
+tests/test_memory.py runs the same check on small loads.
+"""
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.generate import generate_csvs
+from src.config import DEFAULT_CHUNK_ROWS, DEFAULT_WORKERS
+from src.csv_cache import CSVCache
+from src.loader import MAX_IN_FLIGHT_SHARE, DataLoader
+
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / 'hyperion_benchmark_data'
+# Peak traced memory of a load, as a multiple of the loaded table's size
+MAX_PEAK_RATIO = 1.25
+# On top of that, the parser output of this many chunks of the largest file, and
+# a fixed amount for pandas' first-use allocations, which matter in small loads
+CHUNK_ALLOWANCE = 3
+FIXED_ALLOWANCE_MB = 2
+# And with worker processes, this many times the parsed files the loader lets
+# them hand back at once, as they are briefly held twice while unpickled
+IN_FLIGHT_ALLOWANCE = 1.5
+
+
+def peak_memory(loader: DataLoader, file_paths: list[str]) -> tuple[int, int]:
+    """
+    Load `file_paths` under tracemalloc.
+
+    Only this process is traced. With several workers that includes the
+    parsed files that come back from the worker processes, but not the
+    memory the workers use to parse them. Memory-mapped cache files are not
+    traced either.
+
+    Args:
+        loader (DataLoader): The loader to run.
+        file_paths (list[str]): The CSV files to load.
+
+    Returns:
+        tuple[int, int]: The size of the loaded table and the peak traced
+            memory, in bytes.
+    """
+    tracemalloc.start()
+    try:
+        df = loader.load_data(file_paths)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if df is None:
+        raise RuntimeError('The files failed to load.')
+    return int(df.memory_usage(index=False, deep=True).sum()), peak
+
+
+def allowed_peak(
+    loader: DataLoader, table_bytes: int, max_ratio: float = MAX_PEAK_RATIO
+) -> float:
+    """
+    The most memory a finished load may have peaked at, in bytes.
+
+    `max_ratio` times the table, plus the chunk and fixed allowances, which keep
+    the bound meaningful for tables no bigger than a few chunks. Loads that
+    parse in worker processes also get room for the files in flight, up to
+    MAX_IN_FLIGHT_SHARE of the load or one file, whichever is more.
+
+    Args:
+        loader (DataLoader): The loader after its load.
+        table_bytes (int): The size of the loaded table.
+        max_ratio (float): The largest allowed peak / table size of big loads.
+    """
+    row_bytes = table_bytes / max(1, sum(loader.file_rows))
+    largest_file = max(loader.file_rows) * row_bytes
+    chunk = largest_file
+    if loader.chunk_rows:
+        chunk = min(chunk, loader.chunk_rows * row_bytes)
+    allowed = max_ratio * table_bytes + CHUNK_ALLOWANCE * chunk
+    allowed += FIXED_ALLOWANCE_MB * 1024**2
+    if min(loader.workers, len(loader.file_rows) - 1) > 1:
+        in_flight = max(MAX_IN_FLIGHT_SHARE * table_bytes, largest_file)
+        allowed += IN_FLIGHT_ALLOWANCE * in_flight
+    return allowed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=4, help='number of files')
+    parser.add_argument(
+        '--rows', type=int, default=500_000, help='rows per file (default: 500000)'
+    )
+    parser.add_argument(
+        '--max-ratio',
+        type=float,
+        default=MAX_PEAK_RATIO,
+        help=f'largest allowed peak / table size, before the allowances for '
+        f'chunks and files in flight (default: {MAX_PEAK_RATIO})',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'loader workers of the GUI load (default: {DEFAULT_WORKERS})',
+    )
+    parser.add_argument(
+        '--data-dir',
+        default=str(DEFAULT_DATA_DIR),
+        help='where the generated CSV files are kept between runs',
+    )
+    args = parser.parse_args()
+
+    file_paths = generate_csvs(Path(args.data_dir), args.files, args.rows)
+    print(f'{args.files} files x {args.rows:,} rows')
+
+    with tempfile.TemporaryDirectory() as scratch:
+        cache = CSVCache(cache_dir=Path(scratch) / 'csv_cache')
+        DataLoader(cache=cache).load_data(file_paths)  # fill the cache
+        loads = {
+            # The loader settings of the GUI, with a cache it hasn't seen the
+            # files in yet, and a single chunked worker. Both are checked.
+            'gui': DataLoader(
+                workers=args.workers,
+                cache=CSVCache(cache_dir=Path(scratch) / 'gui_cache'),
+                chunk_rows=DEFAULT_CHUNK_ROWS,
+            ),
+            'chunked': DataLoader(chunk_rows=DEFAULT_CHUNK_ROWS),
+            'whole files': DataLoader(),
+            'cached': DataLoader(cache=cache),
+        }
+        failed = []
+        for name, loader in loads.items():
+            table_bytes, peak = peak_memory(loader, file_paths)
+            allowed = allowed_peak(loader, table_bytes, args.max_ratio)
+            print(
+                f'{name:<12} table {table_bytes / 1024**2:8.1f} MB   '
+                f'peak {peak / 1024**2:8.1f} MB ({peak / table_bytes:.2f}x, '
+                f'allowed {allowed / 1024**2:.1f} MB)'
+            )
+            if name in ('gui', 'chunked') and peak > allowed:
+                failed.append(name)
+
+    for name in failed:
+        print(f'\nFAILED: the {name} load peaked above its allowed memory.')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
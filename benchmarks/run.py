@@ -0,0 +1,207 @@
+"""Time the load and plot pipeline on synthetic CSV files and save the results as JSON."""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from benchmarks.generate import generate_csvs
+from src.config import DEFAULT_WORKERS
+from src.csv_cache import CSVCache
+from src.export import ExportOptions, export_html
+from src.loader import DataLoader
+from src.plotter import Plotter
+
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / 'hyperion_benchmark_data'
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+TRACES = [
+    'Beam Voltage (V)',
+    'Extractor Current (μA)',
+    'Total Current (A)',
+    'Source Pressure (mBar)',
+]
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """
+    Time `func` `repeat` times, then run it once more under tracemalloc for its peak memory.
+
+    Args:
+        func (Callable[[], object]): The stage to measure.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: The timings in seconds and the peak traced memory in MB.
+    """
+    seconds: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+
+    # Timed separately, since tracing slows down the Python parts of a stage
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'best': min(seconds),
+        'median': statistics.median(seconds),
+        'peak_mb': peak / 1024**2,
+    }
+
+
+def run_benchmarks(
+    file_paths: list[str],
+    repeat: int,
+    workers: int,
+    downsample_mode: str | None,
+    out_dir: Path,
+) -> dict[str, dict]:
+    """
+    Measure each stage of loading and plotting `file_paths`.
+
+    Args:
+        file_paths (list[str]): The CSV files to load.
+        repeat (int): The number of timed runs per stage.
+        workers (int): The number of files `DataLoader` parses at the same time.
+        downsample_mode (str | None): Passed on to `Plotter`.
+        out_dir (Path): Scratch directory for the parse cache and HTML files.
+
+    Returns:
+        dict[str, dict]: The measurements of each stage, by stage name.
+    """
+    stages: dict[str, dict] = {}
+    cache = CSVCache(cache_dir=out_dir / 'csv_cache')
+    cache.clear()
+
+    def report(name: str, func: Callable[[], object]) -> None:
+        stages[name] = measure(func, repeat)
+        print(
+            f'{name:<22} best {stages[name]["best"]:8.3f} s   '
+            f'peak {stages[name]["peak_mb"]:9.1f} MB'
+        )
+
+    report('read_headers', lambda: DataLoader(cache=None).read_headers(file_paths))
+    report(
+        'load_data',
+        lambda: DataLoader(workers=workers, cache=None).load_data(file_paths),
+    )
+    DataLoader(cache=cache).load_data(file_paths)  # fill the cache
+    report(
+        'load_data_cached',
+        lambda: DataLoader(workers=workers, cache=cache).load_data(file_paths),
+    )
+
+    df = DataLoader(workers=workers, cache=None).load_data(file_paths)
+    plotter = Plotter('Benchmark', 'Time', TRACES, df, downsample_mode=downsample_mode)
+    report('create_fig', plotter.create_fig)
+
+    fig = plotter.create_fig()
+    html_path = out_dir / 'benchmark.html'
+    report('write_html', lambda: fig.write_html(html_path))
+    report(
+        'export_html',
+        lambda: export_html(fig, html_path, ExportOptions(shared_plotlyjs=True)),
+    )
+
+    cache.clear()
+    return stages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=4, help='number of files')
+    parser.add_argument(
+        '--rows', type=int, default=250_000, help='rows per file (default: 250000)'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='timed runs per stage (default: 3)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'loader workers (default: {DEFAULT_WORKERS})',
+    )
+    parser.add_argument(
+        '--downsample',
+        choices=('lttb', 'minmax', 'off'),
+        default='minmax',
+        help='downsampling for create_fig (default: minmax)',
+    )
+    parser.add_argument(
+        '--data-dir',
+        default=str(DEFAULT_DATA_DIR),
+        help='where the generated CSV files are kept between runs',
+    )
+    parser.add_argument(
+        '--output', help='results file (default: benchmarks/results/<time>.json)'
+    )
+    parser.add_argument('--label', default='', help='free text saved with the results')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    file_paths = generate_csvs(data_dir, args.files, args.rows)
+    total_bytes = sum(os.path.getsize(path) for path in file_paths)
+    print(
+        f'{args.files} files x {args.rows:,} rows '
+        f'({total_bytes / 1024**2:.1f} MB), {args.repeat} runs per stage'
+    )
+
+    with tempfile.TemporaryDirectory() as scratch:
+        stages = run_benchmarks(
+            file_paths,
+            args.repeat,
+            args.workers,
+            None if args.downsample == 'off' else args.downsample,
+            Path(scratch),
+        )
+
+    results = {
+        'label': args.label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'params': {
+            'files': args.files,
+            'rows': args.rows,
+            'bytes': total_bytes,
+            'repeat': args.repeat,
+            'workers': args.workers,
+            'downsample': args.downsample,
+        },
+        'system': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plotly': plotly.__version__,
+        },
+        'stages': stages,
+    }
+
+    output = RESULTS_DIR / f'{datetime.now():%Y%m%d_%H%M%S}.json'
+    if args.output:
+        output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f'Results saved to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Check how long the main window takes to appear and what it imports on the way."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+STARTUP_TARGET_SECONDS = 1.0
+# Must not be imported before the window is shown
+DEFERRED_MODULES = ('pandas', 'plotly', 'PySide6.QtWebEngineWidgets')
+# Written to stderr once the window is shown. Later imports are the warm-up's.
+SHOWN_MARKER = 'window shown'
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from PySide6.QtCore import QCoreApplication, Qt, QTimer
+from PySide6.QtWidgets import QApplication
+from src.gui.main_window import MainWindow
+QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+app = QApplication([])
+window = MainWindow(version='startup')
+window.show()
+loaded = [m for m in {deferred!r} if m in sys.modules]
+SHOWN_MARKER = {marker!r}
+def shown():
+    print(SHOWN_MARKER, file=sys.stderr, flush=True)
+    print(json.dumps({{'seconds': time.perf_counter() - start, 'loaded': loaded}}))
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """
+    Read the cost of each import from `python -X importtime`, up to the point
+    the window was shown.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+
+    Returns:
+        list[tuple[str, float, float]]: Module names with the seconds spent in
+            the module itself and including its imports, slowest first.
+    """
+    imports: list[tuple[str, float, float]] = []
+    for line in stderr.splitlines():
+        if line == SHOWN_MARKER:
+            break
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:') :].split('|')
+        imports.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return sorted(imports, key=lambda item: item[2], reverse=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--target',
+        type=float,
+        default=STARTUP_TARGET_SECONDS,
+        help=f'seconds to show the window in (default: {STARTUP_TARGET_SECONDS})',
+    )
+    parser.add_argument(
+        '--top', type=int, default=10, help='number of imports to list (default: 10)'
+    )
+    parser.add_argument(
+        '--offscreen', action='store_true', help='run without a display'
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    code = PROBE.format(deferred=DEFERRED_MODULES, marker=SHOWN_MARKER)
+    probe = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT_DIR,
+        env=env,
+    )
+    result_lines = [line for line in probe.stdout.splitlines() if line.startswith('{')]
+    if probe.returncode != 0 or not result_lines:
+        print(probe.stderr[-2000:])
+        print('The main window failed to start.')
+        return 1
+    result = json.loads(result_lines[-1])
+
+    print(f'Window shown after {result["seconds"]:.3f} s (target {args.target:.3f} s)')
+    print('\nSlowest imports before the window was shown (own / with imports):')
+    for name, own, cumulative in parse_importtime(probe.stderr)[: args.top]:
+        print(f'  {own:7.3f} s {cumulative:7.3f} s  {name}')
+
+    failed = False
+    if result['seconds'] > args.target:
+        print('\nFAILED: the window took longer than the target.')
+        failed = True
+    if result['loaded']:
+        print(f'\nFAILED: imported before the window was shown: {result["loaded"]}')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,32 @@
+import multiprocessing
 import sys
 from typing import NoReturn
 
-from PySide6.QtWidgets import QApplication
 
-from src.gui.main_window import MainWindow
+def run_app() -> NoReturn:
+    from PySide6.QtCore import QCoreApplication, Qt
+    from PySide6.QtWidgets import QApplication
 
+    from src.gui.main_window import MainWindow
 
-def run_app() -> NoReturn:
     version = '2.1.2'
-    app = QApplication([])
+    # Lets the plot viewer import QtWebEngine after the application is created
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)  # Qt takes its own options, such as -style
     window = MainWindow(version=version)  # Create the main window from main_window.py
     window.show()  # Show the window
     sys.exit(app.exec())  # Start the application's event loop
 
 
+def run_batch() -> NoReturn:
+    from src.cli import main
+
+    sys.exit(main(sys.argv[2:]))
+
+
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Needed for the loader's process pool in the EXE
+    # `batch jobs.json` renders the plots of a job list without opening the GUI
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        run_batch()
     run_app()
@@ -0,0 +1,365 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from src.config import DATA_DIR
+from src.csv_cache import DEFAULT_CACHE_DIR
+from src.loader import TAIL_PROBE_BYTES, DataLoader
+from src.time_parser import TIME_FORMAT
+
+CATALOG_VERSION = 1
+DEFAULT_CATALOG_PATH = Path(DEFAULT_CACHE_DIR).parent / 'catalog.sqlite3'
+# Files indexed between commits, so an interrupted update keeps its work
+COMMIT_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    headers TEXT,
+    header_signature TEXT,
+    rows INTEGER,
+    first_time TEXT,
+    last_time TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS files_by_time ON files (first_time, last_time);
+CREATE INDEX IF NOT EXISTS files_by_root ON files (root);
+"""
+
+
+@dataclass
+class CatalogEntry:
+    """What the catalog knows about one CSV file."""
+
+    path: str
+    size: int
+    headers: list[str] | None
+    header_signature: str | None
+    rows: int | None
+    first_time: datetime | None
+    last_time: datetime | None
+    error: str | None = None
+
+
+@dataclass
+class CatalogUpdate:
+    """What an update of the catalog found."""
+
+    scanned: int = 0
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    failed: int = 0
+
+
+class Catalog:
+    """
+    Index of the CSV files under a directory tree, kept in an SQLite database.
+
+    Each file's headers, row count and first and last 'Time' are recorded, so
+    the files of a stand and date range can be found without opening any of
+    them. `update` only reads files that are new or whose size or modification
+    time changed since the last update, so keeping the index of a large share
+    current is cheap once it has been built.
+    """
+
+    def __init__(self, db_path: str | Path = DEFAULT_CATALOG_PATH) -> None:
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')  # searches can run during an update
+        if conn.execute('PRAGMA user_version').fetchone()[0] != CATALOG_VERSION:
+            conn.execute('DROP TABLE IF EXISTS files')
+            conn.execute(f'PRAGMA user_version = {CATALOG_VERSION}')
+        conn.executescript(SCHEMA)
+        return conn
+
+    @staticmethod
+    def _parse_time(row: list[str], time_index: int) -> datetime | None:
+        try:
+            return datetime.strptime(row[time_index].strip(), TIME_FORMAT)
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _last_row(path: Path, size: int) -> list[str] | None:
+        """Read the last complete row of a file from its end."""
+        with path.open('rb') as f:
+            f.seek(max(0, size - TAIL_PROBE_BYTES))
+            block = f.read()
+        lines = block.decode('utf-8', errors='ignore').splitlines()
+        if not block.endswith(b'\n') and lines:
+            lines.pop()  # the writer is part way through a row
+        for line in reversed(lines):
+            if line.strip():
+                return next(csv.reader([line]))
+        return None
+
+    @staticmethod
+    def index_file(path: Path, size: int) -> CatalogEntry:
+        """
+        Read a file's headers, row count and first and last 'Time'.
+
+        Args:
+            path (Path): The CSV file.
+            size (int): The file's size in bytes.
+
+        Returns:
+            CatalogEntry: The file's entry. Files that can't be read, or have no
+                'Time' column, are recorded with an error.
+        """
+        entry = CatalogEntry(str(path), size, None, None, None, None, None)
+        try:
+            with path.open('r', encoding='utf-8', errors='ignore', newline='') as f:
+                reader = csv.reader(f)
+                headers = next(reader, None)
+                first_row = next(reader, None)
+            if not headers:
+                entry.error = 'The file is empty.'
+                return entry
+            entry.headers = headers
+            entry.header_signature = hashlib.sha1(
+                json.dumps(headers).encode('utf-8')
+            ).hexdigest()[:16]
+            entry.rows = DataLoader.count_rows(str(path))
+            if 'Time' not in headers:
+                entry.error = 'The file has no "Time" column.'
+                return entry
+            time_index = headers.index('Time')
+            if first_row is not None:
+                entry.first_time = Catalog._parse_time(first_row, time_index)
+            last_row = Catalog._last_row(path, size)
+            if last_row is not None:
+                entry.last_time = Catalog._parse_time(last_row, time_index)
+        except OSError as e:
+            entry.error = str(e)
+        return entry
+
+    @staticmethod
+    def _walk(root: Path, unreadable: list[str]) -> Iterator[os.DirEntry]:
+        """
+        Yield the CSV files under `root`. Folders that can't be read are skipped
+        and added to `unreadable`.
+        """
+        stack = [root]
+        while stack:
+            folder = stack.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for item in entries:
+                        if item.is_dir(follow_symlinks=False):
+                            stack.append(Path(item.path))
+                        elif item.name.lower().endswith('.csv'):
+                            yield item
+            except OSError as e:
+                print(f'Error reading a folder of the catalog: {e}')
+                unreadable.append(os.path.join(folder, ''))
+
+    def update(
+        self,
+        root: str | Path = DATA_DIR,
+        progress: Callable[[int, str], None] | None = None,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> CatalogUpdate:
+        """
+        Bring the catalog of a directory tree up to date.
+
+        Args:
+            root (str | Path): The directory to index.
+            progress (Callable[[int, str], None] | None): Called with the number
+                of files checked so far and the file being read.
+            cancelled (Callable[[], bool] | None): Checked between files. The
+                files indexed so far are kept.
+
+        Raises:
+            FileNotFoundError: If `root` is not a folder that can be reached.
+
+        Returns:
+            CatalogUpdate: How many files were added, updated and removed.
+        """
+        if not Path(root).is_dir():
+            raise FileNotFoundError(f'Can\'t reach the folder "{root}".')
+        root_key = str(Path(root))
+        result = CatalogUpdate()
+        with closing(self._connect()) as conn:
+            known = {
+                path: (size, mtime_ns)
+                for path, size, mtime_ns in conn.execute(
+                    'SELECT path, size, mtime_ns FROM files WHERE root = ?', (root_key,)
+                )
+            }
+            seen: set[str] = set()
+            unreadable: list[str] = []
+            pending = 0
+            for item in self._walk(Path(root), unreadable):
+                if cancelled is not None and cancelled():
+                    conn.commit()
+                    return result
+                result.scanned += 1
+                seen.add(item.path)
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                previous = known.get(item.path)
+                if previous == (stat.st_size, stat.st_mtime_ns):
+                    continue
+
+                if progress is not None:
+                    progress(result.scanned, item.path)
+                entry = self.index_file(Path(item.path), stat.st_size)
+                conn.execute(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        item.path,
+                        root_key,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        json.dumps(entry.headers) if entry.headers else None,
+                        entry.header_signature,
+                        entry.rows,
+                        entry.first_time.isoformat() if entry.first_time else None,
+                        entry.last_time.isoformat() if entry.last_time else None,
+                        entry.error,
+                    ),
+                )
+                result.failed += entry.error is not None
+                if previous is None:
+                    result.added += 1
+                else:
+                    result.updated += 1
+                pending += 1
+                if pending >= COMMIT_EVERY:
+                    conn.commit()
+                    pending = 0
+
+            # Files in folders that couldn't be read are kept, not counted as gone
+            gone = [
+                (path,)
+                for path in known
+                if path not in seen and not path.startswith(tuple(unreadable))
+            ]
+            conn.executemany('DELETE FROM files WHERE path = ?', gone)
+            result.removed = len(gone)
+            conn.commit()
+        return result
+
+    def find(
+        self,
+        stand: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[CatalogEntry]:
+        """
+        Look up the files whose rows overlap a time range.
+
+        Args:
+            stand (str | None): Only files with this text in their path, such as
+                a stand or serial number. Not case sensitive.
+            start (datetime | None): Only files with rows at or after this time.
+            end (datetime | None): Only files with rows at or before this time.
+
+        Returns:
+            list[CatalogEntry]: The matching readable files, oldest first.
+        """
+        conditions = [
+            'error IS NULL',
+            'first_time IS NOT NULL',
+            'last_time IS NOT NULL',
+        ]
+        params: list[str] = []
+        if stand:
+            escaped = (
+                stand.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            )
+            conditions.append("path LIKE ? ESCAPE '\\'")
+            params.append(f'%{escaped}%')
+        if start is not None:
+            conditions.append('last_time >= ?')
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append('first_time <= ?')
+            params.append(end.isoformat())
+
+        query = (
+            'SELECT path, size, headers, header_signature, rows, first_time, last_time '
+            f'FROM files WHERE {" AND ".join(conditions)} ORDER BY first_time, path'
+        )
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            CatalogEntry(
+                path=path,
+                size=size,
+                headers=json.loads(headers),
+                header_signature=signature,
+                rows=row_count,
+                first_time=datetime.fromisoformat(first_time),
+                last_time=datetime.fromisoformat(last_time),
+            )
+            for path, size, headers, signature, row_count, first_time, last_time in rows
+        ]
+
+    @staticmethod
+    def same_headers(entries: list[CatalogEntry]) -> list[CatalogEntry]:
+        """
+        Keep the entries with the most common headers, since only files with
+        the same headers can be loaded together.
+
+        Args:
+            entries (list[CatalogEntry]): Entries from `find`.
+
+        Returns:
+            list[CatalogEntry]: The entries that share the most common headers,
+                in their original order.
+        """
+        if not entries:
+            return []
+        counts = Counter(entry.header_signature for entry in entries)
+        signature = counts.most_common(1)[0][0]
+        return [entry for entry in entries if entry.header_signature == signature]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Index the stand CSV files, or look files up in the index.'
+    )
+    parser.add_argument('--db', default=str(DEFAULT_CATALOG_PATH), help='catalog file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    update = commands.add_parser('update', help='index new and changed files')
+    update.add_argument('root', nargs='?', default=DATA_DIR, help='folder to index')
+    find = commands.add_parser('find', help='list the files of a stand and time range')
+    find.add_argument('--stand', help='text the file paths must contain')
+    find.add_argument('--start', type=datetime.fromisoformat, help='YYYY-MM-DD[ HH:MM]')
+    find.add_argument('--end', type=datetime.fromisoformat, help='YYYY-MM-DD[ HH:MM]')
+    args = parser.parse_args()
+
+    catalog = Catalog(args.db)
+    if args.command == 'update':
+        result = catalog.update(args.root)
+        print(
+            f'{result.scanned:,} files checked: {result.added:,} added, '
+            f'{result.updated:,} updated, {result.removed:,} removed, '
+            f'{result.failed:,} unreadable'
+        )
+        return
+    for entry in catalog.find(args.stand, args.start, args.end):
+        print(f'{entry.first_time} - {entry.last_time}  {entry.rows:>9,}  {entry.path}')
+
+
+if __name__ == '__main__':
+    main()
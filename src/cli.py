@@ -0,0 +1,275 @@
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from src.config import DEFAULT_CHUNK_ROWS, DEFAULT_MAX_POINTS
+from src.csv_cache import CSVCache
+from src.derived import DerivedChannel, DerivedChannels
+from src.downsample import DOWNSAMPLE_MODES
+from src.export import ExportOptions, export_html
+from src.loader import DataLoader
+from src.plotter import Plotter
+from src.time_merge import DUPLICATE_MODES
+
+MAX_TRACES = 4
+
+
+@dataclass
+class PlotJob:
+    files: list[str]
+    traces: list[str]
+    output: str
+    x_axis: str = 'Time'
+    title: str = ''
+    start: datetime | None = None
+    end: datetime | None = None
+    derived: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    output: str
+    load_seconds: float = 0.0
+    plot_seconds: float = 0.0
+    rows: int = 0
+    error: str | None = None
+    files: list[str] = field(default_factory=list)
+
+
+def _parse_job_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def load_jobs(job_file: str) -> list[PlotJob]:
+    """
+    Read a JSON job list.
+
+    The file holds a list of objects with the keys "files" (a glob or a list of
+    globs), "traces" (up to four column names), "output" (the HTML file to
+    write) and optionally "x_axis", "title", "start" and "end" (ISO 8601
+    times such as "2025-04-01 08:00") to load only the rows between them, and
+    "derived", an object of derived channel names and expressions that
+    "traces" and "x_axis" can use (see `DerivedChannel`).
+    Relative globs and output paths are taken relative to the job file.
+
+    Args:
+        job_file (str): The path to the job list.
+
+    Raises:
+        ValueError: If the file is not a list of valid jobs.
+
+    Returns:
+        list[PlotJob]: The jobs in the order they appear in the file.
+    """
+    base_dir = Path(job_file).resolve().parent
+    with open(job_file, encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError('The job file must contain a list of jobs.')
+
+    jobs: list[PlotJob] = []
+    for i, entry in enumerate(entries, start=1):
+        try:
+            files = entry['files']
+            if isinstance(files, str):
+                files = [files]
+            job = PlotJob(
+                files=[str(base_dir / pattern) for pattern in files],
+                traces=list(entry['traces']),
+                output=str(base_dir / entry['output']),
+                x_axis=entry.get('x_axis', 'Time'),
+                title=entry.get('title', ''),
+                start=_parse_job_time(entry.get('start')),
+                end=_parse_job_time(entry.get('end')),
+                derived=dict(entry.get('derived', {})),
+            )
+            for name, expression in job.derived.items():
+                DerivedChannel(name, expression)  # fail before any file is read
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'Job {i} is missing or has an invalid key: {e}')
+        if not 1 <= len(job.traces) <= MAX_TRACES:
+            raise ValueError(f'Job {i} must have between 1 and {MAX_TRACES} traces.')
+        jobs.append(job)
+
+    return jobs
+
+
+def run_job(
+    job: PlotJob,
+    downsample_mode: str | None = 'minmax',
+    max_points: int = DEFAULT_MAX_POINTS,
+    use_cache: bool = True,
+    export_options: ExportOptions | None = None,
+    duplicates: str | None = None,
+) -> JobResult:
+    """
+    Load the files of one job and write its plot as HTML.
+
+    Only the plotted columns are read. Runs in a worker process, so errors are
+    returned in the result instead of raised.
+
+    Args:
+        job (PlotJob): The job to run.
+        downsample_mode (str | None): Passed on to `Plotter`.
+        max_points (int): Passed on to `Plotter`.
+        use_cache (bool): Read and fill the on-disk cache of parsed files.
+        export_options (ExportOptions | None): Passed on to `export_html`.
+        duplicates (str | None): Passed on to `DataLoader`.
+
+    Returns:
+        JobResult: The timings, or the error if the job failed.
+    """
+    result = JobResult(output=job.output)
+    try:
+        result.files = sorted(
+            {path for pattern in job.files for path in glob.glob(pattern)}
+        )
+        if not result.files:
+            raise FileNotFoundError(f'No files match {", ".join(job.files)}')
+
+        derived = DerivedChannels(path=None)
+        derived.set(
+            [DerivedChannel(name, expr) for name, expr in job.derived.items()],
+            save=False,
+        )
+        start = time.perf_counter()
+        loader = DataLoader(
+            cache=CSVCache() if use_cache else None,
+            chunk_rows=DEFAULT_CHUNK_ROWS,
+            duplicates=duplicates,
+            start=job.start,
+            end=job.end,
+        )
+        columns = derived.columns_for([*job.traces, job.x_axis])
+        df = loader.load_data(result.files, columns=columns)
+        if df is None or df.empty:
+            raise ValueError('Failed to load data from the matched files.')
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f'Columns not found: {", ".join(missing)}')
+        result.rows = len(df)
+        result.load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        traces = job.traces + ['None'] * (MAX_TRACES - len(job.traces))
+        plotter = Plotter(
+            job.title,
+            job.x_axis,
+            traces,
+            df,
+            downsample_mode=downsample_mode,
+            max_points=max_points,
+            derived=derived,
+        )
+        result.output = str(
+            export_html(plotter.create_fig(), job.output, export_options)
+        )
+        result.plot_seconds = time.perf_counter() - start
+    except Exception as e:
+        result.error = f'{type(e).__name__}: {e}'
+
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Render the plots of a job list without opening the GUI.
+
+    Args:
+        argv (list[str] | None): The arguments after `batch`, `sys.argv[1:]` if None.
+
+    Returns:
+        int: The exit code, 1 if any job failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog='hyperion_csv_viewer batch',
+        description='Write Hyperion CSV plots to HTML files from a JSON job list.',
+    )
+    parser.add_argument('job_file', help='JSON list of plot jobs')
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='number of jobs to run at the same time (default: CPU count)',
+    )
+    parser.add_argument(
+        '--downsample',
+        choices=(*DOWNSAMPLE_MODES, 'off'),
+        default='minmax',
+        help='how to reduce long traces (default: minmax)',
+    )
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        default=DEFAULT_MAX_POINTS,
+        help=f'points per trace when downsampling (default: {DEFAULT_MAX_POINTS})',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true', help='do not use the parsed file cache'
+    )
+    parser.add_argument(
+        '--duplicates',
+        choices=(*DUPLICATE_MODES, 'all'),
+        default='all',
+        help='which file to keep the rows of when files overlap in time (default: all)',
+    )
+    parser.add_argument(
+        '--inline-plotlyjs',
+        action='store_true',
+        help='embed plotly.js in every report instead of writing one shared copy '
+        'next to them',
+    )
+    parser.add_argument(
+        '--gzip', action='store_true', help='write gzip-compressed .html.gz reports'
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.job_file)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}')
+        return 2
+
+    downsample_mode = None if args.downsample == 'off' else args.downsample
+    export_options = ExportOptions(
+        shared_plotlyjs=not args.inline_plotlyjs, compress=args.gzip
+    )
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+        futures = [
+            pool.submit(
+                run_job,
+                job,
+                downsample_mode,
+                args.max_points,
+                not args.no_cache,
+                export_options,
+                None if args.duplicates == 'all' else args.duplicates,
+            )
+            for job in jobs
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error is not None:
+                failures += 1
+                print(f'FAILED {result.output}: {result.error}')
+                continue
+            print(
+                f'ok     {result.output}: {len(result.files)} files, '
+                f'{result.rows:,} rows, load {result.load_seconds:.2f} s, '
+                f'plot {result.plot_seconds:.2f} s'
+            )
+
+    print(
+        f'{len(jobs) - failures} of {len(jobs)} jobs succeeded in '
+        f'{time.perf_counter() - start:.2f} s'
+    )
+    return 1 if failures else 0
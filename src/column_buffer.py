@@ -0,0 +1,131 @@
+import numpy as np
+from pandas import DataFrame
+
+GROWTH_FACTOR = 1.5
+MIN_BLOCK_ROWS = 65_536
+
+
+class ColumnBuffer:
+    """
+    Column-wise row storage that grows in large blocks.
+
+    Rows are copied straight from each appended DataFrame into one NumPy array
+    per column, so building a table from many chunks or files never holds the
+    pieces and the finished table at the same time the way `pd.concat` does.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        """
+        Args:
+            capacity (int): The number of rows to allocate for up front, if known.
+        """
+        self.names: list[str] = []
+        self.arrays: list[np.ndarray] = []
+        self.rows: int = 0
+        self.capacity: int = capacity
+
+    def reserve(self, rows: int) -> None:
+        """Make room for at least `rows` rows in total."""
+        if rows <= self.capacity:
+            return
+        self.capacity = rows
+        for i, array in enumerate(self.arrays):
+            grown = np.empty(rows, dtype=array.dtype)
+            grown[: self.rows] = array[: self.rows]
+            self.arrays[i] = grown
+
+    def truncate(self, rows: int) -> None:
+        """Drop the rows past the first `rows`, keeping their capacity."""
+        self.rows = min(self.rows, max(0, rows))
+
+    def column(self, name: str) -> np.ndarray:
+        """View the filled rows of one column."""
+        return self.arrays[self.names.index(name)][: self.rows]
+
+    def take(self, indices: np.ndarray) -> None:
+        """
+        Reorder and drop rows in place, one column at a time, so at most one
+        extra column is held. The capacity is kept.
+
+        Args:
+            indices (np.ndarray): The rows to keep, in their new order.
+        """
+        for array in self.arrays:
+            array[: len(indices)] = array[: self.rows][indices]
+        self.rows = len(indices)
+
+    @staticmethod
+    def _common_dtype(current: np.dtype, new: np.dtype) -> np.dtype:
+        """The dtype that holds both, the way pd.concat would combine them."""
+        try:
+            dtype = np.result_type(current, new)
+        except TypeError:
+            return np.dtype(object)
+        # result_type happily combines datetimes with numbers, pandas would not
+        if (current.kind == 'M') != (new.kind == 'M') or dtype.kind in 'SU':
+            return np.dtype(object)
+        return dtype
+
+    def append(self, df: DataFrame) -> None:
+        """
+        Copy the rows of `df` onto the end of the buffer.
+
+        Args:
+            df (DataFrame): Rows with the same columns, in the same order, as the
+                rows already in the buffer.
+
+        Raises:
+            ValueError: If the columns don't match the columns already in the buffer.
+        """
+        names = [str(name) for name in df.columns]
+        if not self.arrays:
+            self.names = names
+            self.arrays = [
+                np.empty(self.capacity, dtype=df.iloc[:, i].to_numpy().dtype)
+                for i in range(len(names))
+            ]
+        elif names != self.names:
+            raise ValueError('Cannot append rows with different columns.')
+
+        end = self.rows + len(df)
+        if end > self.capacity:
+            self.reserve(max(end, int(self.capacity * GROWTH_FACTOR), MIN_BLOCK_ROWS))
+
+        for i in range(len(names)):
+            values = df.iloc[:, i].to_numpy()
+            array = self.arrays[i]
+            if values.dtype != array.dtype:
+                dtype = self._common_dtype(array.dtype, values.dtype)
+                if dtype != array.dtype:
+                    array = array.astype(dtype)
+                    self.arrays[i] = array
+            array[self.rows : end] = values
+        self.rows = end
+
+    def to_frame(self, trim: bool = True, start: int = 0) -> DataFrame:
+        """
+        Wrap the filled rows in a DataFrame without copying them.
+
+        Args:
+            trim (bool): Give back the unused capacity first. It is trimmed one
+                column at a time, so at most one extra column is held while the
+                finished table is built. Keep it for buffers that will grow
+                again; later appends never touch the rows already returned.
+            start (int): The first row to include, for example where the rows of
+                the latest file begin.
+
+        Returns:
+            DataFrame: The rows appended so far, from `start` on.
+        """
+        if trim:
+            for i, array in enumerate(self.arrays):
+                if len(array) != self.rows:
+                    self.arrays[i] = array[: self.rows].copy()
+            self.capacity = self.rows
+
+        df = DataFrame(
+            {i: array[start : self.rows] for i, array in enumerate(self.arrays)},
+            copy=False,
+        )
+        df.columns = self.names
+        return df
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+FLOAT32_DIGITS = 6  # significant decimal digits float32 always round-trips
+CATEGORY_MAX_RATIO = 0.5
+
+
+@dataclass
+class MemoryReport:
+    """The in-memory size of a loaded DataFrame, per column."""
+
+    column_bytes: dict[str, int]
+    rows: int
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.column_bytes.values())
+
+    @property
+    def total_mb(self) -> float:
+        return self.total_bytes / (1024**2)
+
+    def summary(self, top: int = 5) -> str:
+        """A short, human readable breakdown of the largest columns."""
+        largest = sorted(self.column_bytes.items(), key=lambda c: c[1], reverse=True)
+        lines = [f'{self.rows:,} rows, {self.total_mb:.2f} MB in memory']
+        lines += [f'  {name}: {size / 1024**2:.2f} MB' for name, size in largest[:top]]
+        return '\n'.join(lines)
+
+
+def memory_report(df: DataFrame) -> MemoryReport:
+    """
+    Measure how much memory each column of a DataFrame uses, including the
+    Python strings held by object columns.
+
+    Args:
+        df (DataFrame): The loaded data.
+
+    Returns:
+        MemoryReport: The per-column footprint.
+    """
+    usage = df.memory_usage(index=False, deep=True)
+    return MemoryReport(
+        column_bytes={str(name): int(size) for name, size in usage.items()},
+        rows=len(df),
+    )
+
+
+def _fits_float32(values: np.ndarray) -> bool:
+    """
+    Check that every value has at most FLOAT32_DIGITS significant digits, so
+    float32 reproduces the number written in the CSV file exactly.
+    """
+    magnitude = np.abs(values[np.isfinite(values) & (values != 0)])
+    if len(magnitude) == 0:
+        return True
+    float32 = np.finfo(np.float32)
+    if magnitude.max() > float32.max or magnitude.min() < float32.tiny:
+        return False
+    exponent = np.floor(np.log10(magnitude))
+    scaled = magnitude / 10.0 ** (exponent - (FLOAT32_DIGITS - 1))
+    return bool(np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6))
+
+
+def compact_frame(df: DataFrame) -> DataFrame:
+    """
+    Shrink a DataFrame's columns to smaller dtypes without changing any value.
+
+    - float64 columns whose values all fit in float32's precision become float32.
+    - int64 columns are downcast to the smallest integer type that holds them.
+    - Text columns with few distinct values become categoricals.
+    - 'Time' stays datetime64[ns], which is stored as an int64 epoch.
+
+    Args:
+        df (DataFrame): The loaded data. Modified in place.
+
+    Returns:
+        DataFrame: The same DataFrame, for chaining.
+    """
+    for name in df.columns.unique():
+        column = df[name]
+        if isinstance(column, DataFrame):
+            continue  # duplicate column names, leave them alone
+        if column.dtype == np.float64:
+            if _fits_float32(column.to_numpy()):
+                df[name] = column.astype(np.float32)
+        elif column.dtype == np.int64:
+            df[name] = pd.to_numeric(column, downcast='integer')
+        elif is_object_dtype(column.dtype) or is_string_dtype(column.dtype):
+            # Text is object before pandas 3 and str from it
+            if 0 < column.nunique(dropna=False) <= CATEGORY_MAX_RATIO * len(column):
+                df[name] = column.astype('category')
+    return df
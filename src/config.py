@@ -0,0 +1,35 @@
+"""
+Defaults and feature checks that are cheap to import.
+
+The main window is built from these before pandas, NumPy and plotly are
+loaded, so nothing here may import them.
+"""
+
+import importlib.util
+import os
+import sys
+
+# Where the test stands' CSV files are kept
+if hasattr(sys, 'frozen'):  # Check if running from the bundled app
+    DATA_DIR = r'C:\\teststanddata'
+else:
+    DATA_DIR = r'\\opdata2\Company\PRODUCTION FOLDER\Production History'
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+DEFAULT_MAX_POINTS = 10_000
+# Loads, plots and saves that run at the same time. Later ones wait their turn.
+DEFAULT_MAX_HEAVY_JOBS = 2
+
+
+def _installed(name: str) -> bool:
+    """Whether a module can be found, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:  # its parent package isn't installed either
+        return False
+
+
+PYARROW_AVAILABLE = _installed('pyarrow')
+# Installed, though its system libraries are only checked when it is imported.
+# False without PySide6, as for the batch mode run without Qt.
+WEBENGINE_INSTALLED = _installed('PySide6.QtWebEngineWidgets')
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from pandas import DataFrame
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+from src.stats import FileStats
+from src.time_merge import is_time_sorted
+from src.time_window import window_rows
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = (
+    Path(os.getenv('LOCALAPPDATA') or Path.home() / '.cache')
+    / 'hyperion_csv_viewer'
+    / 'csv_cache'
+)
+DEFAULT_MAX_BYTES = 2 * 1024**3
+META_FILE = 'meta.json'
+
+
+class CSVCache:
+    """
+    On-disk cache of parsed CSV files.
+
+    Each entry is a directory holding one `.npy` file per column plus a
+    `meta.json` describing the columns, so a cached file can be memory-mapped
+    column by column instead of being parsed again. Entries are keyed by the
+    file's resolved path, size and modification time, so an edited file simply
+    misses. Columns can be added to an entry later, so files loaded one column
+    at a time are cached one column at a time. Once the cache grows past
+    `max_bytes` the least recently used entries are removed.
+    """
+
+    def __init__(
+        self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry_dir(self, file_path: str) -> Path:
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        key = f'{CACHE_VERSION}|{path}|{stat.st_size}|{stat.st_mtime_ns}'
+        return self.cache_dir / hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _read_meta(self, entry: Path) -> dict:
+        return json.loads((entry / META_FILE).read_text(encoding='utf-8'))
+
+    def headers(self, file_path: str) -> list[str] | None:
+        """
+        Look up a cached file's raw headers without loading any columns.
+
+        Args:
+            file_path (str): The path to the original CSV file.
+
+        Returns:
+            list[str] | None: The CSV file's raw headers, or None if it is not cached.
+        """
+        try:
+            return self._read_meta(self._entry_dir(file_path))['headers']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def rows(self, file_path: str) -> int | None:
+        """
+        Look up the number of rows of a cached file without loading any columns.
+
+        Args:
+            file_path (str): The path to the original CSV file.
+
+        Returns:
+            int | None: The number of rows, or None if the file is not cached.
+        """
+        try:
+            return int(self._read_meta(self._entry_dir(file_path))['rows'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def stats(self, file_path: str) -> FileStats | None:
+        """
+        Look up the statistics recorded when a file was cached, without loading
+        any columns.
+
+        Args:
+            file_path (str): The path to the original CSV file.
+
+        Returns:
+            FileStats | None: The statistics of every row of the cached columns,
+                or None if the file is not cached or was cached without them.
+        """
+        try:
+            meta = self._read_meta(self._entry_dir(file_path))
+            return FileStats.from_dict(file_path, meta['stats'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _window_rows(
+        entry: Path, meta: dict, start: datetime | None, end: datetime | None
+    ) -> slice | np.ndarray | None:
+        """The rows of a cached file in a time window, or None if 'Time' isn't cached."""
+        for i, column in enumerate(meta['columns']):
+            if column['name'] == 'Time' and column['kind'] == 'numpy':
+                times = np.load(entry / f'{i}.npy', mmap_mode='r')
+                if times.dtype.kind != 'M':
+                    return None
+                time_sorted = meta.get('time_sorted')
+                if time_sorted is None:  # cached before the flag was recorded
+                    time_sorted = is_time_sorted(times)
+                return window_rows(times, start, end, time_sorted)
+        return None
+
+    def get(
+        self,
+        file_path: str,
+        columns: list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[DataFrame, list[str]] | None:
+        """
+        Load a cached file.
+
+        With a time window the rows are found from the cached 'Time' column,
+        by binary search if it is in order, and only they are read from the
+        memory-mapped columns.
+
+        Args:
+            file_path (str): The path to the original CSV file.
+            columns (list[str] | None): The columns to load, or None for every
+                cached column. Requested columns that aren't cached are left out.
+            start (datetime | None): Only load the rows at or after this time.
+            end (datetime | None): Only load the rows at or before this time.
+
+        Returns:
+            tuple[DataFrame, list[str]] | None: The cached data and the CSV file's
+                raw headers, or None if the file is not cached.
+        """
+        try:
+            entry = self._entry_dir(file_path)
+            meta = self._read_meta(entry)
+            rows: slice | np.ndarray | None = slice(None)
+            if start is not None or end is not None:
+                rows = self._window_rows(entry, meta, start, end)
+                if rows is None:
+                    return None
+            loaded = {}
+            for i, column in enumerate(meta['columns']):
+                if columns is not None and column['name'] not in columns:
+                    continue
+                values = np.load(entry / f'{i}.npy', mmap_mode='r')[rows]
+                if column['kind'] == 'object':
+                    values = values.astype(object)
+                    if column['has_nulls']:
+                        values[np.load(entry / f'{i}.nulls.npy')[rows]] = np.nan
+                loaded[column['name']] = values
+        except (OSError, ValueError, KeyError):
+            return None
+
+        os.utime(entry / META_FILE)  # mark the entry as recently used
+        df = DataFrame(loaded, copy=False)
+        return df, meta['headers']
+
+    @staticmethod
+    def _save_columns(entry: Path, df: DataFrame, first_index: int) -> list[dict]:
+        """
+        Save each column as its own `.npy` file. Columns numpy can't save without
+        pickling, such as object or pandas `str` columns of text, are stored as
+        fixed-width strings with a separate null mask.
+        """
+        columns = []
+        for i, (name, series) in enumerate(df.items(), start=first_index):
+            text = is_object_dtype(series.dtype) or is_string_dtype(series.dtype)
+            kind = 'object' if text else 'numpy'
+            has_nulls = False
+            if kind == 'object':
+                nulls = series.isna().to_numpy()
+                has_nulls = bool(nulls.any())
+                if has_nulls:
+                    np.save(entry / f'{i}.nulls.npy', nulls)
+                values = series.astype(str).to_numpy(dtype=str)
+            else:
+                values = series.to_numpy()
+            np.save(entry / f'{i}.npy', values, allow_pickle=False)
+            columns.append({'name': name, 'kind': kind, 'has_nulls': has_nulls})
+        return columns
+
+    def put(
+        self,
+        file_path: str,
+        df: DataFrame,
+        headers: list[str],
+        stats: FileStats | None = None,
+    ) -> None:
+        """
+        Store a parsed file, or add columns to a file that is already cached.
+
+        Args:
+            file_path (str): The path to the original CSV file.
+            df (DataFrame): The parsed data to cache. Columns already in the cache
+                are skipped.
+            headers (list[str]): The CSV file's raw headers.
+            stats (FileStats | None): The statistics of every row of the file,
+                kept so cache hits don't need to compute them.
+        """
+        try:
+            entry = self._entry_dir(file_path)
+        except OSError:
+            return
+
+        if entry.exists():
+            try:
+                meta = self._read_meta(entry)
+                cached = {column['name'] for column in meta['columns']}
+                new = df[[name for name in df.columns if name not in cached]]
+                if len(new.columns) == 0:
+                    return
+                meta['columns'] += self._save_columns(entry, new, len(meta['columns']))
+                if stats is not None and 'stats' in meta:
+                    channels = meta['stats']['channels']
+                    for name in new.columns:
+                        if name in stats.channels:
+                            channels[name] = stats.channels[name].to_list()
+                tmp_meta = entry / f'{META_FILE}.{os.getpid()}.tmp'
+                tmp_meta.write_text(json.dumps(meta), encoding='utf-8')
+                os.replace(tmp_meta, entry / META_FILE)
+            except OSError:
+                pass  # the cache dir isn't writable
+            except (ValueError, KeyError) as e:
+                print(f'Error caching columns of "{Path(file_path).name}": {e}')
+            return
+
+        tmp = entry.with_name(f'{entry.name}.{os.getpid()}.tmp')
+        try:
+            tmp.mkdir(parents=True, exist_ok=True)
+            times = df['Time'].to_numpy() if 'Time' in df.columns else None
+            meta = {
+                'headers': headers,
+                'rows': len(df),
+                'columns': self._save_columns(tmp, df, 0),
+                'time_sorted': (
+                    is_time_sorted(times)
+                    if times is not None and times.dtype.kind == 'M'
+                    else None
+                ),
+            }
+            if stats is not None:
+                meta['stats'] = stats.to_dict()
+            (tmp / META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+            tmp.rename(entry)
+        except OSError:
+            pass  # another process cached it first, or the cache dir isn't writable
+        except ValueError as e:
+            print(f'Error caching "{Path(file_path).name}": {e}')
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_bytes`."""
+        if not self.cache_dir.is_dir():
+            return
+
+        entries: list[tuple[float, int, Path]] = []
+        for entry in self.cache_dir.iterdir():
+            try:
+                last_used = (entry / META_FILE).stat().st_mtime
+                size = sum(f.stat().st_size for f in entry.iterdir())
+            except OSError:
+                continue
+            entries.append((last_used, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached file."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,293 @@
+import ast
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from pandas import DataFrame
+from pandas.api.types import is_numeric_dtype
+
+from src.config import DEFAULT_CHUNK_ROWS
+from src.csv_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_CHANNELS_PATH = Path(DEFAULT_CACHE_DIR).parent / 'derived_channels.json'
+# A column is written in braces, such as {Total Current (mA)}
+COLUMN_PATTERN = re.compile(r'\{([^{}]+)\}')
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+    ast.Mod: np.mod,
+}
+UNARY_OPERATORS = {ast.USub: np.negative, ast.UAdd: np.positive}
+FUNCTIONS = {
+    'abs': (np.abs, 1),
+    'sqrt': (np.sqrt, 1),
+    'log': (np.log, 1),
+    'log10': (np.log10, 1),
+    'exp': (np.exp, 1),
+    'min': (np.minimum, 2),
+    'max': (np.maximum, 2),
+}
+RESERVED_NAMES = ('None', 'Time')
+
+
+PLACEHOLDER_PATTERN = re.compile(r'_column(\d+)')
+
+
+def _column_name(index: int) -> str:
+    return f'_column{index}'
+
+
+def _unparse(node: ast.expr, columns: list[str]) -> str:
+    """Write part of an expression back out with its columns in braces."""
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: f'{{{columns[int(match.group(1))]}}}', ast.unparse(node)
+    )
+
+
+@dataclass
+class DerivedChannel:
+    """
+    A channel computed from loaded columns, such as a ratio or a unit conversion.
+
+    The expression uses + - * / ** %, numbers, the functions in FUNCTIONS and
+    columns written in braces, for example
+    `{Angular Intensity (mA/sr)} / {Total Current (mA)}`. It is checked when
+    the channel is created and never passed to `eval`.
+
+    Raises:
+        ValueError: If the name is taken or the expression can't be used.
+    """
+
+    name: str
+    expression: str
+    columns: tuple[str, ...] = field(init=False)
+    _tree: ast.expr = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name = self.name.strip()
+        if not self.name:
+            raise ValueError('The channel needs a name.')
+        if self.name in RESERVED_NAMES or '{' in self.name or '}' in self.name:
+            raise ValueError(f'"{self.name}" can\'t be used as a channel name.')
+
+        columns: dict[str, str] = {}
+
+        def replace(match: re.Match) -> str:
+            column = match.group(1).strip()
+            if column not in columns:
+                columns[column] = _column_name(len(columns))
+            return columns[column]
+
+        source = COLUMN_PATTERN.sub(replace, self.expression.strip())
+        if not columns:
+            raise ValueError('The expression must use at least one {column}.')
+        try:
+            tree = ast.parse(source, mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f'Invalid expression: {e.msg}') from None
+        _check(tree, list(columns))
+        self.columns = tuple(columns)
+        self._tree = tree
+
+    def evaluate(
+        self, df: DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> np.ndarray:
+        """
+        Compute the channel for every row of the loaded data.
+
+        The rows are worked through `chunk_rows` at a time with NumPy, so the
+        intermediate arrays of a long expression stay the size of one chunk
+        and only the float64 result is the size of the data.
+
+        Args:
+            df (DataFrame): The loaded data, with every column in `columns`.
+            chunk_rows (int): The rows computed at a time.
+
+        Raises:
+            ValueError: If a column is missing or isn't numeric.
+
+        Returns:
+            np.ndarray: The values as float64. Division by zero gives inf or NaN.
+        """
+        arrays: list[np.ndarray] = []
+        for column in self.columns:
+            if column not in df.columns:
+                raise ValueError(f'Column not found: {column}')
+            if not is_numeric_dtype(df[column].dtype):
+                raise ValueError(f'Column is not numeric: {column}')
+            arrays.append(df[column].to_numpy())
+
+        result = np.empty(len(df), dtype=np.float64)
+        with np.errstate(all='ignore'):
+            for first in range(0, len(df), chunk_rows):
+                rows = slice(first, first + chunk_rows)
+                values = {
+                    _column_name(i): array[rows].astype(np.float64, copy=False)
+                    for i, array in enumerate(arrays)
+                }
+                result[rows] = _evaluate(self._tree, values)
+        return result
+
+
+def _check(node: ast.expr, columns: list[str]) -> None:
+    """
+    Raises:
+        ValueError: If the expression uses anything other than numbers, columns,
+            the operators in BINARY_OPERATORS and UNARY_OPERATORS and FUNCTIONS.
+    """
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        _check(node.left, columns)
+        _check(node.right, columns)
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        _check(node.operand, columns)
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f'Only numbers can be used, not {node.value!r}.')
+    elif isinstance(node, ast.Name):
+        match = PLACEHOLDER_PATTERN.fullmatch(node.id)
+        if match is None or int(match.group(1)) >= len(columns):
+            raise ValueError(f'Unknown name "{node.id}". Write columns in braces.')
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f'Unknown function. Use one of: {", ".join(FUNCTIONS)}.')
+        _, arity = FUNCTIONS[node.func.id]
+        if node.keywords or len(node.args) != arity:
+            raise ValueError(f'{node.func.id}() takes {arity} argument(s).')
+        for arg in node.args:
+            _check(arg, columns)
+    else:
+        raise ValueError(
+            f'"{_unparse(node, columns)}" is not allowed in an expression.'
+        )
+
+
+def _evaluate(node: ast.expr, values: dict[str, np.ndarray]) -> np.ndarray | float:
+    """Evaluate an expression checked by `_check` over one chunk of rows."""
+    if isinstance(node, ast.BinOp):
+        operator = BINARY_OPERATORS[type(node.op)]
+        return operator(_evaluate(node.left, values), _evaluate(node.right, values))
+    if isinstance(node, ast.UnaryOp):
+        return UNARY_OPERATORS[type(node.op)](_evaluate(node.operand, values))
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        return values[node.id]
+    function, _ = FUNCTIONS[node.func.id]
+    return function(*(_evaluate(arg, values) for arg in node.args))
+
+
+class DerivedChannels:
+    """
+    The user's derived channels and their values for the loaded data.
+
+    A channel's values are computed the first time it is plotted and kept
+    until `data_version` changes, like the figures in `FigureCache`. Shared
+    between the GUI thread and plot workers.
+    """
+
+    def __init__(self, path: str | Path | None = DEFAULT_CHANNELS_PATH) -> None:
+        """
+        Args:
+            path (str | Path | None): The JSON file the channels are saved in,
+                or None to keep them in memory only.
+        """
+        self.path = Path(path) if path is not None else None
+        self.channels: dict[str, DerivedChannel] = {}
+        self._values: dict[str, tuple[int, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Read the saved channels. Ones that can no longer be parsed are skipped."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f'Error reading derived channels from {self.path}: {e}')
+            return
+        channels: list[DerivedChannel] = []
+        for name, expression in saved.items():
+            try:
+                channels.append(DerivedChannel(name, expression))
+            except ValueError as e:
+                print(f'Skipping derived channel "{name}": {e}')
+        self.set(channels, save=False)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        saved = {name: channel.expression for name, channel in self.channels.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(saved, indent=2), encoding='utf-8')
+        except OSError as e:
+            print(f'Error saving derived channels to {self.path}: {e}')
+
+    def set(self, channels: list[DerivedChannel], save: bool = True) -> None:
+        """Replace the channels, dropping the values of any whose expression changed."""
+        with self._lock:
+            old = self.channels
+            self.channels = {channel.name: channel for channel in channels}
+            for name in list(self._values):
+                if name not in self.channels or old[name] != self.channels[name]:
+                    del self._values[name]
+        if save:
+            self.save()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.channels
+
+    def available(self, headers: list[str]) -> list[str]:
+        """The channels that can be computed from `headers`."""
+        present = set(headers)
+        return [
+            name
+            for name, channel in self.channels.items()
+            if name not in present and present.issuperset(channel.columns)
+        ]
+
+    def columns_for(self, names: list[str]) -> list[str]:
+        """
+        Replace each derived channel in `names` with the columns it is computed
+        from. Other names are kept as they are.
+        """
+        columns: list[str] = []
+        for name in names:
+            channel = self.channels.get(name)
+            columns.extend(channel.columns if channel is not None else [name])
+        return list(dict.fromkeys(columns))
+
+    def values(self, name: str, df: DataFrame, data_version: int) -> np.ndarray:
+        """
+        The values of a channel for the loaded data, computed once per data version.
+
+        Args:
+            name (str): The channel.
+            df (DataFrame): The loaded data.
+            data_version (int): Changes whenever the loaded data does.
+
+        Raises:
+            KeyError: If there is no channel called `name`.
+            ValueError: If the channel can't be computed from `df`.
+
+        Returns:
+            np.ndarray: One float64 value per row. Read only.
+        """
+        with self._lock:
+            channel = self.channels[name]
+            cached = self._values.get(name)
+        if cached is not None and cached[0] == data_version:
+            return cached[1]
+
+        values = channel.evaluate(df)
+        values.flags.writeable = False  # shared by every plot of this data
+        with self._lock:
+            if self.channels.get(name) is channel:
+                self._values[name] = (data_version, values)
+        return values
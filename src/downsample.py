@@ -0,0 +1,131 @@
+import numpy as np
+
+DOWNSAMPLE_MODES = ('lttb', 'minmax')
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    """View datetimes as their int64 epoch and cast everything to float64."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.view(np.int64)
+    return values.astype(np.float64, copy=False)
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Split the rows into n_out / 2 equal buckets and keep the minimum and the
+    maximum of each one, so a single-sample spike or arc event always survives.
+
+    Args:
+        y (np.ndarray): The trace values.
+        n_out (int): The maximum number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted row indices to keep.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 2:
+        return np.arange(n)
+
+    n_buckets = max(1, (n_out - 2) // 2)  # leave room for the first and last rows
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+
+    y = _as_float(y)
+    nan = np.isnan(y)
+    y_low = np.where(nan, np.inf, y)
+    y_high = np.where(nan, -np.inf, y)
+    mins = np.minimum.reduceat(y_low, edges[:-1])
+    maxs = np.maximum.reduceat(y_high, edges[:-1])
+
+    def first_in_bucket(mask: np.ndarray) -> np.ndarray:
+        rows = np.flatnonzero(mask)
+        _, first = np.unique(bucket[rows], return_index=True)
+        return rows[first]
+
+    keep = np.concatenate(
+        [
+            first_in_bucket(y_low == mins[bucket]),
+            first_in_bucket(y_high == maxs[bucket]),
+            [0, n - 1],
+        ]
+    )
+    return np.unique(keep)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of n_out - 2 equal buckets
+    in between, the point that forms the largest triangle with the point kept
+    from the previous bucket and the average of the next bucket. The bucket
+    averages are computed up front in one vectorized pass. Rows where x or y
+    is not finite are dropped.
+
+    Args:
+        x (np.ndarray): The shared x axis values.
+        y (np.ndarray): The trace values.
+        n_out (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted row indices to keep.
+    """
+    if len(y) <= n_out or n_out < 3:
+        return np.arange(len(y))
+
+    x = _as_float(x)
+    y = _as_float(y)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    n = len(valid)
+    if n <= n_out:
+        return valid
+
+    x = x[valid]
+    y = y[valid]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / counts
+    # The last bucket looks ahead to the last point
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return valid[keep]
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, mode: str) -> np.ndarray:
+    """
+    Pick the rows of one trace to send to plotly.
+
+    Args:
+        x (np.ndarray): The shared x axis values. Non-numeric x axes fall back
+            to the row number for LTTB's triangle areas.
+        y (np.ndarray): The trace values. Non-numeric traces are not downsampled.
+        n_out (int): The point budget for the trace.
+        mode (str): 'lttb' or 'minmax'.
+
+    Returns:
+        np.ndarray: The sorted row indices to keep.
+    """
+    if mode not in DOWNSAMPLE_MODES:
+        raise ValueError(f'Unknown downsampling mode "{mode}".')
+    if not (np.issubdtype(y.dtype, np.number) or np.issubdtype(y.dtype, np.bool_)):
+        return np.arange(len(y))
+    if mode == 'minmax':
+        return minmax_indices(y, n_out)
+    if not (np.issubdtype(x.dtype, np.number) or np.issubdtype(x.dtype, np.datetime64)):
+        x = np.arange(len(x))
+    return lttb_indices(x, y, n_out)
@@ -0,0 +1,145 @@
+import base64
+import gzip
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import plotly
+import plotly.io as pio
+from plotly.graph_objects import Figure
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+PLOTLYJS_FILE = f'plotly-{plotly.__version__}.min.js'
+PLOTLYJS_VERSION = tuple(int(part) for part in get_plotlyjs_version().split('.')[:2])
+# plotly.js decodes base64 typed arrays ('bdata') from 2.28, bundled since plotly 5.19
+TYPED_ARRAYS = PLOTLYJS_VERSION >= (2, 28)
+
+
+@dataclass
+class ExportOptions:
+    shared_plotlyjs: bool = False
+    binary_arrays: bool = True
+    compress: bool = False
+
+
+def _encode_times(values: np.ndarray) -> dict | np.ndarray:
+    """
+    Encode datetime64 values as epoch milliseconds, as a plotly.js typed array
+    if the bundled plotly.js can decode one, or else as plain numbers.
+    """
+    ms = values.astype('datetime64[ms]').view('i8').astype('f8')
+    ms[np.isnat(values)] = np.nan
+    if not TYPED_ARRAYS:
+        return ms  # written out as a list of numbers
+    return {'dtype': 'f8', 'bdata': base64.b64encode(ms).decode('ascii')}
+
+
+def encode_figure(fig: Figure, binary_arrays: bool = True) -> dict:
+    """
+    Convert a figure to the dict that is written out as JSON.
+
+    plotly 6 and later base64-encode numeric arrays, but write datetime
+    arrays as one ISO string per point. With `binary_arrays` these are encoded
+    as epoch milliseconds on a date axis instead, which is several times
+    smaller and faster to write and to load in plotly.js. Older plotly
+    versions bundle a plotly.js that can't decode base64 arrays, so there the
+    milliseconds are written as plain numbers, which is still smaller than
+    the strings.
+
+    Args:
+        fig (Figure): The figure to convert. It is not modified.
+        binary_arrays (bool): Encode datetime x values as binary numbers.
+
+    Returns:
+        dict: The figure's data and layout, ready for `plotly.io` with
+            `validate=False`.
+    """
+    fig_dict = fig.to_dict()
+    if not binary_arrays:
+        return fig_dict
+
+    for trace in fig_dict['data']:
+        x = trace.get('x')
+        if isinstance(x, np.ndarray) and np.issubdtype(x.dtype, np.datetime64):
+            trace['x'] = _encode_times(x)
+            # Numbers are only read as dates on an axis that is declared as one
+            axis = 'xaxis' + trace.get('xaxis', 'x')[1:]
+            fig_dict['layout'].setdefault(axis, {})['type'] = 'date'
+    return fig_dict
+
+
+def figure_to_json(fig: Figure, binary_arrays: bool = True) -> str:
+    """
+    Serialize a figure with `encode_figure`.
+
+    Args:
+        fig (Figure): The figure to serialize.
+        binary_arrays (bool): Encode datetime x values as binary numbers.
+
+    Returns:
+        str: The figure as JSON.
+    """
+    return pio.to_json(encode_figure(fig, binary_arrays), validate=False)
+
+
+def write_plotlyjs(directory: str | Path) -> Path:
+    """
+    Write the plotly.js bundle into a directory unless it is already there.
+
+    The file name includes the plotly version, so reports written by different
+    versions never share an incompatible bundle. Safe to call from several
+    processes at once.
+
+    Args:
+        directory (str | Path): The directory the reports are written to.
+
+    Returns:
+        Path: The bundle.
+    """
+    path = Path(directory) / PLOTLYJS_FILE
+    if not path.is_file():
+        temp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        temp.write_text(get_plotlyjs(), encoding='utf-8')
+        os.replace(temp, path)
+    return path
+
+
+def export_html(
+    fig: Figure, save_loc: str | Path, options: ExportOptions | None = None
+) -> Path:
+    """
+    Write a figure to an HTML file.
+
+    Args:
+        fig (Figure): The figure to write.
+        save_loc (str | Path): The file to write. With `compress`, '.gz' is
+            appended unless it already ends with it.
+        options (ExportOptions | None): How to write it. The defaults inline
+            plotly.js, encode arrays in binary and don't compress.
+
+    Returns:
+        Path: The file that was written.
+    """
+    options = options or ExportOptions()
+    path = Path(save_loc)
+    os.makedirs(path.parent, exist_ok=True)
+
+    include_plotlyjs: bool | str = True
+    if options.shared_plotlyjs:
+        include_plotlyjs = write_plotlyjs(path.parent).name
+
+    html = pio.to_html(
+        encode_figure(fig, options.binary_arrays),
+        include_plotlyjs=include_plotlyjs,
+        validate=False,
+    )
+
+    if options.compress:
+        if path.suffix != '.gz':
+            path = path.with_name(f'{path.name}.gz')
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(html)
+    else:
+        path.write_text(html, encoding='utf-8')
+    return path
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # only imported by the plot workers, not at startup
+    from plotly.graph_objects import Figure
+
+DEFAULT_MAX_FIGURES = 8
+
+
+@dataclass(frozen=True)
+class FigureKey:
+    data_version: int
+    x_axis: str
+    traces: tuple[str, ...]
+    title: str
+    downsample_mode: str | None
+    max_points: int
+    render_mode: str
+    start: datetime | None = None
+    end: datetime | None = None
+
+
+@dataclass
+class CachedFigure:
+    fig: Figure
+    json: str | None = None
+
+
+class FigureCache:
+    """
+    Keep the most recently built figures so plotting and saving the same
+    selection again skips rebuilding them.
+
+    Entries are keyed by `FigureKey`, whose `data_version` must change whenever
+    the loaded data does. The least recently used entry is dropped once
+    `max_figures` are held. Shared between the GUI thread and plot workers.
+    """
+
+    def __init__(self, max_figures: int = DEFAULT_MAX_FIGURES) -> None:
+        self.max_figures = max_figures
+        self._entries: OrderedDict[FigureKey, CachedFigure] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: FigureKey) -> CachedFigure | None:
+        """
+        Look up a figure and mark it as the most recently used.
+
+        Args:
+            key (FigureKey): The plot settings and data version.
+
+        Returns:
+            CachedFigure | None: The cached figure, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: FigureKey, fig: Figure) -> CachedFigure:
+        """
+        Add a figure, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (FigureKey): The plot settings and data version.
+            fig (Figure): The figure built for them.
+
+        Returns:
+            CachedFigure: The new entry.
+        """
+        entry = CachedFigure(fig)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_figures:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drop every cached figure."""
+        with self._lock:
+            self._entries.clear()
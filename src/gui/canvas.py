@@ -1,32 +1,212 @@
 from pathlib import Path
 
-from PySide6.QtWidgets import QLabel, QTextEdit, QVBoxLayout, QWidget
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+from PySide6.QtWidgets import QHeaderView, QLabel, QTreeView, QVBoxLayout, QWidget
 
-from src.loader import DataLoader
+from src.scheduler import JobHandle, JobScheduler
+from src.threaded_stat import FileSizeWorker
+
+
+class FileListModel(QAbstractTableModel):
+    """
+    The selected files with their size, rows and columns as they become known.
+
+    Views only ask for the rows they show, so a list of thousands of files
+    costs no more to display than a short one.
+    """
+
+    HEADERS = ('File', 'Size (MB)', 'Rows', 'Columns')
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.paths: list[str] = []
+        self.names: list[str] = []
+        self.sizes: list[int | None] = []  # bytes, -1 if the file can't be read
+        self.rows: list[int | None] = []
+        self.columns: int | None = None  # loaded
+        self.total_columns: int | None = None  # in the files, if more are there
+        self.total_bytes: int = 0
+        self.sized: int = 0
+
+    def set_files(self, paths: list[str]) -> None:
+        self.beginResetModel()
+        self.paths = list(paths)
+        self.names = [Path(path).name for path in paths]
+        self.sizes = [None] * len(paths)
+        self.rows = [None] * len(paths)
+        self.columns = self.total_columns = None
+        self.total_bytes = self.sized = 0
+        self.endResetModel()
+
+    def set_sizes(self, first: int, sizes: list[int]) -> None:
+        for index, size in enumerate(sizes, start=first):
+            previous = self.sizes[index]
+            if previous is None:
+                self.sized += 1
+            else:
+                self.total_bytes -= max(previous, 0)
+            self.total_bytes += max(size, 0)
+            self.sizes[index] = size
+        self._changed(first, first + len(sizes) - 1, 1)
+
+    def set_rows(self, rows: list[int]) -> None:
+        self.rows = list(rows) + [None] * (len(self.paths) - len(rows))
+        self._changed(0, len(self.paths) - 1, 2)
+
+    def set_columns(self, columns: int, total_columns: int | None = None) -> None:
+        self.columns = columns
+        self.total_columns = total_columns if total_columns != columns else None
+        self._changed(0, len(self.paths) - 1, 3)
+
+    def _changed(self, first: int, last: int, column: int) -> None:
+        if last >= first:
+            self.dataChanged.emit(self.index(first, column), self.index(last, column))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.paths)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.paths[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if column == 0:
+            return self.names[row]
+        if column == 1:
+            size = self.sizes[row]
+            if size is None:
+                return '...'
+            return f'{size / 1024**2:.2f}' if size >= 0 else '?'
+        if column == 3 and self.total_columns is not None:
+            return f'{self.columns:,} of {self.total_columns:,}'
+        value = self.rows[row] if column == 2 else self.columns
+        return f'{value:,}' if value is not None else ''
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return self.HEADERS[section]
+        return None
 
 
 class Canvas(QWidget):
-    def __init__(self) -> None:
+    def __init__(self, scheduler: JobScheduler) -> None:
         super().__init__()
+        self.scheduler = scheduler
+        self.size_job: JobHandle | None = None
+        self.memory_mb: float | None = None
+        self.summary: str = ''
 
         self.label = QLabel('0 files selected (0 MB)')
-        self.text_display = QTextEdit()
-        self.text_display.setReadOnly(True)
-        self.text_display.setStyleSheet("""
+        self.label.setWordWrap(True)
+        self.model = FileListModel(self)
+        self.file_view = QTreeView()
+        self.file_view.setModel(self.model)
+        self.file_view.setRootIsDecorated(False)
+        self.file_view.setUniformRowHeights(True)  # lets the view skip measuring rows
+        self.file_view.setStyleSheet("""
             color: lightgreen;
         """)
+        header = self.file_view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((1, 70), (2, 75), (3, 60)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(column, width)
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.label)
-        layout.addWidget(self.text_display)
-
-    def display_csv_files(self, file_list) -> None:
-        """Call this method to update the display with a list of CSV filenames."""
-        self.text_display.clear()
-        data_size: float = DataLoader.get_total_file_size(file_list)
-        filenames: list[str] = [Path(path).name for path in file_list]
-        self.text_display.append('\n'.join(filenames))
-        if len(file_list) == 1:
-            self.label.setText(f'{len(file_list)} file selected ({data_size:.2f} MB)')
-        else:
-            self.label.setText(f'{len(file_list)} files selected ({data_size:.2f} MB)')
+        layout.addWidget(self.file_view)
+
+    def set_files(self, file_list: list[str]) -> None:
+        """
+        Show a new list of files straight away and look up their sizes in the
+        background. The totals fill in as the sizes arrive.
+        """
+        self.model.set_files(file_list)
+        self.memory_mb = None
+        self.summary = ''
+        self._update_label()
+        self.update_sizes()
+
+    def update_sizes(self) -> None:
+        """Look up the sizes of the files shown again, such as files being followed."""
+        worker = FileSizeWorker(self.model.paths)
+        worker.sizes_found.connect(self._handle_sizes_found)
+        self.size_job = self.scheduler.submit(worker, key='file_sizes', heavy=False)
+
+    def _handle_sizes_found(self, first: int, sizes: list[int]) -> None:
+        if self.size_job is None or self.sender() is not self.size_job.job:
+            return  # sizes of a list that has since been replaced
+        self.model.set_sizes(first, sizes)
+        self._update_label()
+
+    def _update_label(self) -> None:
+        files = self.model.rowCount()
+        size_text = f'{self.model.total_bytes / 1024**2:.2f} MB'
+        if self.model.sized < files:
+            size_text += f' so far, {self.model.sized:,} of {files:,} sized'
+        if self.memory_mb is not None:
+            size_text += f', {self.memory_mb:.2f} MB in memory'
+        noun = 'file' if files == 1 else 'files'
+        self.label.setText(f'{files:,} {noun} selected ({size_text}){self.summary}')
+
+    def display_csv_files(
+        self,
+        file_list,
+        cache_hits: int | None = None,
+        cache_misses: int | None = None,
+        memory_mb: float | None = None,
+        rows_dropped: int = 0,
+        file_rows: list[int] | None = None,
+        columns: int | None = None,
+        total_columns: int | None = None,
+    ) -> None:
+        """
+        Call this method to update the display with a list of CSV filenames.
+
+        The list is only rebuilt, and the sizes looked up again, if `file_list`
+        differs from the files already shown. `columns` is the number of columns
+        loaded and `total_columns` the number in the files, when columns are
+        loaded on demand.
+        """
+        if list(file_list) != self.model.paths:
+            self.set_files(file_list)
+        if file_rows is not None:
+            self.model.set_rows(file_rows)
+        if columns is not None:
+            self.model.set_columns(columns, total_columns)
+
+        summary = ''
+        if cache_hits is not None:
+            summary += f' | {cache_hits} cached, {cache_misses} parsed'
+        if rows_dropped:
+            summary += f' | {rows_dropped:,} overlapping rows dropped'
+        self.memory_mb = memory_mb
+        self.summary = summary
+        self._update_label()
+
+    def update_rows(self, file_rows: list[int], memory_mb: float | None) -> None:
+        """
+        Show the row counts of files that have grown, keeping the rest of the
+        load summary, such as the cache counts and the rows dropped.
+        """
+        self.model.set_rows(file_rows)
+        self.memory_mb = memory_mb
+        self._update_label()
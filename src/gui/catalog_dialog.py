@@ -0,0 +1,96 @@
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from PySide6.QtCore import QDate
+from PySide6.QtWidgets import (
+    QDateEdit,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from src.catalog import Catalog, CatalogEntry
+
+DEFAULT_SEARCH_DAYS = 7  # how far back the date range starts when the dialog opens
+
+
+class CatalogDialog(QDialog):
+    """Find the files of a stand and date range in the catalog, to load them."""
+
+    def __init__(self, catalog: Catalog, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.catalog = catalog
+        self.entries: list[CatalogEntry] = []
+        self.setWindowTitle('Find Files in Catalog')
+        self.resize(520, 420)
+
+        self.stand_input = QLineEdit()
+        self.stand_input.setPlaceholderText('Stand or serial number in the file path')
+        today = QDate.currentDate()
+        self.start_input = QDateEdit(today.addDays(-DEFAULT_SEARCH_DAYS))
+        self.start_input.setCalendarPopup(True)
+        self.end_input = QDateEdit(today)
+        self.end_input.setCalendarPopup(True)
+        self.search_button = QPushButton('Search')
+        self.search_button.clicked.connect(self._handle_search)
+        self.stand_input.returnPressed.connect(self._handle_search)
+
+        self.results = QListWidget()
+        self.summary_label = QLabel('')
+        self.summary_label.setWordWrap(True)
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText('Load')
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+
+        form = QFormLayout()
+        form.addRow('Stand:', self.stand_input)
+        form.addRow('From:', self.start_input)
+        form.addRow('To:', self.end_input)
+        layout = QVBoxLayout(self)
+        layout.addLayout(form)
+        layout.addWidget(self.search_button)
+        layout.addWidget(self.results)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.buttons)
+
+    def _handle_search(self) -> None:
+        start = datetime.combine(self.start_input.date().toPython(), time.min)
+        # The end date is included, up to midnight at its end
+        end = datetime.combine(self.end_input.date().toPython(), time.min)
+        end += timedelta(days=1)
+        found = self.catalog.find(self.stand_input.text().strip() or None, start, end)
+        self.entries = self.catalog.same_headers(found)
+
+        self.results.clear()
+        for entry in self.entries:
+            self.results.addItem(
+                f'{entry.first_time:%Y-%m-%d %H:%M} to {entry.last_time:%Y-%m-%d %H:%M}'
+                f'  {Path(entry.path).name}'
+            )
+        rows = sum(entry.rows or 0 for entry in self.entries)
+        text = f'{len(self.entries)} files, {rows:,} rows'
+        if len(found) > len(self.entries):
+            text += (
+                f'. {len(found) - len(self.entries)} files with different columns'
+                " are left out, since they can't be loaded together."
+            )
+        if not found:
+            text = 'No files found. Update the catalog if the files are new.'
+        self.summary_label.setText(text)
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(
+            bool(self.entries)
+        )
+
+    def selected_paths(self) -> list[str]:
+        """The files found by the last search, oldest first."""
+        return [entry.path for entry in self.entries]
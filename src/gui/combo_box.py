@@ -9,8 +9,15 @@ class ComboBox(QComboBox):
         self.setStyleSheet('color: lightgreen;')
         self.addItems(['None'])
 
-    def populate(self, headers: list[str]) -> None:
-        """Call this method to update the list of headers from the csv file."""
+    def populate(self, headers: list[str], derived: list[str] | None = None) -> None:
+        """
+        Call this method to update the list of headers from the csv file.
+
+        Derived channels are listed after the headers, below a separator.
+        """
         self.clear()
         self.addItems(headers)
+        if derived:
+            self.insertSeparator(self.count())
+            self.addItems(derived)
         self.setEditable(False)
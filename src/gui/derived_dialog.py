@@ -0,0 +1,137 @@
+from PySide6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from src.derived import FUNCTIONS, DerivedChannel
+
+
+class DerivedChannelsDialog(QDialog):
+    """Add, change and remove the channels computed from the loaded columns."""
+
+    def __init__(
+        self,
+        channels: list[DerivedChannel],
+        headers: list[str],
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle('Derived Channels')
+        self.resize(560, 420)
+        self._channels: dict[str, DerivedChannel] = {
+            channel.name: channel for channel in channels
+        }
+        self.headers = [header for header in headers if header != 'Time']
+
+        self.channel_list = QListWidget()
+        self.channel_list.currentRowChanged.connect(self._handle_select)
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText('Beam Power (W)')
+        self.expression_input = QLineEdit()
+        self.expression_input.setPlaceholderText(
+            '{Extractor Voltage (V)} * {Extractor Current (μA)} / 1e6'
+        )
+        self.column_combo = QComboBox()
+        self.column_combo.addItems(['Insert Column...', *self.headers])
+        self.column_combo.setEnabled(bool(self.headers))
+        self.column_combo.activated.connect(self._handle_insert_column)
+        help_label = QLabel(
+            'Write columns in braces. Use numbers, + - * / ** % and '
+            f'{", ".join(f"{name}()" for name in FUNCTIONS)}.'
+        )
+        help_label.setWordWrap(True)
+        self.message_label = QLabel('')
+        self.message_label.setWordWrap(True)
+
+        self.save_button = QPushButton('Add / Update')
+        self.save_button.clicked.connect(self._handle_save)
+        self.remove_button = QPushButton('Remove')
+        self.remove_button.clicked.connect(self._handle_remove)
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        form = QFormLayout()
+        form.addRow('Name:', self.name_input)
+        form.addRow('Expression:', self.expression_input)
+        form.addRow('', self.column_combo)
+        row_buttons = QHBoxLayout()
+        row_buttons.addWidget(self.save_button)
+        row_buttons.addWidget(self.remove_button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.channel_list)
+        layout.addLayout(form)
+        layout.addWidget(help_label)
+        layout.addLayout(row_buttons)
+        layout.addWidget(self.message_label)
+        layout.addWidget(buttons)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self.channel_list.clear()
+        for channel in self._channels.values():
+            self.channel_list.addItem(f'{channel.name} = {channel.expression}')
+
+    def _handle_select(self, row: int) -> None:
+        if row < 0:
+            return
+        channel = list(self._channels.values())[row]
+        self.name_input.setText(channel.name)
+        self.expression_input.setText(channel.expression)
+
+    def _handle_insert_column(self, index: int) -> None:
+        if index > 0:
+            self.expression_input.insert(f'{{{self.headers[index - 1]}}}')
+            self.expression_input.setFocus()
+        self.column_combo.setCurrentIndex(0)
+
+    def _handle_save(self) -> None:
+        name = self.name_input.text().strip()
+        if name in self.headers:
+            self._show_message(f'"{name}" is already a column.', error=True)
+            return
+        try:
+            channel = DerivedChannel(name, self.expression_input.text())
+        except ValueError as e:
+            self._show_message(str(e), error=True)
+            return
+
+        self._channels[channel.name] = channel
+        self._refresh()
+        missing = [column for column in channel.columns if column not in self.headers]
+        if self.headers and missing:
+            self._show_message(
+                f'Added. Not offered for the loaded files, which have no '
+                f'{", ".join(missing)} column.'
+            )
+        else:
+            self._show_message(f'Added "{channel.name}".')
+
+    def _handle_remove(self) -> None:
+        name = self.name_input.text().strip()
+        if self._channels.pop(name, None) is None:
+            self._show_message(f'There is no channel called "{name}".', error=True)
+            return
+        self._refresh()
+        self.name_input.clear()
+        self.expression_input.clear()
+        self._show_message(f'Removed "{name}".')
+
+    def _show_message(self, text: str, error: bool = False) -> None:
+        self.message_label.setStyleSheet('color: red;' if error else '')
+        self.message_label.setText(text)
+
+    def channels(self) -> list[DerivedChannel]:
+        """The channels as edited."""
+        return list(self._channels.values())
@@ -1,41 +1,112 @@
+from __future__ import annotations
+
+import importlib
+import os
 import sys
+import threading
+import tracemalloc
 import webbrowser
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-from pandas import DataFrame
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QAction, QActionGroup, QIcon
 from PySide6.QtWidgets import (
     QApplication,
     QFileDialog,
     QGridLayout,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QMainWindow,
     QMenu,
     QMenuBar,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QSizePolicy,
+    QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 from qt_material import apply_stylesheet
 
+from src.config import (
+    DEFAULT_MAX_POINTS,
+    DEFAULT_WORKERS,
+    PYARROW_AVAILABLE,
+    WEBENGINE_INSTALLED,
+)
+from src.figure_cache import FigureCache
 from src.gui.canvas import Canvas
 from src.gui.combo_box import ComboBox
-from src.loader import DataLoader
-from src.threaded_loader import LoadDataWorker
-from src.threaded_plotter import PlotWorker
+from src.gui.stats_panel import StatsPanel
+from src.instrumentation import LOG_PATH_ENV, Instrumentation
+from src.scheduler import JobHandle, JobScheduler
+
+# pandas, plotly and the modules built on them are imported where they are first
+# used, so the window shows before they load. See `_start_warm_up`.
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from src.catalog import CatalogUpdate
+    from src.derived import DerivedChannels
+    from src.gui.plot_viewer import PlotViewer
+    from src.loader import DataLoader, LoadProgress
+    from src.threaded_loader import LoadDataWorker
+
+DEFAULT_FOLLOW_INTERVAL = 2  # seconds between checks for rows added to followed files
+# Imported in the background once the window is showing, so the first load or
+# plot doesn't wait for them
+WARM_UP_MODULES = (
+    'src.threaded_loader',
+    'src.threaded_plotter',
+    'src.compact',
+    'src.derived',
+    'src.gui.plot_viewer',
+)
 
 
 class MainWindow(QMainWindow):
     def __init__(self, version: str) -> None:
         super().__init__()
         self.version = version
+        self.load_workers: int = DEFAULT_WORKERS
+        self.max_points: int = DEFAULT_MAX_POINTS
+        self.df: DataFrame | None = None
+        self.file_paths: list[str] = []
+        self.follow_interval: int = DEFAULT_FOLLOW_INTERVAL
+        self.follow_loader: DataLoader | None = None
+        self.scheduler: JobScheduler = JobScheduler(parent=self)
+        self.load_job: JobHandle | None = None
+        self.tail_job: JobHandle | None = None
+        self.plot_viewer: PlotViewer | None = None
+        self.figure_cache: FigureCache = FigureCache()
+        self.data_version: int = 0
+        self.headers: list[str] = []
+        self.derived: DerivedChannels | None = None  # read once pandas is loaded
+        # The rows to load and plot, and the window the loaded data was read with
+        self.time_window: tuple[datetime | None, datetime | None] = (None, None)
+        self.load_window: tuple[datetime | None, datetime | None] = (None, None)
+        self.timing_log_path: str | None = os.environ.get(LOG_PATH_ENV) or None
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.scheduler.shutdown)
         self.installEventFilter(self)
         self.create_gui()
+        QTimer.singleShot(0, self._start_warm_up)
+
+    def _start_warm_up(self) -> None:
+        def warm_up() -> None:
+            for module in WARM_UP_MODULES:
+                try:
+                    importlib.import_module(module)
+                except ImportError as e:  # surfaces again when the module is used
+                    print(f'Error importing {module}: {e}')
+
+        threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
 
     def _get_root_dir(self) -> Path:
         if getattr(sys, 'frozen', False):  # Check if running from the PyInstaller EXE
@@ -44,22 +115,175 @@ class MainWindow(QMainWindow):
             return Path(__file__).resolve().parents[2]
 
     def _handle_select_csv(self) -> None:
+        from src.loader import DataLoader
+
         file_paths: list[str] = DataLoader.get_file_paths()
         if not file_paths:
             return
+        self._load_files(file_paths)
+
+    def _handle_find_in_catalog(self) -> None:
+        from src.catalog import Catalog
+        from src.gui.catalog_dialog import CatalogDialog
+
+        dialog = CatalogDialog(Catalog(), self)
+        if dialog.exec() and dialog.selected_paths():
+            self._load_files(dialog.selected_paths())
+
+    def _handle_update_catalog(self) -> None:
+        from src.threaded_catalog import CatalogUpdateWorker
 
+        self.update_catalog_option.setEnabled(False)
+        self.catalog_worker = CatalogUpdateWorker()
+        self.catalog_worker.progress.connect(
+            lambda count, path: self.statusBar().showMessage(
+                f'Updating catalog: {count:,} files checked, reading {Path(path).name}'
+            )
+        )
+        self.catalog_worker.finished.connect(self._handle_catalog_updated)
+        self.catalog_worker.error_occurred.connect(self._handle_catalog_update_failed)
+        for done in (
+            self.catalog_worker.finished,
+            self.catalog_worker.error_occurred,
+            self.catalog_worker.cancelled,
+        ):
+            done.connect(lambda *_: self.update_catalog_option.setEnabled(True))
+        self.scheduler.submit(self.catalog_worker, key='catalog')
+
+    def _handle_catalog_updated(self, result: CatalogUpdate) -> None:
+        self.statusBar().showMessage(
+            f'Catalog updated: {result.scanned:,} files checked, {result.added:,} '
+            f'added, {result.updated:,} updated, {result.removed:,} removed'
+        )
+
+    def _handle_catalog_update_failed(self, error_message: str) -> None:
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self, 'Error', f'The catalog could not be updated.\n\n{error_message}'
+        )
+
+    def _load_files(self, file_paths: list[str]) -> None:
         self.select_csv_button.setEnabled(False)
         self.select_csv_button.setText('Loading...')
-
-        # Start the LoadDataWorker thread
-        self.data_loader_worker = LoadDataWorker(file_paths)
+        self._stop_following()
+        self.figure_cache.clear()
+        self.load_window = self.time_window
+        self.canvas.set_files(file_paths)
+        self.stats_panel.clear()
+
+        # Start the load. Followed files are loaded up front so the rows added
+        # to them can be appended to every column.
+        follow = self.follow_option.isChecked()
+        headers_only = self.lazy_load_option.isChecked() and not follow
+        self.data_loader_worker = self._create_loader_worker(
+            file_paths, headers_only=headers_only, follow=follow
+        )
         self.data_loader_worker.finished.connect(self._handle_csvs_loaded_successfully)
-        self.data_loader_worker.finished.connect(self.data_loader_worker.deleteLater)
+        self.data_loader_worker.headers_loaded.connect(self._handle_headers_loaded)
         self.data_loader_worker.error_occurred.connect(self._handle_csvs_loaded_failed)
-        self.data_loader_worker.error_occurred.connect(
-            self.data_loader_worker.deleteLater
+        self._submit_load(self.data_loader_worker, heavy=not headers_only)
+
+    def _create_loader_worker(self, file_paths: list[str], **kwargs) -> LoadDataWorker:
+        """Create a load job and show its progress. Start it with `_submit_load`."""
+        from src.threaded_loader import LoadDataWorker
+
+        worker = LoadDataWorker(
+            file_paths,
+            workers=self.load_workers,
+            engine='pyarrow' if self.use_arrow_option.isChecked() else 'c',
+            use_cache=self.use_cache_option.isChecked(),
+            compact=self.compact_option.isChecked(),
+            trace_memory=self.trace_memory_option.isChecked(),
+            log_path=self.timing_log_path,
+            merge_by_time=self.merge_option.isChecked(),
+            duplicates=self.duplicates_group.checkedAction().data(),
+            # Columns loaded later must cover the same rows as the loaded ones
+            start=self.load_window[0],
+            end=self.load_window[1],
+            **kwargs,
+        )
+        worker.progress.connect(self._handle_load_progress)
+        worker.cancelled.connect(self._handle_load_cancelled)
+        for done in (worker.finished, worker.headers_loaded, worker.error_occurred):
+            done.connect(self._hide_load_progress)
+        worker.cancelled.connect(self._hide_load_progress)
+
+        worker.finished.connect(
+            lambda: self._show_timing('Load', worker.data_loader.instrumentation)
+        )
+
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat('%p%')
+        self.progress_bar.show()
+        self.cancel_load_button.show()
+        return worker
+
+    def _submit_load(self, worker: LoadDataWorker, heavy: bool = True) -> None:
+        # Loads replace self.df, so a newer one supersedes any still running
+        self.load_job = self.scheduler.submit(worker, key='load', heavy=heavy)
+
+    def _show_timing(self, operation: str, instrumentation: Instrumentation) -> None:
+        self.statusBar().showMessage(f'{operation}: {instrumentation.summary()}')
+
+        # The full breakdown is shown when hovering over the status bar
+        lines = []
+        for total in instrumentation.totals():
+            line = f'{total.name}: {total.seconds:.3f} s, {total.rows:,} rows'
+            if total.peak_mb is not None:
+                line += f', {total.peak_mb:.0f} MB peak'
+            lines.append(line)
+        self.statusBar().setToolTip('\n'.join(lines))
+
+    def _handle_load_progress(self, progress: LoadProgress) -> None:
+        if progress.bytes_total:
+            self.progress_bar.setValue(
+                int(100 * progress.bytes_read / progress.bytes_total)
+            )
+        self.progress_bar.setFormat(
+            f'{Path(progress.current_file).name}: {progress.rows:,} rows (%p%)'
         )
-        self.data_loader_worker.start()
+
+    def _hide_load_progress(self) -> None:
+        self.progress_bar.hide()
+        self.cancel_load_button.hide()
+
+    def _handle_cancel_load(self) -> None:
+        self.cancel_load_button.setEnabled(False)
+        if self.load_job is not None:
+            self.load_job.cancel()
+
+    def _handle_load_cancelled(self) -> None:
+        self.cancel_load_button.setEnabled(True)
+        self.select_csv_button.setText('Select CSV Files')
+        self.select_csv_button.setEnabled(True)
+        self._handle_plot_finished()
+
+    def _set_data(self, df: DataFrame | None) -> None:
+        # Figures built from the previous data no longer match it
+        self.df = df
+        self.data_version += 1
+
+    def _memory_mb(self) -> float:
+        from src.compact import memory_report
+
+        return memory_report(self.df).total_mb
+
+    def _derived_channels(self) -> DerivedChannels:
+        if self.derived is None:
+            from src.derived import DerivedChannels
+
+            self.derived = DerivedChannels()
+            self.derived.load()
+        return self.derived
+
+    def _populate_combo_boxes(self, headers: list[str]) -> None:
+        self.headers = headers
+        derived = self._derived_channels().available(headers)
+        self.x_axis_combo.populate(headers, derived)
+        headers = headers.copy()
+        headers[headers.index('Time')] = 'None'
+        for combo in self.combo_boxes:
+            combo.populate(headers, derived)
 
     def _handle_csvs_loaded_failed(self, error_message: str) -> None:
         self.select_csv_button.setText('Select CSV Files')
@@ -72,23 +296,178 @@ class MainWindow(QMainWindow):
         return
 
     def _handle_csvs_loaded_successfully(self, df: DataFrame) -> None:
-        self.df = df
+        self._set_data(df)
         self.select_csv_button.setText('Select CSV Files')
         self.select_csv_button.setEnabled(True)
 
+        if self.df is not None and self.df.empty and self.load_window != (None, None):
+            QMessageBox.warning(
+                self,
+                'No Rows in Time Window',
+                'None of the selected files have rows in the time window.',
+            )
+            return
+
         if self.df is None or self.df.empty:
             QMessageBox.critical(
                 self, 'Error', 'Failed to load data from the selected files.'
             )
             return
 
-        headers = self.df.columns.tolist()
-        self.x_axis_combo.populate(headers)
-        headers[headers.index('Time')] = 'None'
-        for combo in self.combo_boxes:
-            combo.populate(headers)
+        self.file_paths = self.data_loader_worker.file_list
+        self._populate_combo_boxes(self.df.columns.tolist())
+
+        self.canvas.display_csv_files(
+            self.data_loader_worker.file_list,
+            cache_hits=self.data_loader_worker.cache_hits,
+            cache_misses=self.data_loader_worker.cache_misses,
+            memory_mb=self._memory_mb(),
+            rows_dropped=self.data_loader_worker.data_loader.rows_dropped,
+            file_rows=self.data_loader_worker.data_loader.file_rows,
+            columns=len(self.df.columns),
+        )
+        self.stats_panel.set_stats(
+            self.data_loader_worker.data_loader.stats,
+            self.data_loader_worker.data_loader.file_stats,
+        )
+
+        if self.data_loader_worker.data_loader.follow:
+            self.follow_loader = self.data_loader_worker.data_loader
+            self.tail_timer.start(self.follow_interval * 1000)
+
+    def _stop_following(self) -> None:
+        self.tail_timer.stop()
+        self.follow_loader = None
+
+    def _handle_tail_timeout(self) -> None:
+        if self.follow_loader is None:
+            return
+        if self.tail_job is not None and not self.tail_job.done:
+            return  # the previous check is still reading
 
-        self.canvas.display_csv_files(self.data_loader_worker.file_list)
+        from src.threaded_loader import TailWorker
+
+        self.tail_worker = TailWorker(self.follow_loader)
+        self.tail_worker.appended.connect(self._handle_rows_appended)
+        self.tail_worker.error_occurred.connect(self._handle_tail_failed)
+        self.tail_job = self.scheduler.submit(self.tail_worker, heavy=False)
+
+    def _handle_rows_appended(self, rows: int) -> None:
+        if not rows or self.follow_loader is None:
+            return
+
+        self._set_data(self.follow_loader.df)
+        self.canvas.update_rows(self.follow_loader.file_rows, self._memory_mb())
+        self.canvas.update_sizes()  # the followed files have grown
+        self.stats_panel.set_stats(
+            self.follow_loader.stats, self.follow_loader.file_stats
+        )
+
+        # Redraw an open plot with the new rows, unless columns are loading or a
+        # plot is being saved. A redraw still in progress is superseded.
+        if (
+            self.plot_viewer is not None
+            and self.plot_viewer.isVisible()
+            and self.plot_button.isEnabled()
+            and any(combo.currentText() != 'None' for combo in self.combo_boxes)
+        ):
+            self._handle_plot()
+
+    def _handle_tail_failed(self, error_message: str) -> None:
+        self._stop_following()
+        QMessageBox.warning(
+            self,
+            'Stopped Following Files',
+            f'Failed to read the rows added to the selected files.\n\n{error_message}',
+        )
+
+    def _handle_headers_loaded(self, headers: list[str]) -> None:
+        self.select_csv_button.setText('Select CSV Files')
+        self.select_csv_button.setEnabled(True)
+
+        # The columns are loaded when they are first plotted
+        self._set_data(None)
+        self.file_paths = self.data_loader_worker.file_list
+        self._populate_combo_boxes(headers)
+        self.canvas.display_csv_files(
+            self.file_paths, columns=0, total_columns=len(headers)
+        )
+
+    def _load_missing_columns(self, on_loaded: Callable[[], None]) -> bool:
+        """
+        Start loading the selected columns that haven't been loaded yet.
+
+        Args:
+            on_loaded (Callable[[], None]): Called once the columns are loaded.
+
+        Returns:
+            bool: True if a load was started, False if every column is already loaded.
+        """
+        selections = [combo.currentText() for combo in self.combo_boxes]
+        selections.append(self.x_axis_combo.currentText())
+        # Derived channels need the columns they are computed from
+        selections = self._derived_channels().columns_for(selections)
+        loaded = set(self.df.columns) if self.df is not None else set()
+        missing = [
+            column
+            for column in dict.fromkeys(selections)
+            if column != 'None' and column not in loaded
+        ]
+        if not missing:
+            return False
+
+        self.save_plot_option.setEnabled(False)
+        self.plot_button.setEnabled(False)
+        self.plot_button.setText('Loading...')
+
+        self.column_loader_worker = self._create_loader_worker(
+            self.file_paths, columns=missing
+        )
+        self.column_loader_worker.finished.connect(
+            lambda df: self._handle_columns_loaded(df, on_loaded)
+        )
+        self.column_loader_worker.error_occurred.connect(
+            self._handle_columns_loaded_failed
+        )
+        self._submit_load(self.column_loader_worker)
+        return True
+
+    def _handle_columns_loaded(
+        self, df: DataFrame | None, on_loaded: Callable[[], None]
+    ) -> None:
+        if df is None:
+            self._handle_columns_loaded_failed('')
+            return
+
+        data_loader = self.column_loader_worker.data_loader
+        if self.df is None or len(self.df) != len(df):
+            # A changed row count means the files changed on disk since the
+            # earlier columns were loaded, so those columns are dropped
+            self._set_data(df)
+            self.stats_panel.set_stats(data_loader.stats, data_loader.file_stats)
+        else:
+            self._set_data(self.df.join(df.drop(columns='Time')))
+            self.stats_panel.add_channels(data_loader.stats, data_loader.file_stats)
+
+        self.canvas.display_csv_files(
+            self.file_paths,
+            cache_hits=self.column_loader_worker.cache_hits,
+            cache_misses=self.column_loader_worker.cache_misses,
+            memory_mb=self._memory_mb(),
+            rows_dropped=data_loader.rows_dropped,
+            file_rows=data_loader.file_rows,
+            columns=len(self.df.columns),
+            total_columns=len(self.headers),
+        )
+        on_loaded()
+
+    def _handle_columns_loaded_failed(self, error_message: str) -> None:
+        self._handle_plot_finished()
+        QMessageBox.critical(
+            self,
+            'Error',
+            f'Failed to load data from the selected files.\n\n{error_message}',
+        )
 
     def _handle_plot(self) -> None:
         combo_box_selections: list[str] = [
@@ -101,32 +480,75 @@ class MainWindow(QMainWindow):
             )
             return
 
-        if self.df is None:
+        if not self.file_paths:
             QMessageBox.critical(
                 self, 'Error', 'No data loaded. Please load a CSV file first.'
             )
             return
 
-        # Disable plot button or show a loading message if desired
+        if self._load_missing_columns(on_loaded=self._handle_plot):
+            return
+
+        # The Plot button stays enabled. Plotting again supersedes this plot.
         self.save_plot_option.setEnabled(False)
-        self.plot_button.setEnabled(False)
-        self.plot_button.setText('Loading...')
+        self.plot_button.setText('Plotting...')
+
+        from src.threaded_plotter import PlotWorker
+
+        # The viewer loads plotly.js while the worker builds the figure
+        embed = self.use_viewer_option.isChecked()
+        if embed and self.plot_viewer is None:
+            from src.gui.plot_viewer import WEBENGINE_AVAILABLE, PlotViewer
+
+            if WEBENGINE_AVAILABLE:
+                self.plot_viewer = PlotViewer(self)
+            else:  # installed, but its system libraries failed to load
+                embed = False
+                self.use_viewer_option.setChecked(False)
+                self.use_viewer_option.setEnabled(False)
 
-        # Start the PlotWorker thread
         self.plot_worker = PlotWorker(
             title=self.title_input.text(),
             x_axis=self.x_axis_combo.currentText(),
             traces=combo_box_selections,
             data=self.df,
+            downsample_mode=self._get_downsample_mode(),
+            max_points=self.max_points,
+            embed=embed,
+            figure_cache=self.figure_cache,
+            data_version=self.data_version,
+            start=self.time_window[0],
+            end=self.time_window[1],
+            derived=self.derived,
+            trace_memory=self.trace_memory_option.isChecked(),
+            log_path=self.timing_log_path,
+        )
+        title = self.plot_worker.title
+        self.plot_worker.figure_json.connect(
+            lambda fig_json: self._handle_figure_json(fig_json, title)
         )
         self.plot_worker.finished.connect(self._handle_plot_finished)
-        self.plot_worker.start()
+        self.plot_worker.error_occurred.connect(self._handle_plot_failed)
+        instrumentation = self.plot_worker.instrumentation
+        self.plot_worker.finished.connect(
+            lambda: self._show_timing('Plot', instrumentation)
+        )
+        self.scheduler.submit(self.plot_worker, key='plot')
+
+    def _handle_figure_json(self, fig_json: str, title: str) -> None:
+        self.plot_viewer.show_figure(fig_json, title=title)
 
     def _handle_plot_finished(self) -> None:
         self.plot_button.setText('Plot Data')
         self.plot_button.setEnabled(True)
         self.save_plot_option.setEnabled(True)
 
+    def _handle_plot_failed(self, error_message: str) -> None:
+        self._handle_plot_finished()
+        QMessageBox.critical(
+            self, 'Error', f'Failed to create the plot.\n\n{error_message}'
+        )
+
     def _handle_exit(self) -> None:
         QApplication.quit()
 
@@ -141,7 +563,7 @@ class MainWindow(QMainWindow):
             )
             return
 
-        if self.df is None:
+        if not self.file_paths:
             QMessageBox.critical(
                 self, 'Error', 'No data loaded. Please load a CSV file first.'
             )
@@ -156,6 +578,19 @@ class MainWindow(QMainWindow):
         if not save_loc:
             return
 
+        self._save_plot_as_HTML(save_loc)
+
+    def _save_plot_as_HTML(self, save_loc: str) -> None:
+        if self._load_missing_columns(lambda: self._save_plot_as_HTML(save_loc)):
+            return
+
+        from src.export import ExportOptions
+        from src.threaded_plotter import PlotWorker
+
+        combo_box_selections: list[str] = [
+            combo.currentText() for combo in self.combo_boxes
+        ]
+
         self.save_plot_option.setEnabled(False)
         self.plot_button.setEnabled(False)
         self.plot_button.setText('Saving...')
@@ -168,9 +603,141 @@ class MainWindow(QMainWindow):
             show=False,
             write_html=True,
             save_loc=save_loc,
+            downsample_mode=self._get_downsample_mode(),
+            max_points=self.max_points,
+            figure_cache=self.figure_cache,
+            data_version=self.data_version,
+            start=self.time_window[0],
+            end=self.time_window[1],
+            derived=self.derived,
+            export_options=ExportOptions(
+                shared_plotlyjs=self.shared_plotlyjs_option.isChecked(),
+                compress=self.compress_option.isChecked(),
+            ),
+            trace_memory=self.trace_memory_option.isChecked(),
+            log_path=self.timing_log_path,
         )
         self.plot_worker.finished.connect(self._handle_plot_finished)
-        self.plot_worker.start()
+        self.plot_worker.error_occurred.connect(self._handle_plot_failed)
+        instrumentation = self.plot_worker.instrumentation
+        self.plot_worker.finished.connect(
+            lambda: self._show_timing('Save', instrumentation)
+        )
+        self.scheduler.submit(self.plot_worker)
+
+    def _handle_set_load_workers(self) -> None:
+        workers, ok = QInputDialog.getInt(
+            self,
+            'Loader Workers',
+            'Number of CSV files to parse at the same time:',
+            value=self.load_workers,
+            minValue=1,
+            maxValue=64,
+        )
+        if ok:
+            self.load_workers = workers
+
+    def _get_downsample_mode(self) -> str | None:
+        checked = self.downsample_group.checkedAction()
+        return checked.data() if checked is not None else None
+
+    def _handle_set_max_points(self) -> None:
+        max_points, ok = QInputDialog.getInt(
+            self,
+            'Points per Trace',
+            'Maximum number of points to plot per trace when downsampling:',
+            value=self.max_points,
+            minValue=100,
+            maxValue=10_000_000,
+            step=1000,
+        )
+        if ok:
+            self.max_points = max_points
+
+    def _handle_set_follow_interval(self) -> None:
+        interval, ok = QInputDialog.getInt(
+            self,
+            'Follow Interval',
+            'Seconds between checks for rows added to the selected files:',
+            value=self.follow_interval,
+            minValue=1,
+            maxValue=3600,
+        )
+        if ok:
+            self.follow_interval = interval
+            if self.tail_timer.isActive():
+                self.tail_timer.start(self.follow_interval * 1000)
+
+    def _handle_set_time_window(self) -> None:
+        from src.gui.time_window_dialog import TimeWindowDialog
+
+        dialog = TimeWindowDialog(*self.time_window, parent=self)
+        accepted = dialog.exec()
+        if accepted:
+            self.time_window = dialog.window()
+        self.time_window_option.setChecked(self.time_window != (None, None))
+        if not accepted:
+            return
+
+        # A narrower window is cut from the loaded rows when plotting. Rows
+        # outside the loaded window have to be read from the files.
+        start, end = self.time_window
+        loaded_start, loaded_end = self.load_window
+        starts_inside = loaded_start is None or (
+            start is not None and start >= loaded_start
+        )
+        ends_inside = loaded_end is None or (end is not None and end <= loaded_end)
+        if self.file_paths and not (starts_inside and ends_inside):
+            self._load_files(self.file_paths)
+
+    def _handle_edit_derived_channels(self) -> None:
+        from src.gui.derived_dialog import DerivedChannelsDialog
+
+        derived = self._derived_channels()
+        dialog = DerivedChannelsDialog(
+            list(derived.channels.values()), self.headers, parent=self
+        )
+        if not dialog.exec():
+            return
+
+        derived.set(dialog.channels())
+        # A channel may keep its name with a new expression
+        self.figure_cache.clear()
+        if not self.headers:
+            return
+        combos = [*self.combo_boxes, self.x_axis_combo]
+        selections = [combo.currentText() for combo in combos]
+        self._populate_combo_boxes(self.headers)
+        for combo, selection in zip(combos, selections):
+            index = combo.findText(selection)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+
+    def _handle_toggle_follow(self, checked: bool) -> None:
+        if not checked:
+            self._stop_following()
+
+    def _handle_toggle_trace_memory(self, checked: bool) -> None:
+        # Stages start tracing when they need it; stop it so it costs nothing
+        if not checked and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _handle_set_timing_log(self) -> None:
+        log_path, ok = QInputDialog.getText(
+            self,
+            'Timing Log File',
+            'Append the timings of every load and plot to this file as JSON lines\n'
+            '(leave empty to turn off):',
+            text=self.timing_log_path or '',
+        )
+        if ok:
+            self.timing_log_path = log_path.strip() or None
+
+    def _handle_clear_cache(self) -> None:
+        from src.csv_cache import CSVCache
+
+        CSVCache().clear()
+        QMessageBox.information(self, 'Cache Cleared', 'The CSV cache was cleared.')
 
     def _handle_open_quick_start_guide(self) -> None:
         root_dir = self._get_root_dir()
@@ -206,20 +773,124 @@ class MainWindow(QMainWindow):
         # Create the menu bar items
         self.file_menu: QMenu = self.menu_bar.addMenu('File')
         self.save_menu: QMenu = self.menu_bar.addMenu('Save')
+        self.settings_menu: QMenu = self.menu_bar.addMenu('Settings')
         self.help_menu: QMenu = self.menu_bar.addMenu('Help')
 
         # Create the QAction objects for the menus
+        self.find_in_catalog_option: QAction = QAction('Find Files in Catalog...', self)
+        self.update_catalog_option: QAction = QAction('Update Catalog', self)
         self.exit_option: QAction = QAction('Exit', self)
         self.save_plot_option: QAction = QAction('Save Plot as HTML', self)
+        self.shared_plotlyjs_option: QAction = QAction(
+            'Share plotly.js Between Saved Plots', self
+        )
+        self.shared_plotlyjs_option.setCheckable(True)
+        self.compress_option: QAction = QAction('Compress Saved Plots (.gz)', self)
+        self.compress_option.setCheckable(True)
         self.open_quick_start_guide: QAction = QAction('Quick Start Guide', self)
+        self.load_workers_option: QAction = QAction('Loader Workers...', self)
+        self.use_arrow_option: QAction = QAction('Use Arrow CSV Parser', self)
+        self.use_arrow_option.setCheckable(True)
+        self.use_arrow_option.setChecked(PYARROW_AVAILABLE)
+        self.use_arrow_option.setEnabled(PYARROW_AVAILABLE)
+        self.use_cache_option: QAction = QAction('Cache Parsed Files', self)
+        self.use_cache_option.setCheckable(True)
+        self.use_cache_option.setChecked(True)
+        self.clear_cache_option: QAction = QAction('Clear Cache', self)
+        self.lazy_load_option: QAction = QAction('Load Columns on Demand', self)
+        self.lazy_load_option.setCheckable(True)
+        self.lazy_load_option.setChecked(True)
+        self.compact_option: QAction = QAction('Compact Memory Mode', self)
+        self.compact_option.setCheckable(True)
+        self.merge_option: QAction = QAction('Merge Files by Time', self)
+        self.merge_option.setCheckable(True)
+        self.merge_option.setChecked(True)
+        self.duplicates_menu: QMenu = QMenu('Overlapping Rows', self)
+        self.duplicates_group: QActionGroup = QActionGroup(self)
+        for text, mode in (
+            ("Keep First File's", 'first'),
+            ("Keep Last File's", 'last'),
+            ('Keep All', None),
+        ):
+            action = QAction(text, self)
+            action.setCheckable(True)
+            action.setData(mode)
+            action.setChecked(mode is None)
+            self.duplicates_group.addAction(action)
+            self.duplicates_menu.addAction(action)
+        self.follow_option: QAction = QAction('Follow Growing Files', self)
+        self.follow_option.setCheckable(True)
+        self.follow_interval_option: QAction = QAction('Follow Interval...', self)
+        self.time_window_option: QAction = QAction('Time Window...', self)
+        # Checked while a window is set. Clicking it opens the dialog either way.
+        self.time_window_option.setCheckable(True)
+        self.derived_option: QAction = QAction('Derived Channels...', self)
+        self.use_viewer_option: QAction = QAction('Show Plots in Viewer Window', self)
+        self.use_viewer_option.setCheckable(True)
+        self.use_viewer_option.setChecked(WEBENGINE_INSTALLED)
+        self.use_viewer_option.setEnabled(WEBENGINE_INSTALLED)
+        self.trace_memory_option: QAction = QAction('Trace Memory Use', self)
+        self.trace_memory_option.setCheckable(True)
+        self.timing_log_option: QAction = QAction('Timing Log File...', self)
+        self.downsample_menu: QMenu = QMenu('Downsampling', self)
+        self.downsample_group: QActionGroup = QActionGroup(self)
+        for text, mode in (('Off', None), ('LTTB', 'lttb'), ('Min/Max', 'minmax')):
+            action = QAction(text, self)
+            action.setCheckable(True)
+            action.setData(mode)
+            action.setChecked(mode == 'minmax')
+            self.downsample_group.addAction(action)
+            self.downsample_menu.addAction(action)
+        self.max_points_option: QAction = QAction('Points per Trace...', self)
+        self.downsample_menu.addSeparator()
+        self.downsample_menu.addAction(self.max_points_option)
 
         # Add the action objects to the menu bar items
+        self.file_menu.addAction(self.find_in_catalog_option)
+        self.file_menu.addAction(self.update_catalog_option)
+        self.file_menu.addSeparator()
         self.file_menu.addAction(self.exit_option)
         self.save_menu.addAction(self.save_plot_option)
+        self.save_menu.addSeparator()
+        self.save_menu.addAction(self.shared_plotlyjs_option)
+        self.save_menu.addAction(self.compress_option)
+        self.settings_menu.addAction(self.load_workers_option)
+        self.settings_menu.addAction(self.use_arrow_option)
+        self.settings_menu.addAction(self.lazy_load_option)
+        self.settings_menu.addAction(self.compact_option)
+        self.settings_menu.addAction(self.time_window_option)
+        self.settings_menu.addAction(self.derived_option)
+        self.settings_menu.addSeparator()
+        self.settings_menu.addAction(self.merge_option)
+        self.settings_menu.addMenu(self.duplicates_menu)
+        self.settings_menu.addSeparator()
+        self.settings_menu.addAction(self.follow_option)
+        self.settings_menu.addAction(self.follow_interval_option)
+        self.settings_menu.addSeparator()
+        self.settings_menu.addAction(self.use_cache_option)
+        self.settings_menu.addAction(self.clear_cache_option)
+        self.settings_menu.addSeparator()
+        self.settings_menu.addMenu(self.downsample_menu)
+        self.settings_menu.addAction(self.use_viewer_option)
+        self.settings_menu.addSeparator()
+        self.settings_menu.addAction(self.trace_memory_option)
+        self.settings_menu.addAction(self.timing_log_option)
         self.help_menu.addAction(self.open_quick_start_guide)
 
+        self.find_in_catalog_option.triggered.connect(self._handle_find_in_catalog)
+        self.update_catalog_option.triggered.connect(self._handle_update_catalog)
         self.exit_option.triggered.connect(self._handle_exit)
         self.save_plot_option.triggered.connect(self._handle_save_plot_as_HTML)
+        self.load_workers_option.triggered.connect(self._handle_set_load_workers)
+        self.clear_cache_option.triggered.connect(self._handle_clear_cache)
+        self.max_points_option.triggered.connect(self._handle_set_max_points)
+        self.follow_option.toggled.connect(self._handle_toggle_follow)
+        self.merge_option.toggled.connect(self.duplicates_menu.setEnabled)
+        self.follow_interval_option.triggered.connect(self._handle_set_follow_interval)
+        self.trace_memory_option.toggled.connect(self._handle_toggle_trace_memory)
+        self.timing_log_option.triggered.connect(self._handle_set_timing_log)
+        self.time_window_option.triggered.connect(self._handle_set_time_window)
+        self.derived_option.triggered.connect(self._handle_edit_derived_channels)
         self.open_quick_start_guide.triggered.connect(
             self._handle_open_quick_start_guide
         )
@@ -263,12 +934,27 @@ class MainWindow(QMainWindow):
         self.select_csv_button: QPushButton = QPushButton('Select CSV Files')
         self.select_csv_button.setFixedSize(150, 40)
         self.select_csv_button.clicked.connect(self._handle_select_csv)
+        self.progress_bar: QProgressBar = QProgressBar()
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.hide()
+        self.cancel_load_button: QPushButton = QPushButton('Cancel')
+        self.cancel_load_button.setFixedSize(80, 20)
+        self.cancel_load_button.clicked.connect(self._handle_cancel_load)
+        self.cancel_load_button.hide()
         self.plot_button: QPushButton = QPushButton('Plot Data')
         self.plot_button.setFixedSize(150, 40)
         self.plot_button.clicked.connect(self._handle_plot)
 
+        # Create the timer that checks followed files for new rows
+        self.tail_timer: QTimer = QTimer(self)
+        self.tail_timer.timeout.connect(self._handle_tail_timeout)
+
         # Create the canvas for displaying CSV data
-        self.canvas: Canvas = Canvas()
+        self.canvas: Canvas = Canvas(self.scheduler)
+        self.stats_panel: StatsPanel = StatsPanel()
+        self.tabs: QTabWidget = QTabWidget()
+        self.tabs.addTab(self.canvas, 'Files')
+        self.tabs.addTab(self.stats_panel, 'Statistics')
 
         # Create the layout for the main window
         self.h_title_layout: QHBoxLayout = QHBoxLayout()
@@ -305,14 +991,20 @@ class MainWindow(QMainWindow):
         self.v_button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.v_button_layout.setContentsMargins(0, 10, 0, 0)
 
+        self.h_progress_layout: QHBoxLayout = QHBoxLayout()
+        self.h_progress_layout.addWidget(self.progress_bar, stretch=1)
+        self.h_progress_layout.addWidget(self.cancel_load_button, stretch=0)
+        self.h_progress_layout.setContentsMargins(10, 0, 10, 0)
+
         self.v_canvas_layout: QVBoxLayout = QVBoxLayout()
-        self.v_canvas_layout.addWidget(self.canvas)
+        self.v_canvas_layout.addWidget(self.tabs)
         self.v_canvas_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.v_main_layout: QVBoxLayout = QVBoxLayout()
         self.v_main_layout.addLayout(self.h_title_layout)
         self.v_main_layout.addLayout(self.g_combo_box_layout)
         self.v_main_layout.addLayout(self.v_button_layout)
+        self.v_main_layout.addLayout(self.h_progress_layout)
         self.v_main_layout.addLayout(self.v_canvas_layout)
 
         container: QWidget = QWidget()
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+import plotly
+from plotly.offline import get_plotlyjs
+from PySide6.QtCore import Qt, QUrl
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+
+from src.csv_cache import DEFAULT_CACHE_DIR
+
+try:
+    from PySide6.QtWebEngineWidgets import QWebEngineView
+
+    WEBENGINE_AVAILABLE = True
+except ImportError:  # QtWebEngine is missing or its system libraries are
+    WEBENGINE_AVAILABLE = False
+
+VIEWER_DIR = Path(DEFAULT_CACHE_DIR).parent / 'plot_viewer'
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="{plotlyjs}"></script>
+<style>html, body, #plot {{ margin: 0; width: 100%; height: 100%; background: rgb(132, 132, 132); }}</style>
+</head>
+<body>
+<div id="plot"></div>
+<script>
+function renderFigure(fig) {{
+    Plotly.react('plot', fig.data, fig.layout, {{responsive: true}});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def _write_viewer_page() -> Path:
+    """
+    Write the viewer page and the plotly.js bundle it loads, once per plotly version.
+
+    Returns:
+        Path: The viewer page.
+    """
+    os.makedirs(VIEWER_DIR, exist_ok=True)
+    plotlyjs = VIEWER_DIR / f'plotly-{plotly.__version__}.min.js'
+    if not plotlyjs.is_file():
+        temp = plotlyjs.with_suffix('.tmp')
+        temp.write_text(get_plotlyjs(), encoding='utf-8')
+        os.replace(temp, plotlyjs)
+
+    page = VIEWER_DIR / f'viewer-{plotly.__version__}.html'
+    if not page.is_file():
+        page.write_text(VIEWER_HTML.format(plotlyjs=plotlyjs.name), encoding='utf-8')
+    return page
+
+
+class PlotViewer(QWidget):
+    """
+    Window that shows plots in an embedded web view.
+
+    plotly.js is loaded once when the window is created. Each plot after that
+    only sends the figure's data and layout to the page, where `Plotly.react`
+    updates the existing plot in place.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle('Plot')
+        self.resize(1200, 700)
+        self.ready: bool = False
+        self.pending_json: str | None = None
+
+        self.view = QWebEngineView(self)
+        self.view.loadFinished.connect(self._handle_load_finished)
+        self.view.load(QUrl.fromLocalFile(str(_write_viewer_page())))
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+
+    def _handle_load_finished(self, ok: bool) -> None:
+        self.ready = ok
+        if ok and self.pending_json is not None:
+            self._render(self.pending_json)
+            self.pending_json = None
+
+    def _render(self, fig_json: str) -> None:
+        self.view.page().runJavaScript(f'renderFigure({fig_json});')
+
+    def show_figure(self, fig_json: str, title: str = '') -> None:
+        """
+        Show a figure, replacing the current one.
+
+        Args:
+            fig_json (str): The figure as returned by `Figure.to_json`.
+            title (str): The window title.
+        """
+        self.setWindowTitle(title or 'Plot')
+        if self.ready:
+            self._render(fig_json)
+        else:  # shown once the page and plotly.js have loaded
+            self.pending_json = fig_json
+        self.show()
+        self.raise_()
+        self.activateWindow()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+if TYPE_CHECKING:  # src.stats imports pandas, which loads after the window shows
+    from src.stats import FileStats
+
+HEADERS = ('Channel', 'Min', 'Max', 'Mean', 'Std Dev', 'Count')
+
+
+def _format(value: float) -> str:
+    return f'{value:.6g}' if not math.isnan(value) else ''
+
+
+class StatsPanel(QWidget):
+    """
+    The min, max, mean, standard deviation and run duration of the loaded
+    channels, for every file together or one file at a time.
+
+    The statistics are computed by the loader as the files are read, so
+    nothing is read again to show them.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.total: FileStats | None = None
+        self.files: list[FileStats] = []
+
+        self.scope_combo = QComboBox()
+        self.scope_combo.setStyleSheet('color: lightgreen;')
+        self.scope_combo.currentIndexChanged.connect(self._refresh)
+        self.summary_label = QLabel('No data loaded')
+        self.summary_label.setWordWrap(True)
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setStyleSheet('color: lightgreen;')
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(HEADERS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.scope_combo)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.table)
+
+    def clear(self) -> None:
+        self.set_stats(None, [])
+
+    def set_stats(self, total: FileStats | None, files: list[FileStats]) -> None:
+        """
+        Show new statistics, keeping the chosen file if the files are the same.
+
+        Args:
+            total (FileStats | None): The statistics of every loaded row.
+            files (list[FileStats]): The statistics of each file, in load order.
+                Neither is changed once shown. The loader replaces them instead.
+        """
+        same_files = [f.path for f in files] == [f.path for f in self.files]
+        self.total = total
+        self.files = list(files)
+        if not same_files:
+            self.scope_combo.blockSignals(True)
+            self.scope_combo.clear()
+            if total is not None:
+                self.scope_combo.addItem('All files')
+                self.scope_combo.addItems([Path(f.path).name for f in files])
+            self.scope_combo.blockSignals(False)
+        self._refresh()
+
+    def add_channels(self, total: FileStats, files: list[FileStats]) -> None:
+        """
+        Add the statistics of columns loaded after the others, over the same rows.
+
+        Args:
+            total (FileStats): The statistics of the new columns of every row.
+            files (list[FileStats]): The statistics of the new columns of each file.
+        """
+        if self.total is None or len(files) != len(self.files):
+            self.set_stats(total, files)
+            return
+        self.set_stats(
+            self.total.with_channels(total),
+            [old.with_channels(new) for old, new in zip(self.files, files)],
+        )
+
+    def _refresh(self) -> None:
+        index = self.scope_combo.currentIndex()
+        stats = self.total if index <= 0 else self.files[index - 1]
+        self.table.setRowCount(0)
+        if stats is None:
+            self.summary_label.setText('No data loaded')
+            return
+
+        summary = f'{stats.rows:,} rows'
+        if stats.first_time is not None and stats.last_time is not None:
+            summary += (
+                f' from {stats.first_time:%Y-%m-%d %H:%M:%S}'
+                f' to {stats.last_time:%Y-%m-%d %H:%M:%S} ({stats.duration})'
+            )
+        self.summary_label.setText(summary)
+
+        self.table.setRowCount(len(stats.channels))
+        for row, (name, channel) in enumerate(stats.channels.items()):
+            values = (
+                name,
+                _format(channel.minimum),
+                _format(channel.maximum),
+                _format(channel.mean if channel.count else math.nan),
+                _format(channel.std),
+                f'{channel.count:,}',
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(
+                        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                    )
+                self.table.setItem(row, column, item)
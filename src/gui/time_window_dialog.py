@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from PySide6.QtCore import QDateTime
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QDateTimeEdit,
+    QDialog,
+    QDialogButtonBox,
+    QGridLayout,
+    QLabel,
+    QVBoxLayout,
+    QWidget,
+)
+
+DATE_TIME_FORMAT = 'yyyy-MM-dd hh:mm:ss'
+
+
+class TimeWindowDialog(QDialog):
+    """Pick the start and end of the rows to load and plot. Either can be left open."""
+
+    def __init__(
+        self,
+        start: datetime | None,
+        end: datetime | None,
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle('Time Window')
+
+        now = QDateTime.currentDateTime()
+        self.start_check = QCheckBox('From:')
+        self.start_input = QDateTimeEdit(
+            QDateTime(start) if start is not None else now.addDays(-1)
+        )
+        self.end_check = QCheckBox('To:')
+        self.end_input = QDateTimeEdit(QDateTime(end) if end is not None else now)
+        for check, edit, value in (
+            (self.start_check, self.start_input, start),
+            (self.end_check, self.end_input, end),
+        ):
+            edit.setDisplayFormat(DATE_TIME_FORMAT)
+            edit.setCalendarPopup(True)
+            check.toggled.connect(edit.setEnabled)
+            check.setChecked(value is not None)
+            edit.setEnabled(value is not None)
+
+        self.error_label = QLabel('')
+        self.error_label.setStyleSheet('color: red;')
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self._handle_accept)
+        buttons.rejected.connect(self.reject)
+
+        grid = QGridLayout()
+        grid.addWidget(self.start_check, 0, 0)
+        grid.addWidget(self.start_input, 0, 1)
+        grid.addWidget(self.end_check, 1, 0)
+        grid.addWidget(self.end_input, 1, 1)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel('Only load and plot the rows between:'))
+        layout.addLayout(grid)
+        layout.addWidget(self.error_label)
+        layout.addWidget(buttons)
+
+    def window(self) -> tuple[datetime | None, datetime | None]:
+        """The chosen start and end, None where the window is left open."""
+        start = end = None
+        if self.start_check.isChecked():
+            start = self.start_input.dateTime().toPython()
+        if self.end_check.isChecked():
+            end = self.end_input.dateTime().toPython()
+        return start, end
+
+    def _handle_accept(self) -> None:
+        start, end = self.window()
+        if start is not None and end is not None and end < start:
+            self.error_label.setText('The end is before the start.')
+            return
+        self.accept()
@@ -0,0 +1,205 @@
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, TypeVar
+
+# Append JSON lines to this file from every load and plot unless set in the GUI
+LOG_PATH_ENV = 'HYPERION_TIMING_LOG'
+# The stage that spans a whole operation, shown apart from the others
+TOTAL_STAGE = 'total'
+
+T = TypeVar('T')
+
+# The peaks of the stages open in each thread, across every Instrumentation,
+# since they share tracemalloc's single peak counter
+_open_stages = threading.local()
+
+
+@dataclass
+class StageRecord:
+    """How long one stage took and how much it handled."""
+
+    name: str
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    peak_mb: float | None = None
+    calls: int = 1
+
+
+class Instrumentation:
+    """
+    Collect the duration, rows, bytes and peak memory of each pipeline stage.
+
+    Stages are timed with the `stage` context manager and can be recorded from
+    several threads. Stages timed in another process are merged with `extend`.
+    With `trace_memory`, tracemalloc is started on first use and each stage
+    records the peak traced memory of the process while it ran. Tracing slows
+    down the Python parts of the pipeline, so it is off by default.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.records: list[StageRecord] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, bytes: int = 0) -> Iterator[StageRecord]:
+        """
+        Time the body of a `with` block as one stage.
+
+        Args:
+            name (str): The stage name. Records with the same name are summed.
+            rows (int): The rows the stage handles, if known up front.
+            bytes (int): The bytes the stage handles, if known up front.
+
+        Yields:
+            StageRecord: The record, so rows and bytes can be set once known.
+        """
+        record = StageRecord(name, rows=rows, bytes=bytes)
+        stack: list[list[float]] | None = getattr(_open_stages, 'peaks', None)
+        if stack is None:
+            stack = _open_stages.peaks = []
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if stack:  # keep the enclosing stage's peak before resetting it
+                stack[-1][0] = max(stack[-1][0], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            stack.append([0.0])
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(stack.pop()[0], tracemalloc.get_traced_memory()[1])
+                record.peak_mb = peak / 1024**2
+                if stack:
+                    stack[-1][0] = max(stack[-1][0], peak)
+            with self._lock:
+                self.records.append(record)
+
+    def iterate(
+        self,
+        name: str,
+        items: Iterable[T],
+        position: Callable[[], int] | None = None,
+    ) -> Iterator[T]:
+        """
+        Time how long each item of an iterable takes to produce, as one stage per item.
+
+        Args:
+            name (str): The stage name.
+            items (Iterable[T]): The items, such as the chunks of a CSV reader.
+                Items with a length count it as rows.
+            position (Callable[[], int] | None): Returns the current byte offset,
+                so the bytes each item took are recorded too.
+
+        Yields:
+            T: The items.
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(name) as record:
+                before = position() if position is not None else 0
+                item = next(iterator, None)
+                if item is None:
+                    record.calls = 0
+                    break
+                record.rows = len(item) if hasattr(item, '__len__') else 0
+                record.bytes = position() - before if position is not None else 0
+            yield item
+
+    def extend(self, records: Iterable[StageRecord]) -> None:
+        """
+        Add records timed elsewhere, for example in a worker process.
+
+        Args:
+            records (Iterable[StageRecord]): The records to add.
+        """
+        with self._lock:
+            self.records.extend(records)
+
+    def totals(self) -> list[StageRecord]:
+        """
+        Sum the records of each stage, in the order the stages first ran.
+
+        Stages that ran in parallel are summed too, so their total can be
+        longer than the operation took.
+
+        Returns:
+            list[StageRecord]: One record per stage name, with the largest peak.
+        """
+        totals: dict[str, StageRecord] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            total = totals.get(record.name)
+            if total is None:
+                totals[record.name] = StageRecord(**asdict(record))
+                continue
+            total.seconds += record.seconds
+            total.rows += record.rows
+            total.bytes += record.bytes
+            total.calls += record.calls
+            if record.peak_mb is not None:
+                total.peak_mb = max(total.peak_mb or 0.0, record.peak_mb)
+        return list(totals.values())
+
+    def summary(self, limit: int = 4) -> str:
+        """
+        Describe the slowest stages in one line.
+
+        Args:
+            limit (int): The number of stages to include.
+
+        Returns:
+            str: For example 'total 5.40 s: parse_time 3.71 s, read_csv 1.20 s'.
+        """
+
+        def describe(total: StageRecord) -> str:
+            text = f'{total.name} {total.seconds:.2f} s'
+            if total.peak_mb is not None:
+                text += f' ({total.peak_mb:.0f} MB peak)'
+            return text
+
+        totals = sorted(self.totals(), key=lambda total: total.seconds, reverse=True)
+        overall = [total for total in totals if total.name == TOTAL_STAGE]
+        stages = [describe(t) for t in totals if t.name != TOTAL_STAGE][:limit]
+        if not overall:
+            return ', '.join(stages)
+        return f'{describe(overall[0])}: ' + ', '.join(stages)
+
+    def write_log(self, log_path: str, operation: str, **details) -> None:
+        """
+        Append the stage totals to a log file as one JSON line.
+
+        Errors are printed instead of raised, so a log on an unreachable share
+        never fails the operation it describes.
+
+        Args:
+            log_path (str): The file to append to.
+            operation (str): What was timed, such as 'load' or 'plot'.
+            **details: Extra fields to include, such as the number of files.
+        """
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'host': platform.node(),
+            'pid': os.getpid(),
+            'operation': operation,
+            **details,
+            'stages': [asdict(total) for total in self.totals()],
+        }
+        try:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f'Error writing the timing log "{log_path}": {e}')
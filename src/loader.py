@@ -1,64 +1,247 @@
+import copy
 import csv
-import sys
+import io
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
 
 import pandas as pd
 from pandas import DataFrame
-from PySide6.QtWidgets import QFileDialog
+
+from src.column_buffer import ColumnBuffer
+from src.compact import MemoryReport, compact_frame, memory_report
+from src.config import DATA_DIR, PYARROW_AVAILABLE
+from src.csv_cache import CSVCache
+from src.instrumentation import TOTAL_STAGE, Instrumentation, StageRecord
+from src.stats import FileStats, combine
+from src.time_merge import TIME_SORTED_ATTR, is_time_sorted, merge_by_time
+from src.time_parser import parse_time
+from src.time_window import check_window, window_byte_range, window_rows
+
+if TYPE_CHECKING:
+    from src.catalog import Catalog
 
 BYTES_TO_READ = 350
+COUNT_BLOCK_BYTES = 1024 * 1024
+# The bytes of rows a file's row count is estimated from, and the margin added
+# so the table rarely has to grow
+SAMPLE_BYTES = 64 * 1024
+ROWS_MARGIN = 1.05
+TAIL_PROBE_BYTES = 64 * 1024
+# The most of a load's bytes that files parsed by other workers may hold while
+# they wait to be copied into the table, so a parallel load stays close to the
+# table's size. One file is always allowed.
+MAX_IN_FLIGHT_SHARE = 0.25
 
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_workers: int = 0
+_process_pool_lock = threading.Lock()
 
-class DataLoader:
-    def __init__(self) -> None:
-        self.df: DataFrame | None = None
 
-    @staticmethod
-    def _check_csv_headers(file_paths: list[str]) -> tuple[bool, list[str] | None]:
-        """
-        Validates that all provided CSV files contain a header row and that
-        the headers are identical across all files.
+RENAME_MAP = {
+    'Angular Intensity (mA/str)': 'Angular Intensity (mA/sr)',
+    'Beam Voltage (kV)': 'Beam Voltage (V)',
+    'Extractor Voltage (kV)': 'Extractor Voltage (V)',
+    'Extractor Current (uA)': 'Extractor Current (μA)',
+    'Beam Supply Current (uA)': 'Beam Supply Current (μA)',
+    'Lens #1 Current (uA)': 'Lens Current (μA)',
+    'Lens #1 Voltage (V)': 'Lens Voltage (V)',
+    'Lens #1 Voltage (kV)': 'Lens Voltage (V)',
+    'Total Current (uA)': 'Total Current (A)',
+}
 
-        Args:
-            file_paths (list[str]): A list of file paths (as strings) to CSV files.
 
-        Returns:
-            tuple[bool, list[str] | None]:
-                - A tuple where the first element is True if all CSV files contain
-                a header and share the same structure, otherwise False.
-                - The second element is the list of headers if validation passed,
-                or None if it failed.
-        """
+class CSVHeaderError(ValueError):
+    """Raised when a CSV file's headers are missing or don't match the other files."""
 
-        paths = [Path(file_path) for file_path in file_paths]
-        reference_headers: list[str] | None = None
 
-        for path in paths:
-            try:
-                with path.open('r', newline='', encoding='utf-8') as f:
-                    sample: str = f.read(BYTES_TO_READ)
-                    f.seek(0)  # send the file cursor to the beginning of the file
+class LoadCancelled(Exception):
+    """Raised when a load is cancelled before it finishes."""
 
-                    has_header = csv.Sniffer().has_header(sample)
-                    if not has_header:
-                        return False, None
 
-                    reader: Iterator[list[str]] = csv.reader(f)
-                    headers: list[str] = next(reader)
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The process pool shared by every load, so reloads and columns loaded on
+    demand don't start new worker processes each time. A new pool is made if
+    the number of workers changes or a worker process died.
+    """
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            # A replaced pool stops its processes once the loads using it are
+            # done with it and it is garbage collected
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+            _process_pool_workers = workers
+        return _process_pool
 
-                    if reference_headers is None:
-                        reference_headers = headers
-                    elif headers != reference_headers:
-                        return False, None
 
-            except Exception as e:
-                print(
-                    f'Error reading "{path.name}": {str(e)}'
-                )  # change this to a error pop up message maybe...?
-                return False, None
+def _discard_process_pool(pool: Executor) -> None:
+    """Stop sharing a pool that can no longer run files."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+
 
-        return True, reference_headers
+@dataclass
+class LoadProgress:
+    """How far a load has got."""
+
+    bytes_read: int
+    bytes_total: int
+    rows: int
+    current_file: str
+
+
+@dataclass
+class FileResult:
+    """One parsed file, as returned by `DataLoader._read_csv`."""
+
+    df: DataFrame
+    headers: list[str]
+    cache_hit: bool
+    end_offset: int = 0
+    stages: list[StageRecord] = field(default_factory=list)
+    in_table: bool = False
+    stats: FileStats = field(default_factory=FileStats)
+
+
+@dataclass
+class ReadOptions:
+    """How `DataLoader._read_csv` reads each file. Picklable for worker processes."""
+
+    engine: str = 'c'
+    cache: CSVCache | None = None
+    columns: list[str] | None = None
+    chunk_rows: int | None = None
+    follow: bool = False
+    trace_memory: bool = False
+    start: datetime | None = None
+    end: datetime | None = None
+
+    @property
+    def windowed(self) -> bool:
+        return self.start is not None or self.end is not None
+
+
+class _ByteRange(io.RawIOBase):
+    """Read at most `length` bytes of a file from where it is positioned."""
+
+    def __init__(self, f: BinaryIO, length: int) -> None:
+        super().__init__()
+        self.f = f
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.f.read(min(len(buffer), self.remaining))
+        buffer[: len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+class DataLoader:
+    def __init__(
+        self,
+        workers: int = 1,
+        engine: str = 'c',
+        cache: CSVCache | None = None,
+        compact: bool = False,
+        chunk_rows: int | None = None,
+        progress: Callable[[LoadProgress], None] | None = None,
+        follow: bool = False,
+        trace_memory: bool = False,
+        merge_by_time: bool = True,
+        duplicates: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> None:
+        """
+        Args:
+            workers (int): Number of files to parse at the same time. 1 parses
+                the files one after another on the calling thread.
+            engine (str): The pandas CSV parser, 'c' or 'pyarrow'. Falls back to
+                'c' if pyarrow is not installed.
+            cache (CSVCache | None): An on-disk cache of parsed files to read from
+                and write to. None parses every file.
+            compact (bool): Shrink the loaded columns to smaller dtypes where no
+                value changes. See `compact_frame`.
+            chunk_rows (int | None): Parse each file in chunks of this many rows,
+                reporting progress and checking for cancellation between chunks.
+                None parses each file in one go.
+            progress (Callable[[LoadProgress], None] | None): Called as the load
+                advances. May be called from a worker thread.
+            follow (bool): Remember where each file ends so `tail` can append the
+                rows written to it later. Bypasses the cache and ignores `compact`.
+            trace_memory (bool): Record the peak memory of each stage of a load in
+                `self.instrumentation`, at the cost of a slower load.
+            merge_by_time (bool): Merge the rows of the files into time order
+                instead of keeping them in the order the files were given.
+            duplicates (str | None): With `merge_by_time`, which file's rows to
+                keep for a timestamp found in more than one file, 'first' or
+                'last'. None, the default, keeps them all. See `merge_by_time`.
+            start (datetime | None): Only load the rows at or after this time.
+            end (datetime | None): Only load the rows at or before this time.
+                With either set, files outside the window are skipped and only
+                the bytes of the rows inside it are parsed.
+
+        Raises:
+            ValueError: If `end` is before `start`.
+        """
+        check_window(start, end)
+        self.df: DataFrame | None = None
+        self.workers = max(1, workers)
+        self.engine = engine if engine != 'pyarrow' or PYARROW_AVAILABLE else 'c'
+        self.cache = cache
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.compact = compact
+        self.memory_report: MemoryReport | None = None
+        self.chunk_rows = chunk_rows
+        self.progress = progress
+        self._cancel_event = threading.Event()
+        self._progress_lock = threading.Lock()
+        self._file_sizes: list[int] = []
+        self._file_paths: list[str] = []
+        self._file_bytes: list[int] = []
+        self._file_rows: list[int] = []
+        self._expected_rows: list[int] = []
+        self._bytes_read: int = 0
+        self._bytes_total: int = 0
+        self._rows_read: int = 0
+        self.follow = follow
+        self._table: ColumnBuffer | None = None
+        self._columns: list[str] | None = None
+        self._tail_offsets: list[int] = []
+        self._tail_headers: list[str] = []
+        self.trace_memory = trace_memory
+        self.instrumentation = Instrumentation(trace_memory)
+        self.merge_by_time = merge_by_time
+        self.duplicates = duplicates
+        self.time_sorted: bool = False
+        self.rows_dropped: int = 0
+        self.file_rows: list[int] = []  # rows read from each file, before merging
+        # Summary statistics of the rows read from each file, and of the loaded rows
+        self.file_stats: list[FileStats] = []
+        self.stats: FileStats = FileStats()
+        self.start = start
+        self.end = end
+        self._byte_ranges: list[tuple[int, int] | None] = []
 
     @staticmethod
     def _check_for_time_header(headers: list[str] | None) -> bool:
@@ -90,20 +273,44 @@ class DataLoader:
             The file dialog starts in the Production History directory and filters for CSV files.
             If no file is selected, the function will return an empty string.
         """
-        if hasattr(sys, 'frozen'):  # Check if running from the bundled app
-            dir = r'C:\\teststanddata'
-        else:
-            dir = r'\\opdata2\Company\PRODUCTION FOLDER\Production History'
+        from PySide6.QtWidgets import QFileDialog  # not needed by the batch CLI
 
         file_paths, _ = QFileDialog.getOpenFileNames(
             parent=None,
             caption='Choose CSV Files',
-            dir=dir,
+            dir=DATA_DIR,
             filter='CSV Files (*.csv);;All Files (*)',
         )
 
         return file_paths
 
+    @staticmethod
+    def find_file_paths(
+        stand: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        catalog: 'Catalog | None' = None,
+    ) -> list[str]:
+        """
+        Look up the files of a stand and time range in the catalog.
+
+        Args:
+            stand (str | None): Text the file paths must contain.
+            start (datetime | None): Only files with rows at or after this time.
+            end (datetime | None): Only files with rows at or before this time.
+            catalog (Catalog | None): The catalog to search. Defaults to the
+                catalog of the Production History share.
+
+        Returns:
+            list[str]: The matching files with the most common headers, oldest
+                first, so they can be loaded together.
+        """
+        from src.catalog import Catalog
+
+        catalog = catalog or Catalog()
+        entries = catalog.same_headers(catalog.find(stand, start, end))
+        return [entry.path for entry in entries]
+
     @staticmethod
     def get_total_file_size(file_paths: list[str]) -> float:
         """
@@ -119,45 +326,832 @@ class DataLoader:
         total_size_bytes = sum(p.stat().st_size for p in paths)
         return total_size_bytes / (1024**2)
 
-    def load_data(self, file_paths: list[str]) -> DataFrame | None:
+    @staticmethod
+    def _validate_headers(
+        headers: list[str] | None, reference_headers: list[str] | None
+    ) -> None:
+        """
+        Check one file's headers against the headers of the first file.
+
+        Args:
+            headers (list[str] | None): The file's headers, or None if it has none.
+            reference_headers (list[str] | None): The headers every file must match.
+                None for the first file, which must contain 'Time' instead.
+
+        Raises:
+            CSVHeaderError: If the file has no header, its headers do not match the
+                reference headers, or it has no 'Time' column.
         """
-        Load CSV data from the specified file path.
+        if headers is None or (
+            reference_headers is not None and headers != reference_headers
+        ):
+            raise CSVHeaderError(
+                'Inconsistent headers in the CSV files. Please check the file format.'
+            )
+        if reference_headers is None and not DataLoader._check_for_time_header(headers):
+            raise CSVHeaderError('"Time" header not found in csv file.')
+
+    @staticmethod
+    def rename_headers(headers: list[str]) -> list[str]:
+        """Apply RENAME_MAP to a list of raw CSV headers."""
+        return [RENAME_MAP.get(header, header) for header in headers]
+
+    @staticmethod
+    def _in_header_order(df: DataFrame, headers: list[str]) -> DataFrame:
+        """Put columns pulled from the cache back in the order of the CSV file's headers."""
+        order = dict.fromkeys(DataLoader.rename_headers(headers))
+        return df[[column for column in order if column in df.columns]]
+
+    @staticmethod
+    def _read_header(f: BinaryIO, path: Path) -> list[str] | None:
+        """
+        Sniff for a header row and read it, leaving the cursor at the start of the file.
+
+        Args:
+            f (BinaryIO): The open CSV file, positioned at the start.
+            path (Path): The file's path, for error messages.
+
+        Returns:
+            list[str] | None: The file's headers, or None if it has no header row.
+        """
+        try:
+            sample: str = f.read(BYTES_TO_READ).decode('utf-8', errors='ignore')
+            if '\n' in sample:
+                # Don't let a row cut off at BYTES_TO_READ confuse the sniffer
+                sample = sample[: sample.rindex('\n') + 1]
+            has_header = csv.Sniffer().has_header(sample)
+
+            f.seek(0)  # send the file cursor to the beginning of the file
+            reader: Iterator[list[str]] = csv.reader([f.readline().decode('utf-8')])
+            headers: list[str] = next(reader)
+        except Exception as e:
+            print(f'Error reading "{path.name}": {str(e)}')
+            return None
+        finally:
+            f.seek(0)
+
+        return headers if has_header else None
+
+    @staticmethod
+    def count_rows(file_path: str, byte_range: tuple[int, int] | None = None) -> int:
+        """
+        Count the data rows of a CSV file from its line breaks, without parsing it.
+
+        Much faster than parsing, and the file is then in the OS file cache when
+        it is parsed. Quoted values with line breaks in them are counted as
+        extra rows, so treat the result as a size to allocate for.
 
         Args:
             file_path (str): The path to the CSV file.
+            byte_range (tuple[int, int] | None): Only count the rows in these
+                bytes, as found by `_window_range`. None counts every row.
 
         Returns:
-            DataFrame | None: The loaded DataFrame or None.
+            int: The number of lines after the header row, or in `byte_range`.
         """
+        first, end = byte_range if byte_range is not None else (0, None)
+        lines = 0
+        last = b'\n'
+        with open(file_path, 'rb') as f:
+            f.seek(first)
+            remaining = end - first if end is not None else -1
+            while remaining and (block := f.read(COUNT_BLOCK_BYTES)):
+                if remaining > 0:
+                    block = block[:remaining]
+                    remaining -= len(block)
+                lines += block.count(b'\n')
+                last = block[-1:]
+        if last != b'\n':
+            lines += 1  # the last row has no line break
+        return lines if byte_range is not None else max(0, lines - 1)
 
-        has_headers, headers = self._check_csv_headers(file_paths)
+    @staticmethod
+    def _window_range(
+        f: BinaryIO, headers: list[str], options: ReadOptions
+    ) -> tuple[int, int]:
+        """
+        Find the bytes of an open CSV file that hold the rows of the time window
+        of `options`. See `window_byte_range`.
+        """
+        f.seek(0)
+        f.readline()  # the header row
+        data_start = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        try:
+            first, last = window_byte_range(
+                f, data_start, size, headers.index('Time'), options.start, options.end
+            )
+            if options.follow and last > first:
+                # Leave a row the writer is part way through for tail()
+                f.seek(max(first, last - TAIL_PROBE_BYTES))
+                block = f.read(last - f.tell())
+                last = max(first, last - (len(block) - (block.rfind(b'\n') + 1)))
+            return first, last
+        finally:
+            f.seek(0)
 
-        if has_headers is False:
-            raise ValueError(
-                'Inconsistent headers in the CSV files. Please check the file format.'
+    @staticmethod
+    def _read_csv(
+        file_path: str,
+        options: ReadOptions,
+        reference_headers: list[str] | None = None,
+        on_chunk: Callable[[int, int], None] | None = None,
+        cancel_event: threading.Event | None = None,
+        expected_rows: int = 0,
+        table: ColumnBuffer | None = None,
+        byte_range: tuple[int, int] | None = None,
+    ) -> FileResult:
+        """
+        Validate and parse a single CSV file through one open file handle.
+
+        The header sniffing, the header comparison and the 'Time' check all run
+        on the same handle that pandas then parses, so every file is opened once.
+        Columns found in the cache are not parsed, and a file whose requested
+        columns are all cached is validated against its cached headers and not
+        opened at all. With `options.chunk_rows` set the file is parsed in chunks
+        that are copied into a ColumnBuffer and dropped, so only one chunk of
+        parser output is alive at a time. Given a `table`, the chunks are copied
+        straight onto it, so the file is never held apart from the table. With a
+        time window in `options`, only the bytes of the rows in the window are
+        parsed, see `window_byte_range`, and cached files are cut down to the
+        window without reading the rows outside it. Windowed reads are never
+        written to the cache. The statistics of the file are summed up chunk by
+        chunk as it is parsed, and kept in the cache with it, see `FileStats`.
+        Static so it can be pickled into a worker process.
+
+        Args:
+            file_path (str): The path to the CSV file.
+            options (ReadOptions): How to read the file.
+            reference_headers (list[str] | None): The headers every file must match.
+                None for the first file, whose headers become the reference.
+            on_chunk (Callable[[int, int], None] | None): Called after every chunk
+                with the bytes and rows of the file read so far.
+            cancel_event (threading.Event | None): Checked between chunks.
+            expected_rows (int): The rows to allocate for, from `_plan_file`.
+            table (ColumnBuffer | None): The table of the whole load to append the
+                parsed rows to. Only used when no columns come from the cache.
+            byte_range (tuple[int, int] | None): The bytes of the rows in the time
+                window, if already found by `_window_range`.
+
+        Raises:
+            CSVHeaderError: If the file has no header, its headers do not match the
+                reference headers, or it has no 'Time' column.
+            LoadCancelled: If `cancel_event` is set before the file is parsed.
+
+        Returns:
+            FileResult: The parsed and renamed data with 'Time' as datetime64, the
+                file's raw headers, whether all of the data came from the cache,
+                with `options.follow` the byte offset just past the last complete
+                row, the time spent in each stage and the file's statistics.
+                With `in_table` set the data is a view of the rows appended to
+                `table`.
+        """
+        columns = options.columns
+        if columns is not None and 'Time' not in columns:
+            columns = ['Time', *columns]
+
+        # Recorded here and returned, since this may run in another process
+        instrumentation = Instrumentation(options.trace_memory)
+        stage = instrumentation.stage
+
+        cache = options.cache
+        cached_df: DataFrame | None = None
+        if cache is not None:
+            with stage('cache_read') as record:
+                cached = cache.get(file_path, columns, options.start, options.end)
+                if cached is not None:
+                    record.rows = len(cached[0])
+            if cached is not None:
+                cached_df, headers = cached
+                DataLoader._validate_headers(headers, reference_headers)
+                wanted = (
+                    DataLoader.rename_headers(headers) if columns is None else columns
+                )
+                if set(wanted) <= set(cached_df.columns):
+                    df = DataLoader._in_header_order(cached_df, headers)
+                    with stage('stats', rows=len(df)):
+                        stats = DataLoader._cached_stats(file_path, df, options)
+                    return FileResult(
+                        df,
+                        headers,
+                        True,
+                        stages=instrumentation.records,
+                        stats=stats,
+                    )
+                if options.windowed:
+                    # The window is found differently in the file, so the rows
+                    # are only sure to line up if every column is parsed
+                    cached_df = None
+
+        path = Path(file_path)
+        with path.open('rb') as f:
+            with stage('header'):
+                headers = DataLoader._read_header(f, path)
+                DataLoader._validate_headers(headers, reference_headers)
+
+            # Only parse the requested columns the cache didn't have
+            skip = set(cached_df.columns) if cached_df is not None else set()
+            usecols = None
+            if columns is not None or skip:
+                usecols = [
+                    header
+                    for header in headers
+                    if (columns is None or RENAME_MAP.get(header, header) in columns)
+                    and RENAME_MAP.get(header, header) not in skip
+                ]
+
+            source: BinaryIO = f
+            read_options: dict = {'usecols': usecols}
+            if options.windowed:
+                if byte_range is None:
+                    with stage('window'):
+                        byte_range = DataLoader._window_range(f, headers, options)
+                f.seek(byte_range[0])
+                source = io.BufferedReader(_ByteRange(f, byte_range[1] - byte_range[0]))
+                read_options.update(header=None, names=headers)
+
+            chunks: Iterable[DataFrame]
+            chunked = bool(options.chunk_rows) and options.engine != 'pyarrow'
+            if byte_range is not None and byte_range[0] == byte_range[1]:
+                chunks = ()  # no rows in the window
+            elif chunked:
+                chunks = pd.read_csv(
+                    source, chunksize=options.chunk_rows, **read_options
+                )
+            else:
+                # The pyarrow parser has no chunked mode. Parsed lazily so that
+                # the parse is timed as the read_csv stage.
+                chunks = (
+                    pd.read_csv(source, engine=options.engine, **read_options)
+                    for _ in range(1)
+                )
+
+            # Rows parsed in one go are used as they are, without a copy
+            buffer: ColumnBuffer | None = None
+            if table is not None and cached_df is None:
+                buffer = table
+            elif chunked:
+                buffer = ColumnBuffer(capacity=expected_rows)
+            start = buffer.rows if buffer is not None else 0
+            df = DataFrame()
+            stats = FileStats(file_path)
+            if cached_df is not None:
+                with stage('stats', rows=len(cached_df)):
+                    stats.update(cached_df)
+            # With follow, the last row read so far, which may turn out to be cut off
+            held: DataFrame | None = None
+            for chunk in instrumentation.iterate('read_csv', chunks, f.tell):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled()
+                with stage('rename'):
+                    chunk.rename(columns=RENAME_MAP, inplace=True, errors='ignore')
+                if 'Time' in chunk.columns:
+                    with stage('parse_time', rows=len(chunk)):
+                        chunk['Time'] = parse_time(chunk['Time'])
+                if options.windowed:
+                    # Drops the rows without a time, and any row out of order
+                    rows = window_rows(
+                        chunk['Time'].to_numpy(), options.start, options.end, False
+                    )
+                    if not rows.all():
+                        chunk = chunk[rows]
+                with stage('stats', rows=len(chunk)):
+                    if options.follow and len(chunk):
+                        if held is not None:
+                            stats.update(held)
+                        held = chunk.iloc[-1:].copy()
+                        stats.update(chunk.iloc[:-1])
+                    else:
+                        stats.update(chunk)
+                if buffer is None:
+                    df = chunk
+                    continue
+                if len(chunk):
+                    with stage('append', rows=len(chunk)):
+                        buffer.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(f.tell(), buffer.rows - start)
+
+            end_offset = 0
+            if options.follow:
+                end_offset = f.tell()
+                f.seek(max(0, end_offset - TAIL_PROBE_BYTES))
+                block = f.read(end_offset - f.tell())
+                rows = buffer.rows - start if buffer is not None else len(df)
+                if block and not block.endswith(b'\n') and rows > 0:
+                    # The writer is part way through a row. Leave it for tail()
+                    end_offset -= len(block) - (block.rfind(b'\n') + 1)
+                    if buffer is not None:
+                        buffer.truncate(buffer.rows - 1)
+                    else:
+                        df = df.iloc[:-1]
+                    held = None
+                if held is not None:
+                    stats.update(held)
+
+            if buffer is not None:
+                with stage('to_frame', rows=buffer.rows - start):
+                    # The table of the load keeps its spare capacity for later files
+                    df = buffer.to_frame(trim=buffer is not table, start=start)
+
+        stats.rows = len(df)  # the cached columns' rows were counted too
+        if cache is not None and not options.windowed:
+            with stage('cache_write', rows=len(df)):
+                cache.put(file_path, df, headers, stats)
+        if cached_df is not None:
+            df = DataLoader._in_header_order(
+                pd.concat([cached_df, df], axis=1), headers
             )
+        return FileResult(
+            df,
+            headers,
+            False,
+            end_offset,
+            instrumentation.records,
+            in_table=buffer is not None and buffer is table,
+            stats=stats,
+        )
 
-        if self._check_for_time_header(headers) is False:
-            raise ValueError('"Time" header not found in csv file.')
+    @staticmethod
+    def _cached_stats(file_path: str, df: DataFrame, options: ReadOptions) -> FileStats:
+        """
+        The statistics of a file read from the cache, as recorded when it was
+        cached. Only columns cached without them, and files cut down to a time
+        window, are summed up from the cached rows.
+        """
+        stats = options.cache.stats(file_path) if not options.windowed else None
+        if stats is None:
+            stats = FileStats(file_path)
+            stats.update(df)
+            return stats
+        missing = [
+            name for name in df.columns if name != 'Time' and name not in stats.channels
+        ]
+        if missing:
+            stats.update(df[missing])
+            stats.rows = len(df)
+        stats.channels = {
+            name: stats.channels[name] for name in df.columns if name in stats.channels
+        }
+        return stats
 
-        try:
-            self.df = pd.concat(map(pd.read_csv, file_paths), ignore_index=True)
-        except Exception as e:
-            print(f'Error loading CSV files: {e}')
+    def _report_progress(self, index: int, bytes_read: int, rows_read: int) -> None:
+        """
+        Record how far the file at `index` has been read and pass the totals to
+        the progress callback. Safe to call from the thread pool.
+        """
+        with self._progress_lock:
+            self._bytes_read += bytes_read - self._file_bytes[index]
+            self._rows_read += rows_read - self._file_rows[index]
+            self._file_bytes[index] = bytes_read
+            self._file_rows[index] = rows_read
+            progress = LoadProgress(
+                bytes_read=self._bytes_read,
+                bytes_total=self._bytes_total,
+                rows=self._rows_read,
+                current_file=self._file_paths[index],
+            )
+        if self.progress is not None:
+            self.progress(progress)
+
+    def _iter_csvs(
+        self,
+        file_paths: list[str],
+        options: ReadOptions,
+        table: ColumnBuffer | None = None,
+    ) -> Iterator[FileResult]:
+        """
+        Validate and parse every file, in parallel when more than one worker is
+        configured, yielding the results in the same order as `file_paths`.
+
+        The first file is read on the calling thread to establish the reference
+        headers. The pyarrow parser releases the GIL, so the remaining files run
+        on a thread pool. The C parser holds the GIL for most of its work, so they
+        run on a process pool, shared between loads. At most two files per
+        worker are in flight, and no more than MAX_IN_FLIGHT_SHARE of the load's
+        bytes, which bounds the memory held by parsed files waiting to be copied
+        into the table. Files read on the calling thread are appended straight
+        onto `table`. The first bad file cancels the files still queued.
+
+        Args:
+            file_paths (list[str]): The CSV files to parse.
+            options (ReadOptions): How to read each file.
+            table (ColumnBuffer | None): The table of the whole load.
+
+        Raises:
+            CSVHeaderError: If any file fails header validation.
+            LoadCancelled: If `cancel` is called during the load.
+
+        Yields:
+            FileResult: Each parsed file.
+        """
+
+        def read_csv(
+            index: int,
+            reference_headers: list[str] | None,
+            table: ColumnBuffer | None = None,
+        ) -> FileResult:
+            return self._read_csv(
+                file_paths[index],
+                options,
+                reference_headers,
+                on_chunk=partial(self._report_progress, index),
+                cancel_event=self._cancel_event,
+                expected_rows=self._expected_rows[index],
+                table=table,
+                byte_range=self._byte_ranges[index],
+            )
+
+        def file_done(index: int, result: FileResult) -> None:
+            self._report_progress(index, self._file_sizes[index], len(result.df))
+
+        first = read_csv(0, None, table)
+        file_done(0, first)
+        headers = first.headers
+        yield first
+        del first  # don't hold on to a parsed file once it has been taken
+
+        indexes = range(1, len(file_paths))
+        workers = min(self.workers, len(indexes))
+        if workers <= 1:
+            for index in indexes:
+                result = read_csv(index, headers, table)
+                file_done(index, result)
+                yield result
+                del result
             return
 
-        rename_map = {
-            'Angular Intensity (mA/str)': 'Angular Intensity (mA/sr)',
-            'Beam Voltage (kV)': 'Beam Voltage (V)',
-            'Extractor Voltage (kV)': 'Extractor Voltage (V)',
-            'Extractor Current (uA)': 'Extractor Current (μA)',
-            'Beam Supply Current (uA)': 'Beam Supply Current (μA)',
-            'Lens #1 Current (uA)': 'Lens Current (μA)',
-            'Lens #1 Voltage (V)': 'Lens Voltage (V)',
-            'Lens #1 Voltage (kV)': 'Lens Voltage (V)',
-            'Total Current (uA)': 'Total Current (A)',
-        }
+        executor: Executor
+        if options.engine == 'pyarrow':
+            executor = ThreadPoolExecutor(max_workers=workers)
+
+            def submit(index: int) -> Future:
+                return executor.submit(read_csv, index, headers)
+
+        else:
+            executor = _get_process_pool(workers)
+
+            # Callbacks and events can't cross into another process, so progress
+            # is reported and cancellation checked as each file comes back
+            def submit(index: int) -> Future:
+                return executor.submit(
+                    self._read_csv,
+                    file_paths[index],
+                    options,
+                    headers,
+                    expected_rows=self._expected_rows[index],
+                    byte_range=self._byte_ranges[index],
+                )
+
+        def parse_bytes(index: int) -> int:
+            byte_range = self._byte_ranges[index]
+            if byte_range is None:
+                return self._file_sizes[index]
+            return byte_range[1] - byte_range[0]
+
+        max_bytes = MAX_IN_FLIGHT_SHARE * sum(map(parse_bytes, range(len(file_paths))))
+        queued = deque(indexes)
+        pending: deque[tuple[int, Future]] = deque()
+        pending_bytes = 0
+
+        def has_room(index: int) -> bool:
+            if len(pending) >= 2 * workers:
+                return False
+            return not pending or pending_bytes + parse_bytes(index) <= max_bytes
+
+        try:
+            while queued or pending:
+                while queued and has_room(queued[0]):
+                    index = queued.popleft()
+                    pending.append((index, submit(index)))
+                    pending_bytes += parse_bytes(index)
+
+                index, future = pending.popleft()
+                result = future.result()
+                del future  # it would keep the parsed file alive until the next one
+                if self._cancel_event.is_set():
+                    raise LoadCancelled()
+                file_done(index, result)
+                yield result
+                del result
+                pending_bytes -= parse_bytes(index)
+        except BaseException as e:
+            for _, future in pending:
+                future.cancel()
+            if isinstance(e, BrokenExecutor):
+                _discard_process_pool(executor)
+            raise
+        finally:
+            if isinstance(executor, ThreadPoolExecutor):
+                executor.shutdown()
+
+    @staticmethod
+    def _estimate_rows(f: BinaryIO, first: int, end: int) -> int:
+        """
+        Estimate the rows in bytes `first` to `end` of an open CSV file from the
+        line lengths of their first SAMPLE_BYTES, without reading the rest.
+
+        Ranges no bigger than the sample are counted exactly. Larger ones get
+        ROWS_MARGIN on top, and a ColumnBuffer grows in blocks if that is still
+        too few.
+        """
+        size = end - first
+        f.seek(first)
+        sample = f.read(min(size, SAMPLE_BYTES))
+        lines = sample.count(b'\n')
+        if len(sample) >= size:
+            return lines + (bool(sample) and not sample.endswith(b'\n'))
+        return math.ceil(size * max(lines, 1) / len(sample) * ROWS_MARGIN)
+
+    @staticmethod
+    def _plan_file(
+        file_path: str, options: ReadOptions, reference_headers: list[str] | None
+    ) -> tuple[list[str], int, tuple[int, int] | None]:
+        """
+        Check a file's headers and size up its rows before any file is parsed.
+
+        Cached files are looked up in the cache. Other files only have their
+        header row and a sample of their rows read, see `_estimate_rows`. With a
+        time window only the rows in the window are estimated, and the bytes that
+        hold them are returned so `_read_csv` doesn't search for them again.
+        Cached files are cut down to the window when they are read.
+
+        Raises:
+            CSVHeaderError: If the file has no header, its headers do not match the
+                reference headers, or it has no 'Time' column.
+
+        Returns:
+            tuple[list[str], int, tuple[int, int] | None]: The file's raw
+                headers, the rows to allocate for and the bytes of the window.
+        """
+        cache = options.cache
+        if cache is not None:
+            headers = cache.headers(file_path)
+            rows = cache.rows(file_path)
+            if headers is not None and rows is not None:
+                DataLoader._validate_headers(headers, reference_headers)
+                return headers, rows, None
+
+        path = Path(file_path)
+        with path.open('rb') as f:
+            headers = DataLoader._read_header(f, path)
+            DataLoader._validate_headers(headers, reference_headers)
+            byte_range: tuple[int, int] | None = None
+            if options.windowed:
+                byte_range = first, end = DataLoader._window_range(f, headers, options)
+            else:
+                f.readline()  # the header row
+                first, end = f.tell(), f.seek(0, os.SEEK_END)
+            return headers, DataLoader._estimate_rows(f, first, end), byte_range
 
-        self.df.rename(columns=rename_map, inplace=True, errors='ignore')
+    def cancel(self) -> None:
+        """Stop a load running on another thread. load_data raises LoadCancelled."""
+        self._cancel_event.set()
+
+    def read_headers(self, file_paths: list[str]) -> list[str]:
+        """
+        Validate the headers of every file without parsing any data.
+
+        Only the first line of each file is read, or nothing at all for files in
+        the cache, so the column lists can be shown before any data is loaded.
+
+        Args:
+            file_paths (list[str]): The paths to the CSV files.
+
+        Raises:
+            CSVHeaderError: If the files have inconsistent headers or no 'Time' column.
+
+        Returns:
+            list[str]: The renamed headers shared by every file.
+        """
+        reference_headers: list[str] | None = None
+        for file_path in file_paths:
+            headers = self.cache.headers(file_path) if self.cache is not None else None
+            if headers is None:
+                path = Path(file_path)
+                with path.open('rb') as f:
+                    headers = self._read_header(f, path)
+            self._validate_headers(headers, reference_headers)
+            reference_headers = headers
+
+        return self.rename_headers(reference_headers or [])
+
+    def load_data(
+        self, file_paths: list[str], columns: list[str] | None = None
+    ) -> DataFrame | None:
+        """
+        Load CSV data from the specified file paths.
+
+        Every file's headers are checked first, and its rows estimated from the
+        cache or from a sample of its rows, so a bad file fails the load before
+        anything is parsed and the final table is allocated about once. Files
+        parsed on the calling thread are written straight into it, and files
+        parsed by the worker pool are copied into it as soon as they arrive and
+        then dropped, so the load holds the table plus a bounded number of parsed
+        files instead of every file and the table.
+        The rows are then merged into time order in place, see `merge_by_time`,
+        and `self.time_sorted` records whether 'Time' ends up in order. With a
+        time window only the rows in the window are estimated and parsed, so the
+        cost of a load follows the size of the window, not of the files. The
+        statistics of each file, summed up as it is parsed, are kept in
+        `self.file_stats` and combined into `self.stats`.
+
+        Args:
+            file_paths (list[str]): The paths to the CSV files.
+            columns (list[str] | None): The renamed columns to load, or None for
+                every column. 'Time' is always loaded.
+
+        Raises:
+            CSVHeaderError: If the files have inconsistent headers or no 'Time' column.
+            LoadCancelled: If `cancel` is called during the load.
+
+        Returns:
+            DataFrame | None: The loaded DataFrame or None.
+        """
+        options = ReadOptions(
+            engine=self.engine,
+            # A growing file misses the size and mtime keyed cache anyway
+            cache=self.cache if not self.follow else None,
+            columns=columns,
+            chunk_rows=self.chunk_rows,
+            follow=self.follow,
+            trace_memory=self.trace_memory,
+            start=self.start,
+            end=self.end,
+        )
+        self.instrumentation = Instrumentation(self.trace_memory)
+        stage = self.instrumentation.stage
+        self._cancel_event.clear()
+        self._file_paths = file_paths
+        self._file_bytes = [0] * len(file_paths)
+        self._file_rows = [0] * len(file_paths)
+        self._bytes_read = self._rows_read = 0
+        self.cache_hits = self.cache_misses = 0
+
+        with stage(TOTAL_STAGE) as total:
+            try:
+                with stage('stat'):
+                    self._file_sizes = [Path(p).stat().st_size for p in file_paths]
+                self._bytes_total = total.bytes = sum(self._file_sizes)
+                # Every header is checked before any file is parsed
+                with stage('plan') as record:
+                    headers: list[str] | None = None
+                    self._expected_rows = []
+                    self._byte_ranges = []
+                    for path in file_paths:
+                        headers, rows, byte_range = self._plan_file(
+                            path, options, headers
+                        )
+                        self._expected_rows.append(rows)
+                        self._byte_ranges.append(byte_range)
+                    record.rows = sum(self._expected_rows)
+                table = ColumnBuffer(capacity=record.rows)
+                self._tail_offsets = []
+                lengths: list[int] = []
+                file_stats: list[FileStats] = []
+                for result in self._iter_csvs(file_paths, options, table):
+                    self.instrumentation.extend(result.stages)
+                    lengths.append(len(result.df))
+                    file_stats.append(result.stats)
+                    if not result.in_table and len(result.df):
+                        with stage('combine', rows=len(result.df)):
+                            table.append(result.df)
+                    self.cache_hits += result.cache_hit
+                    self.cache_misses += not result.cache_hit
+                    self._tail_offsets.append(result.end_offset)
+                    self._tail_headers = result.headers
+                    del result  # let the file go before the next one is read
+                self.file_rows = lengths
+                self.file_stats = file_stats
+                with stage('merge', rows=table.rows):
+                    self._order_by_time(table, lengths)
+                # Followed tables keep their spare capacity for the rows tail() adds
+                with stage('combine', rows=0):
+                    self.df = table.to_frame(trim=not self.follow)
+                self.df.attrs[TIME_SORTED_ATTR] = self.time_sorted
+                if self.rows_dropped:
+                    # The files' statistics count the overlapping rows twice
+                    with stage('stats', rows=len(self.df)):
+                        self.stats = FileStats('All files')
+                        self.stats.update(self.df)
+                else:
+                    self.stats = combine(file_stats)
+                self._table = table if self.follow else None
+                self._columns = columns
+            except (CSVHeaderError, LoadCancelled):
+                raise
+            except Exception as e:
+                print(f'Error loading CSV files: {e}')
+                return
+
+            if self.cache is not None:
+                with stage('cache_evict'):
+                    self.cache.evict()
+
+            if self.compact and not self.follow:
+                with stage('compact', rows=len(self.df)):
+                    compact_frame(self.df)
+            self.memory_report = memory_report(self.df)
+            total.rows = len(self.df)
 
         return self.df
+
+    def _order_by_time(self, table: ColumnBuffer, lengths: list[int]) -> None:
+        """
+        Merge the rows of the files in `table` by time, or with `merge_by_time`
+        off only check whether they are in time order.
+
+        Args:
+            table (ColumnBuffer): The rows of every file, one file after another.
+            lengths (list[int]): The number of rows of each file.
+        """
+        self.rows_dropped = 0
+        if 'Time' not in table.names or table.column('Time').dtype.kind != 'M':
+            self.time_sorted = False
+            return
+        times = table.column('Time')
+        if not self.merge_by_time:
+            self.time_sorted = is_time_sorted(times)
+            return
+
+        result = merge_by_time(times, lengths, self.duplicates)
+        if result.order is not None:
+            table.take(result.order)
+        self.rows_dropped = result.dropped
+        self.time_sorted = True
+
+    def tail(self) -> int:
+        """
+        Append the rows written to the loaded files since they were last read.
+
+        Each file is read from the offset where the previous load or tail
+        stopped, and only complete rows are taken, so the cost depends on how
+        much was written and not on the size of the file. The new rows go into
+        the spare capacity of the loaded table, which grows in large blocks.
+        They are not merged by time, so `self.time_sorted` is cleared if they
+        go back in time. Rows outside the time window are dropped. The new rows
+        are added to `self.file_stats` and `self.stats`, which are replaced
+        rather than changed, so they can be read while a tail runs. Only works
+        after `load_data` with `follow=True`.
+
+        Raises:
+            ValueError: If the loader was not created with `follow=True` or no
+                files have been loaded.
+
+        Returns:
+            int: The number of rows appended to `self.df`.
+        """
+        if self._table is None:
+            raise ValueError('Load files with follow=True before tailing them.')
+
+        usecols = None
+        if self._columns is not None:
+            wanted = {'Time', *self._columns}
+            usecols = [h for h in self._tail_headers if RENAME_MAP.get(h, h) in wanted]
+
+        appended = 0
+        rows_before = self._table.rows
+        total = copy.deepcopy(self.stats)
+        for index, file_path in enumerate(self._file_paths):
+            offset = self._tail_offsets[index]
+            with open(file_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size <= offset:
+                    continue  # nothing new, or the file was replaced by a shorter one
+                f.seek(offset)
+                data = f.read(size - offset)
+
+            complete = data.rfind(b'\n') + 1
+            if complete == 0:
+                continue  # only part of a row so far
+            self._tail_offsets[index] = offset + complete
+
+            new_rows = pd.read_csv(
+                io.BytesIO(data[:complete]),
+                header=None,
+                names=self._tail_headers,
+                usecols=usecols,
+            )
+            new_rows.rename(columns=RENAME_MAP, inplace=True, errors='ignore')
+            new_rows['Time'] = parse_time(new_rows['Time'])
+            if self.start is not None or self.end is not None:
+                times = new_rows['Time'].to_numpy()
+                new_rows = new_rows[window_rows(times, self.start, self.end, False)]
+                if not len(new_rows):
+                    continue
+            self._table.append(new_rows)
+            self.file_rows[index] += len(new_rows)
+            appended += len(new_rows)
+            stats = copy.deepcopy(self.file_stats[index])
+            stats.update(new_rows)
+            self.file_stats[index] = stats
+            total.update(new_rows)
+
+        if appended:
+            if self.time_sorted:
+                times = self._table.column('Time')[max(0, rows_before - 1) :]
+                self.time_sorted = is_time_sorted(times)
+            self.df = self._table.to_frame(trim=False)
+            self.df.attrs[TIME_SORTED_ATTR] = self.time_sorted
+            self.stats = total
+        return appended
@@ -1,100 +1,197 @@
+from datetime import datetime
+
+import numpy as np
 import plotly.graph_objects as go
-import plotly.io as pio
-from pandas import DataFrame, to_datetime
+from pandas import DataFrame
 from plotly.graph_objects import Figure
 
+from src.config import DEFAULT_MAX_POINTS
+from src.derived import DerivedChannels
+from src.downsample import downsample
+from src.instrumentation import Instrumentation
+from src.time_merge import TIME_SORTED_ATTR
+from src.time_parser import parse_time
+from src.time_window import check_window, window_rows
+
+RENDER_MODES = ('auto', 'svg', 'webgl')
+WEBGL_THRESHOLD = 100_000
+
 
 class Plotter:
     def __init__(
-        self, title: str, x_axis: str, traces: list[str], data: DataFrame
+        self,
+        title: str,
+        x_axis: str,
+        traces: list[str],
+        data: DataFrame,
+        downsample_mode: str | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+        render_mode: str = 'auto',
+        instrumentation: Instrumentation | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        derived: DerivedChannels | None = None,
+        data_version: int = 0,
     ) -> None:
-        pio.renderers.default = 'browser'
+        """
+        Args:
+            title (str): The figure title.
+            x_axis (str): The column to plot against.
+            traces (list[str]): The columns to plot, 'None' for an empty slot.
+            data (DataFrame): The loaded data. Read only.
+            downsample_mode (str | None): 'lttb' or 'minmax' to cut every trace
+                down to `max_points` before it is sent to plotly, or None to plot
+                every row.
+            max_points (int): The point budget per trace when downsampling.
+            render_mode (str): 'svg' for go.Scatter, 'webgl' for go.Scattergl, or
+                'auto' to switch to WebGL once a trace has more than
+                WEBGL_THRESHOLD points.
+            instrumentation (Instrumentation | None): Records the time spent in
+                each stage of `create_fig`.
+            start (datetime | None): Only plot the rows at or after this time.
+            end (datetime | None): Only plot the rows at or before this time.
+            derived (DerivedChannels | None): The derived channels that `x_axis`
+                and `traces` may name besides the loaded columns.
+            data_version (int): The version of `data`, which the values of
+                derived channels are cached by.
+
+        Raises:
+            ValueError: If `end` is before `start`.
+        """
+        check_window(start, end)
         self.title = title
         self.x_axis = x_axis
         self.traces = traces
         self.df = data
+        self.downsample_mode = downsample_mode
+        self.max_points = max_points
+        self.render_mode = render_mode
+        self.instrumentation = instrumentation or Instrumentation()
+        self.start = start
+        self.end = end
+        self.derived = derived
+        self.data_version = data_version
+
+    def _column(self, name: str) -> np.ndarray:
+        """The values of a loaded column or a derived channel, for every row."""
+        if name in self.df.columns or self.derived is None or name not in self.derived:
+            return self.df[name].to_numpy()
+        with self.instrumentation.stage('derived', rows=len(self.df)):
+            return self.derived.values(name, self.df, self.data_version)
 
     def create_fig(self) -> Figure:
         """Creates the plotly figure and applies standard formatting."""
         fig: Figure = Figure()
 
-        data_to_plot = [
-            (col, self.df[col].tolist() if col != 'None' else None)
-            for col in self.traces
-        ]
+        # Time is already datetime64 when loaded by DataLoader. Never written
+        # back, the DataFrame is shared with the GUI thread. The traces are
+        # handed to plotly as NumPy arrays, which are views of the DataFrame's
+        # columns unless downsampling or an unsorted time window picked a
+        # subset of rows.
+        stage = self.instrumentation.stage
+        window: slice | np.ndarray = slice(None)
+        if self.start is not None or self.end is not None:
+            with stage('window', rows=len(self.df)):
+                times = parse_time(self.df['Time']).to_numpy()
+                time_sorted = self.df.attrs.get(TIME_SORTED_ATTR, False)
+                window = window_rows(times, self.start, self.end, time_sorted)
+        with stage('x_values', rows=len(self.df)):
+            x_values = (
+                parse_time(self.df['Time']).to_numpy()
+                if self.x_axis == 'Time'
+                else self._column(self.x_axis)
+            )[window]
 
-        time: list = []
-        if self.x_axis == 'Time':
-            self.df['Time'] = to_datetime(
-                self.df['Time'], format='%m/%d/%Y %I:%M:%S %p'
-            )
-            time = self.df['Time'].tolist()
-
-        axis_colors = ['red', 'white', 'limegreen', 'yellow']
-
-        # Choose position values spaced slightly inside [0, 1]
-        position_map = {
-            0: 0.90,  # yaxis (right, offset inwards)
-            1: 1.00,  # yaxis2 (right, base)
-            2: 0.10,  # yaxis3 (left, offset inwards)
-            3: 0.00,  # yaxis4 (left, base)
-        }
-
-        for i, (column_name, y_data) in enumerate(data_to_plot):
-            yaxis_layout_key = 'yaxis' if i == 0 else f'yaxis{i + 1}'
-            yaxis_name = f'y{i + 1}'  # y, y2, y3, etc.
-            trace_yaxis = 'y' if i == 0 else yaxis_name
-            overlaying = 'y' if i > 0 else None
-            side = 'right' if i < 2 else 'left'
-            anchor = 'x' if i % 2 == 0 else 'free'
-            tickformat = '.2e' if column_name == 'Source Pressure (mBar)' else None
-            visible = True if column_name != 'None' else False
-            x_data = time if self.x_axis == 'Time' else self.df[self.x_axis].tolist()
-
-            yaxis_layout_dict = dict(
-                anchor=anchor,
-                color=axis_colors[i],
-                overlaying=overlaying,
-                position=position_map[i],
-                showgrid=False,
-                side=side,
-                tickfont=dict(color=axis_colors[i]),
-                tickformat=tickformat,
-                title=column_name,
-                visible=visible,
-                zeroline=False,
-            )
+        data_to_plot: list[tuple[str, np.ndarray | None, np.ndarray | None]] = []
+        for col in self.traces:
+            if col == 'None':
+                data_to_plot.append((col, None, None))
+                continue
+            y_values = self._column(col)[window]
+            if self.downsample_mode is not None:
+                # Each trace keeps its own rows, picked from its own values
+                with stage('downsample', rows=len(y_values)):
+                    keep = downsample(
+                        x_values, y_values, self.max_points, self.downsample_mode
+                    )
+                data_to_plot.append((col, x_values[keep], y_values[keep]))
+            else:
+                data_to_plot.append((col, x_values, y_values))
+
+        scatter = go.Scatter
+        largest_trace = max(
+            (len(y) for _, _, y in data_to_plot if y is not None), default=0
+        )
+        if self.render_mode == 'webgl' or (
+            self.render_mode == 'auto' and largest_trace > WEBGL_THRESHOLD
+        ):
+            scatter = go.Scattergl
+
+        with stage('build_figure', rows=largest_trace):
+            axis_colors = ['red', 'white', 'limegreen', 'yellow']
 
-            fig.add_trace(
-                go.Scatter(
-                    x=x_data,
-                    y=y_data,
-                    line=dict(color=axis_colors[i]),
-                    mode='lines',
-                    name=column_name,
-                    yaxis=trace_yaxis,
+            # Choose position values spaced slightly inside [0, 1]
+            position_map = {
+                0: 0.90,  # yaxis (right, offset inwards)
+                1: 1.00,  # yaxis2 (right, base)
+                2: 0.10,  # yaxis3 (left, offset inwards)
+                3: 0.00,  # yaxis4 (left, base)
+            }
+
+            for i, (column_name, x_data, y_data) in enumerate(data_to_plot):
+                yaxis_layout_key = 'yaxis' if i == 0 else f'yaxis{i + 1}'
+                yaxis_name = f'y{i + 1}'  # y, y2, y3, etc.
+                trace_yaxis = 'y' if i == 0 else yaxis_name
+                overlaying = 'y' if i > 0 else None
+                side = 'right' if i < 2 else 'left'
+                anchor = 'x' if i % 2 == 0 else 'free'
+                tickformat = '.2e' if column_name == 'Source Pressure (mBar)' else None
+                visible = True if column_name != 'None' else False
+
+                yaxis_layout_dict = dict(
+                    anchor=anchor,
+                    color=axis_colors[i],
+                    overlaying=overlaying,
+                    position=position_map[i],
+                    showgrid=False,
+                    side=side,
+                    tickfont=dict(color=axis_colors[i]),
+                    tickformat=tickformat,
+                    title=column_name,
                     visible=visible,
+                    zeroline=False,
                 )
-            )
 
-            fig.update_layout({yaxis_layout_key: yaxis_layout_dict})
-
-        xaxis_title = self.x_axis
-        if xaxis_title == 'Time':
-            xaxis_title = None
-
-        fig.update_layout(
-            paper_bgcolor='rgba(132,132,132,1)',
-            plot_bgcolor='black',
-            legend_font_color='black',
-            title=dict(text=self.title, font=dict(size=28), x=0.5),
-            xaxis_title=xaxis_title,
-            legend=dict(
-                orientation='h',
-                xanchor='center',
-                x=0.5,
-            ),
-            xaxis=dict(domain=[0.05, 0.95], showgrid=False, color='black'),
-        )
+                fig.add_trace(
+                    scatter(
+                        x=x_data,
+                        y=y_data,
+                        line=dict(color=axis_colors[i]),
+                        mode='lines',
+                        name=column_name,
+                        yaxis=trace_yaxis,
+                        visible=visible,
+                    )
+                )
+
+                fig.update_layout({yaxis_layout_key: yaxis_layout_dict})
+
+            xaxis_title = self.x_axis
+            if xaxis_title == 'Time':
+                xaxis_title = None
+
+            fig.update_layout(
+                paper_bgcolor='rgba(132,132,132,1)',
+                plot_bgcolor='black',
+                legend_font_color='black',
+                title=dict(text=self.title, font=dict(size=28), x=0.5),
+                xaxis_title=xaxis_title,
+                legend=dict(
+                    orientation='h',
+                    xanchor='center',
+                    x=0.5,
+                ),
+                xaxis=dict(domain=[0.05, 0.95], showgrid=False, color='black'),
+            )
 
         return fig
@@ -0,0 +1,222 @@
+import threading
+from abc import ABC, ABCMeta, abstractmethod
+from collections import deque
+from enum import Enum
+from functools import partial
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from src.config import DEFAULT_MAX_HEAVY_JOBS
+
+# Threads kept on top of the heavy jobs' for light jobs, such as reading
+# headers or checking followed files, so they never wait behind a long load
+LIGHT_JOB_THREADS = 2
+
+
+class JobStatus(Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class _JobMeta(ABCMeta, type(QObject)):
+    """
+    Lets `Job` be both a QObject and an ABC. Shiboken creates QObjects without
+    the check for unimplemented abstract methods that `object` makes, so the
+    check is made here.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if cls.__abstractmethods__:
+            missing = ', '.join(sorted(cls.__abstractmethods__))
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} without an "
+                f'implementation for abstract method(s) {missing}'
+            )
+        return super().__call__(*args, **kwargs)
+
+
+class Job(QObject, ABC, metaclass=_JobMeta):
+    """
+    Work run on a `JobScheduler`'s thread pool.
+
+    Subclasses implement `run` and emit their results through signals of their
+    own, which reach slots on the GUI thread the same way a QThread's do. An
+    exception raised by `run` is emitted as `error_occurred`, and a job that
+    was cancelled emits `cancelled` once it has stopped.
+    """
+
+    error_occurred = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._cancel_event = threading.Event()
+
+    @abstractmethod
+    def run(self) -> None:
+        """Do the work on a pool thread."""
+
+    def cancel(self) -> None:
+        """
+        Ask the job to stop. `run` checks `is_cancelled` at the points where it
+        can stop early and skips emitting results once it is set.
+        """
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+
+class JobHandle(QObject):
+    """The status of a submitted job, and a way to cancel it."""
+
+    status_changed = Signal(JobStatus)
+
+    def __init__(self, job: Job, key: str | None, heavy: bool) -> None:
+        super().__init__()
+        self.job = job
+        self.key = key
+        self.heavy = heavy
+        self.status = JobStatus.QUEUED
+
+    @property
+    def done(self) -> bool:
+        return self.status in (
+            JobStatus.FINISHED,
+            JobStatus.FAILED,
+            JobStatus.CANCELLED,
+        )
+
+    def _set_status(self, status: JobStatus) -> None:
+        self.status = status
+        self.status_changed.emit(status)
+
+    def cancel(self) -> None:
+        """
+        Cancel the job. A queued job never starts. A running job is asked to stop
+        and is marked cancelled once it has.
+        """
+        if self.done:
+            return
+        self.job.cancel()
+        if self.status is JobStatus.QUEUED:
+            self._set_status(JobStatus.CANCELLED)
+            self.job.cancelled.emit()
+
+
+class JobScheduler(QObject):
+    """
+    Run jobs on one reusable thread pool instead of a new QThread per job.
+
+    At most `max_heavy_jobs` heavy jobs, such as loads, plots and saves, run at
+    once. Later ones wait in the order they were submitted. Light jobs start
+    straight away. Submitting a job with the same `key` as unfinished jobs
+    cancels them, so of several quick re-plots only the latest is drawn.
+    Handles are only changed on the GUI thread.
+    """
+
+    _job_ended = Signal(JobHandle, str)
+
+    def __init__(
+        self,
+        max_heavy_jobs: int = DEFAULT_MAX_HEAVY_JOBS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.max_heavy_jobs = max(1, max_heavy_jobs)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.max_heavy_jobs + LIGHT_JOB_THREADS)
+        self._queue: deque[JobHandle] = deque()
+        self._handles: list[JobHandle] = []
+        self._running_heavy: int = 0
+        self._job_ended.connect(self._handle_job_ended)
+
+    def submit(self, job: Job, key: str | None = None, heavy: bool = True) -> JobHandle:
+        """
+        Queue a job to run on the thread pool.
+
+        Args:
+            job (Job): The job to run.
+            key (str | None): What the job produces, such as 'plot'. Unfinished
+                jobs with the same key are cancelled. None never cancels others.
+            heavy (bool): Count the job against `max_heavy_jobs`.
+
+        Returns:
+            JobHandle: The job's status, and a way to cancel it.
+        """
+        if key is not None:
+            for handle in self.handles(key):
+                handle.cancel()
+
+        handle = JobHandle(job, key, heavy)
+        self._handles.append(handle)
+        if heavy:
+            self._queue.append(handle)
+            self._start_queued()
+        else:
+            self._start(handle)
+        return handle
+
+    def handles(self, key: str | None = None) -> list[JobHandle]:
+        """
+        List the jobs that are queued or running.
+
+        Args:
+            key (str | None): Only list the jobs with this key. None lists all.
+
+        Returns:
+            list[JobHandle]: The unfinished jobs, oldest first.
+        """
+        return [
+            handle
+            for handle in self._handles
+            if not handle.done and (key is None or handle.key == key)
+        ]
+
+    def shutdown(self) -> None:
+        """Cancel every job and wait for the running ones to stop."""
+        for handle in self.handles():
+            handle.cancel()
+        self._pool.waitForDone()
+
+    def _start_queued(self) -> None:
+        while self._queue and self._running_heavy < self.max_heavy_jobs:
+            handle = self._queue.popleft()
+            if handle.status is not JobStatus.QUEUED:
+                self._handles.remove(handle)  # cancelled while it waited
+                continue
+            self._running_heavy += 1
+            self._start(handle)
+
+    def _start(self, handle: JobHandle) -> None:
+        handle._set_status(JobStatus.RUNNING)
+        self._pool.start(partial(self._run, handle))
+
+    def _run(self, handle: JobHandle) -> None:
+        """Run a job on a pool thread and report back to the GUI thread."""
+        error = ''
+        try:
+            handle.job.run()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if not handle.job.is_cancelled():
+                print(f'Error in {type(handle.job).__name__}: {error}')
+        self._job_ended.emit(handle, error)
+
+    def _handle_job_ended(self, handle: JobHandle, error: str) -> None:
+        self._handles.remove(handle)
+        if handle.heavy:
+            self._running_heavy -= 1
+
+        if handle.job.is_cancelled():
+            handle._set_status(JobStatus.CANCELLED)
+            handle.job.cancelled.emit()
+        elif error:
+            handle._set_status(JobStatus.FAILED)
+            handle.job.error_occurred.emit(error)
+        else:
+            handle._set_status(JobStatus.FINISHED)
+        self._start_queued()
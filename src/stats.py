@@ -0,0 +1,185 @@
+import copy
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import numpy as np
+from pandas import DataFrame
+
+from src.config import DEFAULT_CHUNK_ROWS
+
+
+@dataclass
+class ChannelStats:
+    """
+    The running count, mean, minimum and maximum of one channel, and the sum of
+    squared differences from the mean (M2) that its variance comes from.
+
+    Each chunk's mean and M2 are taken around the chunk's own mean, then merged
+    into the running values with the pairwise update of Chan, Golub and
+    LeVeque, which is Welford's algorithm applied a chunk at a time. Unlike
+    summing squares, this doesn't lose the variance to rounding when a channel
+    varies little around a large value, such as a beam voltage.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = math.nan
+    maximum: float = math.nan
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation, as a spreadsheet's STDEV gives it."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a chunk of values. NaN and infinite values are skipped."""
+        values = values.astype(np.float64, copy=False)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        minimum, maximum = float(values.min()), float(values.max())
+        self.merge(ChannelStats(len(values), mean, m2, minimum, maximum))
+
+    def merge(self, other: 'ChannelStats') -> None:
+        """Add the values summarized by `other`."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_list(self) -> list[float]:
+        return [self.count, self.mean, self.m2, self.minimum, self.maximum]
+
+    @classmethod
+    def from_list(cls, values: list[float]) -> 'ChannelStats':
+        count, mean, m2, minimum, maximum = values
+        return cls(int(count), mean, m2, minimum, maximum)
+
+
+@dataclass
+class FileStats:
+    """
+    Summary statistics of the rows read from one file, or from every file.
+
+    Built up chunk by chunk while the rows are parsed, so the data is never
+    read a second time for them, and updated the same way as rows are added.
+    Numeric columns get a `ChannelStats` each. Other columns, such as a
+    status, are left out.
+    """
+
+    path: str = ''
+    rows: int = 0
+    first_time: datetime | None = None
+    last_time: datetime | None = None
+    channels: dict[str, ChannelStats] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> timedelta | None:
+        """The time from the first to the last row."""
+        if self.first_time is None or self.last_time is None:
+            return None
+        return self.last_time - self.first_time
+
+    def update(self, df: DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+        """
+        Add rows, `chunk_rows` at a time so the temporary arrays stay small.
+
+        Args:
+            df (DataFrame): The rows, with 'Time' as datetime64 if it is included.
+            chunk_rows (int): The rows summarized at a time.
+        """
+        self.rows += len(df)
+        if len(df) == 0:
+            return
+        for name, column in df.items():
+            values = column.to_numpy()
+            if name == 'Time':
+                if values.dtype.kind == 'M':
+                    self._update_time(values)
+            elif values.dtype.kind in 'iuf':
+                channel = self.channels.setdefault(str(name), ChannelStats())
+                for first in range(0, len(values), chunk_rows):
+                    channel.update(values[first : first + chunk_rows])
+
+    def _update_time(self, times: np.ndarray) -> None:
+        times = times[~np.isnat(times)]
+        if len(times) == 0:
+            return
+        first = times.min().astype('datetime64[us]').item()
+        last = times.max().astype('datetime64[us]').item()
+        if self.first_time is None or first < self.first_time:
+            self.first_time = first
+        if self.last_time is None or last > self.last_time:
+            self.last_time = last
+
+    def merge(self, other: 'FileStats') -> None:
+        """Add the rows summarized by `other`, such as another file's."""
+        self.rows += other.rows
+        for time in (other.first_time, other.last_time):
+            if time is not None:
+                self.first_time = min(self.first_time or time, time)
+                self.last_time = max(self.last_time or time, time)
+        for name, channel in other.channels.items():
+            self.channels.setdefault(name, ChannelStats()).merge(channel)
+
+    def with_channels(self, other: 'FileStats') -> 'FileStats':
+        """
+        A copy with the channels of `other`, summarized over the same rows, such
+        as columns loaded later, added or replacing those of the same name.
+        """
+        stats = copy.deepcopy(self)
+        stats.channels.update(copy.deepcopy(other.channels))
+        return stats
+
+    def to_dict(self) -> dict:
+        """The statistics as JSON-friendly values, see `from_dict`."""
+        return {
+            'rows': self.rows,
+            'first_time': self.first_time.isoformat() if self.first_time else None,
+            'last_time': self.last_time.isoformat() if self.last_time else None,
+            'channels': {
+                name: channel.to_list() for name, channel in self.channels.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, path: str, values: dict) -> 'FileStats':
+        """
+        Raises:
+            KeyError, TypeError, ValueError: If `values` wasn't made by `to_dict`.
+        """
+        return cls(
+            path=path,
+            rows=int(values['rows']),
+            first_time=_parse_time(values['first_time']),
+            last_time=_parse_time(values['last_time']),
+            channels={
+                name: ChannelStats.from_list(channel)
+                for name, channel in values['channels'].items()
+            },
+        )
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def combine(files: list[FileStats]) -> FileStats:
+    """The statistics of every row of `files` together, without reading any rows."""
+    total = FileStats('All files')
+    for stats in files:
+        total.merge(stats)
+    return total
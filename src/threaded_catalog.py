@@ -0,0 +1,22 @@
+from PySide6.QtCore import Signal
+
+from src.catalog import Catalog, CatalogUpdate
+from src.config import DATA_DIR
+from src.scheduler import Job
+
+
+class CatalogUpdateWorker(Job):
+    finished = Signal(CatalogUpdate)
+    progress = Signal(int, str)
+
+    def __init__(self, catalog: Catalog | None = None, root: str = DATA_DIR) -> None:
+        super().__init__()
+        self.catalog = catalog or Catalog()
+        self.root = root
+
+    def run(self) -> None:
+        result = self.catalog.update(
+            self.root, progress=self.progress.emit, cancelled=self.is_cancelled
+        )
+        if not self.is_cancelled():
+            self.finished.emit(result)
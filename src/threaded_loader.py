@@ -1,21 +1,96 @@
+from datetime import datetime
+
 from pandas import DataFrame
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import Signal
 
-from src.loader import DataLoader
+from src.config import DEFAULT_CHUNK_ROWS, DEFAULT_WORKERS
+from src.csv_cache import CSVCache
+from src.loader import DataLoader, LoadCancelled, LoadProgress
+from src.scheduler import Job
 
 
-class LoadDataWorker(QThread):
+class LoadDataWorker(Job):
     finished = Signal(DataFrame)
-    error_occurred = Signal(str)
+    headers_loaded = Signal(list)
+    progress = Signal(LoadProgress)
 
-    def __init__(self, file_list: list[str]) -> None:
+    def __init__(
+        self,
+        file_list: list[str],
+        workers: int = DEFAULT_WORKERS,
+        engine: str = 'c',
+        use_cache: bool = True,
+        columns: list[str] | None = None,
+        headers_only: bool = False,
+        compact: bool = False,
+        chunk_rows: int | None = DEFAULT_CHUNK_ROWS,
+        follow: bool = False,
+        trace_memory: bool = False,
+        log_path: str | None = None,
+        merge_by_time: bool = True,
+        duplicates: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> None:
         super().__init__()
         self.file_list = file_list
+        self.columns = columns
+        self.headers_only = headers_only
+        # None when the cache is off, so no cache counts are shown
+        self.cache_hits: int | None = None
+        self.cache_misses: int | None = None
+        self.log_path = log_path
+        self.data_loader = DataLoader(
+            workers=workers,
+            engine=engine,
+            cache=CSVCache() if use_cache else None,
+            compact=compact,
+            chunk_rows=chunk_rows,
+            progress=self.progress.emit,
+            follow=follow,
+            trace_memory=trace_memory,
+            merge_by_time=merge_by_time,
+            duplicates=duplicates,
+            start=start,
+            end=end,
+        )
+
+    def cancel(self) -> None:
+        """Ask the running load to stop between chunks."""
+        super().cancel()
+        self.data_loader.cancel()
 
     def run(self) -> None:
+        if self.headers_only:
+            self.headers_loaded.emit(self.data_loader.read_headers(self.file_list))
+            return
         try:
-            data_loader = DataLoader()
-            data_loader.load_data(self.file_list)
-            self.finished.emit(data_loader.df)
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+            self.data_loader.load_data(self.file_list, columns=self.columns)
+        except LoadCancelled:
+            return  # the scheduler emits `cancelled`
+        if self.data_loader.cache is not None and not self.data_loader.follow:
+            self.cache_hits = self.data_loader.cache_hits
+            self.cache_misses = self.data_loader.cache_misses
+        if self.log_path:
+            self.data_loader.instrumentation.write_log(
+                self.log_path,
+                'load',
+                files=len(self.file_list),
+                columns=self.columns,
+                cache_hits=self.cache_hits,
+                cache_misses=self.cache_misses,
+                rows_dropped=self.data_loader.rows_dropped,
+            )
+        if not self.is_cancelled():
+            self.finished.emit(self.data_loader.df)
+
+
+class TailWorker(Job):
+    appended = Signal(int)
+
+    def __init__(self, data_loader: DataLoader) -> None:
+        super().__init__()
+        self.data_loader = data_loader
+
+    def run(self) -> None:
+        self.appended.emit(self.data_loader.tail())
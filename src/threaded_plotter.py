@@ -1,10 +1,19 @@
-from PySide6.QtCore import QThread, Signal
+from datetime import datetime
+
+from PySide6.QtCore import Signal
 from plotly.graph_objects import Figure
+from src.config import DEFAULT_MAX_POINTS
+from src.derived import DerivedChannels
+from src.export import ExportOptions, export_html, figure_to_json
+from src.figure_cache import CachedFigure, FigureCache, FigureKey
+from src.instrumentation import TOTAL_STAGE, Instrumentation
 from src.plotter import Plotter
+from src.scheduler import Job
 
 
-class PlotWorker(QThread):
+class PlotWorker(Job):
     finished = Signal(Figure)
+    figure_json = Signal(str)
 
     def __init__(
         self,
@@ -15,6 +24,18 @@ class PlotWorker(QThread):
         show: bool = True,
         write_html: bool = False,
         save_loc: str | None = None,
+        downsample_mode: str | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+        render_mode: str = 'auto',
+        embed: bool = False,
+        figure_cache: FigureCache | None = None,
+        data_version: int = 0,
+        export_options: ExportOptions | None = None,
+        trace_memory: bool = False,
+        log_path: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        derived: DerivedChannels | None = None,
     ) -> None:
         super().__init__()
         self.title = title
@@ -24,12 +45,84 @@ class PlotWorker(QThread):
         self.show = show
         self.write_html = write_html
         self.save_loc = save_loc
+        self.downsample_mode = downsample_mode
+        self.max_points = max_points
+        self.render_mode = render_mode
+        self.embed = embed
+        self.figure_cache = figure_cache
+        self.data_version = data_version
+        self.export_options = export_options
+        self.cache_hit: bool = False
+        self.log_path = log_path
+        self.start = start
+        self.end = end
+        self.derived = derived
+        self.instrumentation = Instrumentation(trace_memory)
 
-    def run(self) -> None:
-        plotter = Plotter(self.title, self.x_axis, self.traces, self.data)
+    def _get_figure(self) -> CachedFigure:
+        key = FigureKey(
+            data_version=self.data_version,
+            x_axis=self.x_axis,
+            traces=tuple(self.traces),
+            title=self.title,
+            downsample_mode=self.downsample_mode,
+            max_points=self.max_points,
+            render_mode=self.render_mode,
+            start=self.start,
+            end=self.end,
+        )
+        if self.figure_cache is not None:
+            entry = self.figure_cache.get(key)
+            if entry is not None:
+                self.cache_hit = True
+                return entry
+
+        plotter = Plotter(
+            self.title,
+            self.x_axis,
+            self.traces,
+            self.data,
+            downsample_mode=self.downsample_mode,
+            max_points=self.max_points,
+            render_mode=self.render_mode,
+            instrumentation=self.instrumentation,
+            start=self.start,
+            end=self.end,
+            derived=self.derived,
+            data_version=self.data_version,
+        )
         fig = plotter.create_fig()
-        if self.show:
-            fig.show()
-        if self.write_html:
-            fig.write_html(self.save_loc)
+        if self.figure_cache is None:
+            return CachedFigure(fig)
+        return self.figure_cache.put(key, fig)
+
+    def run(self) -> None:
+        stage = self.instrumentation.stage
+        with stage(TOTAL_STAGE, rows=len(self.data)):
+            entry = self._get_figure()
+            fig = entry.fig
+            if self.is_cancelled():
+                return  # superseded by a newer plot. The figure stays cached.
+            if self.embed:  # serialized here so the GUI thread only hands it over
+                if entry.json is None:
+                    with stage('serialize'):
+                        entry.json = figure_to_json(fig)
+                if self.is_cancelled():
+                    return
+                self.figure_json.emit(entry.json)
+            elif self.show:
+                with stage('show'):
+                    fig.show(renderer='browser')
+            if self.write_html:
+                with stage('write_html'):
+                    export_html(fig, self.save_loc, self.export_options)
+
+        if self.log_path:
+            self.instrumentation.write_log(
+                self.log_path,
+                'save' if self.write_html else 'plot',
+                traces=[trace for trace in self.traces if trace != 'None'],
+                x_axis=self.x_axis,
+                figure_cache_hit=self.cache_hit,
+            )
         self.finished.emit(fig)
@@ -0,0 +1,37 @@
+import os
+
+from PySide6.QtCore import Signal
+
+from src.scheduler import Job
+
+# Files looked up between updates of the file list
+STAT_BATCH_FILES = 256
+
+
+class FileSizeWorker(Job):
+    """
+    Look up the size of every file off the GUI thread, reporting them in batches
+    so a long list on a network share fills in as the sizes arrive.
+    """
+
+    sizes_found = Signal(int, list)  # the index of the first file, sizes in bytes
+
+    def __init__(self, file_paths: list[str]) -> None:
+        super().__init__()
+        self.file_paths = file_paths
+
+    def run(self) -> None:
+        first = 0
+        sizes: list[int] = []
+        for index, path in enumerate(self.file_paths):
+            if self.is_cancelled():
+                return
+            try:
+                sizes.append(os.stat(path).st_size)
+            except OSError:
+                sizes.append(-1)  # missing or unreadable
+            if len(sizes) == STAT_BATCH_FILES:
+                self.sizes_found.emit(first, sizes)
+                first, sizes = index + 1, []
+        if sizes:
+            self.sizes_found.emit(first, sizes)
@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Which file's rows to keep for a timestamp found in more than one file
+DUPLICATE_MODES = ('first', 'last')
+# Set in DataFrame.attrs to whether 'Time' is in order, so searchsorted can be used
+TIME_SORTED_ATTR = 'time_sorted'
+# NaT is the smallest int64. Ordering it as the largest puts it last, like np.sort.
+_NAT_KEY = np.iinfo(np.int64).max
+
+
+@dataclass
+class MergeResult:
+    """How to put the rows of several files in time order."""
+
+    order: np.ndarray | None  # the rows to take, or None to keep them as they are
+    dropped: int  # rows left out as duplicates
+    files_sorted: list[bool]  # whether each file was already in time order
+
+
+def _time_keys(times: np.ndarray) -> np.ndarray:
+    """View datetimes as int64 epoch values that order NaT last."""
+    keys = times.view(np.int64)
+    nat = np.isnat(times)
+    if nat.any():
+        keys = np.where(nat, _NAT_KEY, keys)
+    return keys
+
+
+def is_time_sorted(times: np.ndarray) -> bool:
+    """
+    Check that datetimes never go backwards, with any NaT at the end.
+
+    Args:
+        times (np.ndarray): datetime64 values.
+
+    Returns:
+        bool: True if `np.searchsorted` can be used on `times`.
+    """
+    keys = _time_keys(times)
+    return not np.any(keys[1:] < keys[:-1])
+
+
+def merge_by_time(
+    times: np.ndarray, lengths: list[int], duplicates: str | None = None
+) -> MergeResult:
+    """
+    Work out the order that merges files, stored one after another, by time.
+
+    The rows of each file are usually in time order already, so the files
+    are checked in one pass for the points where time goes backwards. Files
+    that follow each other need no reordering, and files that don't overlap
+    are reordered whole. Overlapping files are merged with NumPy's stable
+    sort, which is a timsort that finds the already sorted run of each file
+    and merges the runs, so it costs close to a k-way merge and much less
+    than sorting unordered rows. Rows with the same time keep the order of
+    the files. Every row is kept unless `duplicates` is given. Stand logs
+    repeat a timestamp for every row written in the same second, so only
+    timestamps found in more than one file, such as the overlap between two
+    exports of the same log, count as duplicates. Files that merely meet in
+    the same second share a timestamp too, and lose distinct rows to it, so
+    dropping them is left to the caller to ask for.
+
+    Args:
+        times (np.ndarray): The datetime64 'Time' values of every file, one
+            file after another.
+        lengths (list[int]): The number of rows of each file, in order.
+        duplicates (str | None): For a timestamp found in more than one file,
+            keep the rows of the 'first' or the 'last' of those files in
+            `lengths` order. None, the default, keeps them all.
+
+    Raises:
+        ValueError: If `duplicates` is not one of DUPLICATE_MODES or None.
+
+    Returns:
+        MergeResult: The rows to take and how many were dropped.
+    """
+    if duplicates is not None and duplicates not in DUPLICATE_MODES:
+        raise ValueError(f'Unknown duplicates mode "{duplicates}".')
+
+    keys = _time_keys(times)
+    ends = np.cumsum(lengths, dtype=np.int64)
+    starts = ends - np.asarray(lengths, dtype=np.int64)
+    # Rows where time goes backwards, and which file each one is in
+    descents = np.flatnonzero(keys[1:] < keys[:-1]) + 1
+    descent_files = np.searchsorted(ends, descents, side='right')
+    files_sorted = [True] * len(lengths)
+    for file in descent_files[descents != starts[descent_files]]:
+        files_sorted[file] = False
+
+    files = [i for i, length in enumerate(lengths) if length > 0]
+    order: np.ndarray | None = None
+    if len(descents) == 0:
+        if not _has_shared_times(keys, starts[files], ends[files], duplicates):
+            return MergeResult(None, 0, files_sorted)
+        order = np.arange(len(keys))
+    elif all(files_sorted):
+        by_start = sorted(files, key=lambda i: (keys[starts[i]], i))
+        first_keys = np.array([keys[starts[i]] for i in by_start])
+        last_keys = np.array([keys[ends[i] - 1] for i in by_start])
+        if np.all(first_keys[1:] >= last_keys[:-1]):
+            # The files don't overlap, so they only need putting in order
+            order = np.concatenate([np.arange(starts[i], ends[i]) for i in by_start])
+            if not _has_shared_times(
+                keys, starts[by_start], ends[by_start], duplicates
+            ):
+                return MergeResult(order, 0, files_sorted)
+
+    if order is None:
+        order = np.argsort(keys, kind='stable')
+    if duplicates is None or len(files) < 2:
+        return MergeResult(order, 0, files_sorted)
+
+    keep = _keep_one_file_per_time(keys[order], order, ends, duplicates)
+    dropped = len(keep) - int(np.count_nonzero(keep))
+    return MergeResult(order[keep], dropped, files_sorted)
+
+
+def _has_shared_times(
+    keys: np.ndarray, starts: np.ndarray, ends: np.ndarray, duplicates: str | None
+) -> bool:
+    """Whether consecutive, sorted files share a timestamp where they meet."""
+    if duplicates is None or len(starts) < 2:
+        return False
+    last_keys = keys[ends[:-1] - 1]
+    return bool(np.any((keys[starts[1:]] == last_keys) & (last_keys != _NAT_KEY)))
+
+
+def _keep_one_file_per_time(
+    sorted_keys: np.ndarray, order: np.ndarray, ends: np.ndarray, duplicates: str
+) -> np.ndarray:
+    """
+    Mark the rows to keep so each timestamp's rows come from a single file.
+
+    Args:
+        sorted_keys (np.ndarray): The time keys, in merged order.
+        order (np.ndarray): The original row of each merged row.
+        ends (np.ndarray): The end row of each file.
+        duplicates (str): 'first' or 'last'.
+
+    Returns:
+        np.ndarray: A boolean mask over the merged rows.
+    """
+    file_ids = np.searchsorted(ends, order, side='right')
+    new_time = np.empty(len(sorted_keys), dtype=bool)
+    new_time[:1] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=new_time[1:])
+    reduce = np.minimum if duplicates == 'first' else np.maximum
+    chosen = reduce.reduceat(file_ids, np.flatnonzero(new_time))
+    group = np.cumsum(new_time) - 1
+    return (file_ids == chosen[group]) | (sorted_keys == _NAT_KEY)
@@ -0,0 +1,30 @@
+import numpy as np
+from pandas import Series, factorize, to_datetime
+from pandas.api.types import is_datetime64_any_dtype
+
+TIME_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+
+
+def parse_time(values: Series) -> Series:
+    """
+    Parse a column of 'Time' strings into datetime64[ns].
+
+    Test stand logs repeat the same timestamp for every row written in the
+    same second, so each unique string is parsed once and the results are
+    scattered back to the rows. Strings that don't match TIME_FORMAT become NaT.
+
+    Args:
+        values (Series): The 'Time' column as read from the CSV file. A column
+            that is already datetime64 is returned unchanged.
+
+    Returns:
+        Series: The parsed times, with the same index and name as `values`.
+    """
+    if is_datetime64_any_dtype(values):
+        return values
+
+    codes, uniques = factorize(values)
+    parsed = to_datetime(uniques, format=TIME_FORMAT, errors='coerce').to_numpy()
+    # factorize marks missing values with -1, which picks up the trailing NaT
+    parsed = np.append(parsed, np.datetime64('NaT', 'ns'))
+    return Series(parsed[codes], index=values.index, name=values.name)
@@ -0,0 +1,205 @@
+import csv
+from datetime import datetime
+from typing import BinaryIO
+
+import numpy as np
+
+from src.time_parser import TIME_FORMAT
+
+# Lines tried after a row whose 'Time' can't be read before giving up on a probe
+MAX_PROBE_LINES = 8
+LAST_ROW_PROBE_BYTES = 4096
+# Evenly spaced rows whose times must be in order before a file is searched
+SORTED_PROBES = 16
+
+
+def check_window(start: datetime | None, end: datetime | None) -> None:
+    """
+    Raises:
+        ValueError: If `end` is before `start`.
+    """
+    if start is not None and end is not None and end < start:
+        raise ValueError('The end of the time window is before its start.')
+
+
+def window_rows(
+    times: np.ndarray,
+    start: datetime | None,
+    end: datetime | None,
+    time_sorted: bool,
+) -> slice | np.ndarray:
+    """
+    Find the rows whose time falls in a window, start and end included.
+
+    Sorted times are searched with `np.searchsorted`, which costs a few
+    comparisons and gives a slice, so the rows of every column are taken as a
+    view. Unsorted times are compared row by row. Rows without a time (NaT)
+    are only kept when there is no window.
+
+    Args:
+        times (np.ndarray): datetime64 values.
+        start (datetime | None): The first time to keep, or None for no limit.
+        end (datetime | None): The last time to keep, or None for no limit.
+        time_sorted (bool): Whether `times` is in order with any NaT at the end,
+            see `is_time_sorted`.
+
+    Returns:
+        slice | np.ndarray: A slice of the rows, or a boolean mask over them.
+    """
+    if start is None and end is None:
+        return slice(None)
+    low = np.datetime64(start, 'ns') if start is not None else None
+    high = np.datetime64(end, 'ns') if end is not None else None
+    if time_sorted:
+        first = np.searchsorted(times, low, side='left') if low is not None else 0
+        # NaT sorts after every time, so both stop before the NaT rows
+        if high is not None:
+            last = np.searchsorted(times, high, side='right')
+        else:
+            last = np.searchsorted(times, np.datetime64('NaT', 'ns'), side='left')
+        return slice(int(first), int(max(first, last)))
+
+    mask = ~np.isnat(times)
+    if low is not None:
+        mask &= times >= low
+    if high is not None:
+        mask &= times <= high
+    return mask
+
+
+def _read_time(line: bytes, time_index: int) -> datetime | None:
+    try:
+        row = next(csv.reader([line.decode('utf-8', errors='ignore')]))
+        return datetime.strptime(row[time_index].strip(), TIME_FORMAT)
+    except (StopIteration, IndexError, ValueError):
+        return None
+
+
+def _row_start(f: BinaryIO, offset: int, data_start: int) -> int:
+    """The offset of the first row that starts at or after `offset`."""
+    if offset <= data_start:
+        return data_start
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def _time_from(
+    f: BinaryIO, row_start: int, size: int, time_index: int
+) -> datetime | None:
+    """The time of the first readable row from `row_start`, or None if there is none."""
+    f.seek(row_start)
+    for _ in range(MAX_PROBE_LINES):
+        if f.tell() >= size:
+            return None
+        time = _read_time(f.readline(), time_index)
+        if time is not None:
+            return time
+    return None
+
+
+def _last_time(
+    f: BinaryIO, data_start: int, size: int, time_index: int
+) -> datetime | None:
+    f.seek(max(data_start, size - LAST_ROW_PROBE_BYTES))
+    for line in reversed(f.read(size - f.tell()).splitlines()):
+        time = _read_time(line, time_index)
+        if time is not None:
+            return time
+    return None
+
+
+def _looks_sorted(
+    f: BinaryIO, data_start: int, size: int, time_index: int, last_time: datetime
+) -> bool:
+    """
+    Whether the times of SORTED_PROBES evenly spaced rows, and of the last row,
+    never go backwards. Rows whose time can't be read are skipped.
+    """
+    times = []
+    for i in range(SORTED_PROBES):
+        offset = data_start + (size - data_start) * i // SORTED_PROBES
+        time = _time_from(f, _row_start(f, offset, data_start), size, time_index)
+        if time is not None:
+            times.append(time)
+    times.append(last_time)
+    return all(a <= b for a, b in zip(times, times[1:]))
+
+
+def _first_row_after(
+    f: BinaryIO,
+    data_start: int,
+    size: int,
+    time_index: int,
+    target: datetime,
+    strict: bool,
+) -> int:
+    """
+    Binary search the rows by byte offset for the first row whose time is at
+    or after `target`, or after it with `strict`.
+    """
+    low, high = data_start, size
+    while low < high:
+        middle = (low + high) // 2
+        row = _row_start(f, middle, data_start)
+        time = _time_from(f, row, size, time_index) if row < size else None
+        if time is None or time > target or (not strict and time == target):
+            high = middle
+        else:
+            low = middle + 1
+    return min(_row_start(f, low, data_start), size)
+
+
+def window_byte_range(
+    f: BinaryIO,
+    data_start: int,
+    size: int,
+    time_index: int,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[int, int]:
+    """
+    Find the bytes of a CSV file that hold the rows of a time window.
+
+    Stand logs are written in time order, so the rows in the window are one
+    run of bytes. Its ends are found by a binary search over byte offsets
+    that reads one line per step, so finding them reads a few kilobytes
+    whatever the size of the file. A file that ends before the window starts,
+    or starts after it ends, is found from its first and last rows alone.
+    The search is only right for a file in time order, so the times of
+    SORTED_PROBES evenly spaced rows are checked first, and a file whose clock
+    is seen going backwards, such as after a clock reset, is read whole for
+    the caller to pick the rows of the window from, see `window_rows`.
+
+    Args:
+        f (BinaryIO): The open file.
+        data_start (int): The offset of the first row after the header.
+        size (int): The size of the file.
+        time_index (int): The position of 'Time' in each row.
+        start (datetime | None): The first time to keep, or None for no limit.
+        end (datetime | None): The last time to keep, or None for no limit.
+
+    Returns:
+        tuple[int, int]: The offsets of the first row in the window and just past
+            the last one. Equal when no rows fall in the window. Every row when
+            the file's first or last time can't be read or it isn't in time
+            order.
+    """
+    first_time = _time_from(f, data_start, size, time_index)
+    last_time = _last_time(f, data_start, size, time_index)
+    if first_time is None or last_time is None:
+        return data_start, size  # no readable times to search by
+    if not _looks_sorted(f, data_start, size, time_index, last_time):
+        return data_start, size
+    ends_before = start is not None and last_time < start
+    starts_after = end is not None and first_time > end
+    if ends_before or starts_after:
+        return size, size
+
+    first = data_start
+    if start is not None and first_time < start:
+        first = _first_row_after(f, data_start, size, time_index, start, strict=False)
+    last = size
+    if end is not None and last_time > end:
+        last = _first_row_after(f, first, size, time_index, end, strict=True)
+    return first, max(first, last)
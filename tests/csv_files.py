@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.time_parser import TIME_FORMAT
+
+START_TIME = datetime(2025, 1, 6, 6, 0, 0)
+STATUSES = ('Ready', 'Beam On', '')  # an empty status is read as missing
+
+
+def seconds(count: int, start: datetime = START_TIME) -> list[datetime]:
+    """One timestamp per second."""
+    return [start + timedelta(seconds=i) for i in range(count)]
+
+
+def write_csv(path: Path, times: list[datetime], seed: int = 0) -> Path:
+    """
+    Write a CSV file with a test stand's raw headers, two channels and a text
+    Status column, one row per time.
+    """
+    rng = np.random.default_rng(seed)
+    rows = len(times)
+    pd.DataFrame(
+        {
+            'Time': [time.strftime(TIME_FORMAT) for time in times],
+            'Beam Voltage (kV)': np.round(30 + rng.normal(size=rows), 3),
+            'Total Current (uA)': np.round(260 + rng.normal(size=rows), 2),
+            'Status': [STATUSES[i % len(STATUSES)] for i in range(rows)],
+        }
+    ).to_csv(path, index=False)
+    return path
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from src.compact import compact_frame, memory_report
+from src.loader import DataLoader
+from tests.csv_files import seconds, write_csv
+
+
+def test_loaded_text_columns_become_categories(tmp_path) -> None:
+    path = str(write_csv(tmp_path / 'run.csv', seconds(1_000)))
+    df = DataLoader().load_data([path])
+    before = memory_report(df).column_bytes['Status']
+    original = df.copy()
+
+    compact_frame(df)
+
+    assert isinstance(df['Status'].dtype, pd.CategoricalDtype)
+    assert memory_report(df).column_bytes['Status'] < before
+    pd.testing.assert_series_equal(
+        df['Status'].astype(object), original['Status'].astype(object)
+    )
+
+
+def test_values_are_unchanged() -> None:
+    df = pd.DataFrame(
+        {
+            'Beam Voltage (V)': np.round(np.linspace(29, 31, 100), 3),
+            'Counts': np.arange(100, dtype=np.int64),
+            'Status': pd.Series([f'Step {i}' for i in range(100)], dtype=object),
+        }
+    )
+    original = df.copy()
+
+    compact_frame(df)
+
+    assert df['Beam Voltage (V)'].dtype == np.float32
+    assert df['Counts'].dtype == np.int8
+    assert df['Status'].dtype == object  # every value is different
+    np.testing.assert_array_equal(
+        df['Beam Voltage (V)'].astype(str), original['Beam Voltage (V)'].astype(str)
+    )
+    pd.testing.assert_series_equal(df['Counts'], original['Counts'], check_dtype=False)
@@ -0,0 +1,10 @@
+from src.config import _installed
+
+
+def test_installed_finds_a_module() -> None:
+    assert _installed('json')
+
+
+def test_installed_without_the_parent_package() -> None:
+    # find_spec raises for a submodule of a package that isn't installed
+    assert not _installed('no_such_package.submodule')
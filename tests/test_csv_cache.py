@@ -0,0 +1,50 @@
+import pandas as pd
+
+from src.csv_cache import CSVCache
+from src.loader import DataLoader
+from tests.csv_files import seconds, write_csv
+
+
+def test_text_columns_round_trip(tmp_path) -> None:
+    path = str(write_csv(tmp_path / 'run.csv', seconds(100)))
+    cache = CSVCache(cache_dir=tmp_path / 'cache')
+    df = DataLoader().load_data([path])
+
+    cache.put(path, df, ['Time', 'Beam Voltage (kV)', 'Total Current (uA)', 'Status'])
+    cached = cache.get(path)
+
+    assert cached is not None
+    cached_df, headers = cached
+    assert headers[-1] == 'Status'
+    pd.testing.assert_frame_equal(
+        cached_df, df, check_dtype=False, check_index_type=False
+    )
+    assert cached_df['Status'].isna().sum() == df['Status'].isna().sum() > 0
+
+
+def test_second_load_is_a_cache_hit(tmp_path) -> None:
+    path = str(write_csv(tmp_path / 'run.csv', seconds(100)))
+    cache = CSVCache(cache_dir=tmp_path / 'cache')
+
+    first = DataLoader(cache=cache)
+    first_df = first.load_data([path])
+    second = DataLoader(cache=cache)
+    second_df = second.load_data([path])
+
+    assert (first.cache_hits, first.cache_misses) == (0, 1)
+    assert (second.cache_hits, second.cache_misses) == (1, 0)
+    pd.testing.assert_frame_equal(
+        second_df, first_df, check_dtype=False, check_index_type=False
+    )
+
+
+def test_windowed_get_reads_only_the_window(tmp_path) -> None:
+    times = seconds(100)
+    path = str(write_csv(tmp_path / 'run.csv', times))
+    cache = CSVCache(cache_dir=tmp_path / 'cache')
+    DataLoader(cache=cache).load_data([path])
+
+    cached = cache.get(path, start=times[10], end=times[19])
+
+    assert cached is not None
+    assert len(cached[0]) == 10
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.derived import DerivedChannel
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'Angular Intensity (mA/sr)': [0.1, 0.2, 0.4, 0.8],
+            'Total Current (A)': [2.0, 4.0, 0.0, -1.0],
+            'Status': ['Ready', 'Beam On', 'Beam On', 'Ready'],
+        }
+    )
+
+
+def test_expression_is_evaluated_over_every_row() -> None:
+    df = make_data()
+    channel = DerivedChannel(
+        'Ratio',
+        'abs({Angular Intensity (mA/sr)} / {Total Current (A)}) * 1000 - 2 ** 2',
+    )
+
+    values = channel.evaluate(df, chunk_rows=3)
+
+    intensity = df['Angular Intensity (mA/sr)'].to_numpy()
+    current = df['Total Current (A)'].to_numpy()
+    with np.errstate(divide='ignore'):
+        expected = np.abs(intensity / current) * 1000 - 4
+    np.testing.assert_array_equal(values, expected)
+    assert channel.columns == ('Angular Intensity (mA/sr)', 'Total Current (A)')
+
+
+def test_functions_of_two_columns() -> None:
+    df = make_data()
+    channel = DerivedChannel(
+        'Larger', 'max({Total Current (A)}, {Angular Intensity (mA/sr)})'
+    )
+
+    np.testing.assert_array_equal(channel.evaluate(df), [2.0, 4.0, 0.4, 0.8])
+
+
+@pytest.mark.parametrize(
+    'expression',
+    [
+        '{Total Current (A)} + x',  # a name that isn't a column
+        '__import__("os").system("true") + {Total Current (A)}',
+        '{Total Current (A)}.real',  # an attribute
+        '{Total Current (A)}.__class__',
+        'eval("1") + {Total Current (A)}',  # a call to a function not allowed
+        'np.sin({Total Current (A)})',  # a call through an attribute
+        'sqrt({Total Current (A)}, 2)',  # the wrong number of arguments
+        'sqrt(x={Total Current (A)})',
+        '{Total Current (A)}[0]',  # a subscript
+        '[{Total Current (A)}][0]',
+        '{Total Current (A)} + "1"',  # a string
+        '{Total Current (A)} if True else 0',
+        'lambda: {Total Current (A)}',
+        '{Total Current (A)} > 0',
+        '_column1 + {Total Current (A)}',  # a placeholder past the columns
+        '2 + 2',  # no columns
+        '{Total Current (A)} +',
+    ],
+)
+def test_anything_outside_the_allowed_list_is_rejected(expression: str) -> None:
+    with pytest.raises(ValueError):
+        DerivedChannel('Bad', expression)
+
+
+@pytest.mark.parametrize('name', ['', 'Time', 'None', '{Total Current (A)}'])
+def test_reserved_names_are_rejected(name: str) -> None:
+    with pytest.raises(ValueError):
+        DerivedChannel(name, '{Total Current (A)} * 2')
+
+
+@pytest.mark.parametrize(
+    'column, message', [('Status', 'not numeric'), ('Pressure', 'not found')]
+)
+def test_columns_that_cant_be_used(column: str, message: str) -> None:
+    channel = DerivedChannel('Bad', f'{{{column}}} * 2')
+
+    with pytest.raises(ValueError, match=message):
+        channel.evaluate(make_data())
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from src.csv_cache import CSVCache
+from src.loader import CSVHeaderError, DataLoader, ReadOptions
+from src.time_parser import TIME_FORMAT
+from tests.csv_files import START_TIME, seconds, write_csv
+
+
+HEADERS = ['Time', 'Beam Voltage (kV)', 'Total Current (uA)', 'Status']
+
+
+@pytest.mark.parametrize('chunk_rows', [None, 64])
+def test_read_csv_checks_the_header_and_parses_on_one_handle(
+    tmp_path, chunk_rows: int | None
+) -> None:
+    times = seconds(500)
+    path = str(write_csv(tmp_path / 'run.csv', times))
+
+    result = DataLoader._read_csv(path, ReadOptions(chunk_rows=chunk_rows), HEADERS)
+
+    assert result.headers == HEADERS
+    assert list(result.df.columns) == DataLoader.rename_headers(HEADERS)
+    assert list(result.df['Time']) == times
+    expected = pd.read_csv(path)
+    assert list(result.df['Beam Voltage (V)']) == list(expected['Beam Voltage (kV)'])
+    assert result.stats.rows == 500
+
+
+def test_read_csv_parses_only_the_requested_columns(tmp_path) -> None:
+    path = str(write_csv(tmp_path / 'run.csv', seconds(100)))
+
+    result = DataLoader._read_csv(path, ReadOptions(columns=['Total Current (A)']))
+
+    assert list(result.df.columns) == ['Time', 'Total Current (A)']
+
+
+@pytest.mark.parametrize(
+    'text, reference_headers',
+    [
+        ('Time,Beam Voltage (kV)\n01/06/2025 06:00:00 AM,30\n', HEADERS),
+        ('Date,Beam Voltage (kV)\n01/06/2025 06:00:00 AM,30\n', None),
+        ('01/06/2025 06:00:00 AM,30.1\n01/06/2025 06:00:01 AM,30.2\n', None),
+    ],
+    ids=['other headers', 'no time', 'no header row'],
+)
+def test_read_csv_rejects_bad_headers(
+    tmp_path, text: str, reference_headers: list[str] | None
+) -> None:
+    path = tmp_path / 'bad.csv'
+    path.write_text(text)
+
+    with pytest.raises(CSVHeaderError):
+        DataLoader._read_csv(str(path), ReadOptions(), reference_headers)
+
+
+def test_rows_past_the_estimate_are_all_loaded(tmp_path) -> None:
+    times = seconds(5_000)
+    path = str(write_csv(tmp_path / 'run.csv', times))
+    # Short rows after the sampled ones, so the estimate falls short
+    row = f'{times[-1].strftime(TIME_FORMAT)},1,2,\n'
+    with open(path, 'a') as f:
+        f.writelines(row for _ in range(5_000))
+
+    loader = DataLoader(chunk_rows=1_000)
+    df = loader.load_data([path])
+
+    assert loader._expected_rows[0] < 10_000
+    assert len(df) == 10_000
+
+
+def test_bad_header_fails_before_any_file_is_parsed(tmp_path) -> None:
+    good = str(write_csv(tmp_path / 'good.csv', seconds(100)))
+    bad = tmp_path / 'bad.csv'
+    bad.write_text('Foo,Bar\n1,2\n')
+
+    loader = DataLoader()
+    with pytest.raises(CSVHeaderError):
+        loader.load_data([good, str(bad)])
+
+    stages = {record.name for record in loader.instrumentation.records}
+    assert 'read_csv' not in stages
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_window_of_a_file_whose_clock_went_back(tmp_path, cached: bool) -> None:
+    # The clock was set back five minutes half way through the log
+    times = seconds(600) + seconds(600, start=START_TIME + timedelta(minutes=5))
+    path = str(write_csv(tmp_path / 'run.csv', times))
+    cache = CSVCache(cache_dir=tmp_path / 'cache') if cached else None
+    start = START_TIME + timedelta(minutes=6)
+    end = START_TIME + timedelta(minutes=8)
+
+    full = DataLoader(cache=cache).load_data([path])
+    windowed = DataLoader(cache=cache, start=start, end=end).load_data([path])
+
+    expected = full[(full['Time'] >= start) & (full['Time'] <= end)]
+    assert len(expected) == 2 * 121
+    pd.testing.assert_frame_equal(
+        windowed.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+    )
@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.generate import generate_csvs
+from benchmarks.memory import allowed_peak, peak_memory
+from src.loader import DataLoader
+
+
+@pytest.mark.parametrize(
+    'files, rows, chunk_rows, workers',
+    [
+        (1, 5_000, 10_000, 1),  # smaller than a chunk
+        (2, 20_000, 20_000, 1),  # one chunk per file
+        (2, 50_000, 10_000, 1),
+        (4, 20_000, 10_000, 3),  # parsed by worker processes
+    ],
+)
+def test_load_peaks_within_its_allowance(
+    tmp_path, files: int, rows: int, chunk_rows: int, workers: int
+) -> None:
+    file_paths = generate_csvs(tmp_path, files, rows)
+    loader = DataLoader(workers=workers, chunk_rows=chunk_rows)
+
+    table_bytes, peak = peak_memory(loader, file_paths)
+
+    assert len(loader.df) == files * rows
+    assert peak <= allowed_peak(loader, table_bytes)
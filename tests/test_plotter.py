@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.downsample import DOWNSAMPLE_MODES
+from src.plotter import Plotter
+
+ROWS = 50_000
+START_TIME = datetime(2025, 1, 6, 6, 0, 0)
+
+
+def make_data() -> pd.DataFrame:
+    """Two channels whose downsampled points fall on different rows."""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            'Time': pd.date_range(START_TIME, periods=ROWS, freq='s'),
+            'Beam Voltage (V)': np.cumsum(rng.normal(size=ROWS)),
+            'Total Current (A)': np.sin(np.arange(ROWS) / 500) + rng.normal(size=ROWS),
+        }
+    )
+
+
+def check_traces(fig, df: pd.DataFrame, traces: list[str]) -> None:
+    """Each trace's points must be rows of the data, with matching x and y."""
+    assert len(fig.data) == len(traces)
+    for trace, column in zip(fig.data, traces):
+        values = pd.Series(df[column].to_numpy(), index=df['Time'])
+        x = pd.to_datetime(np.asarray(trace.x))
+        assert len(x) > 0
+        np.testing.assert_array_equal(values.loc[x].to_numpy(), np.asarray(trace.y))
+
+
+@pytest.mark.parametrize('mode', DOWNSAMPLE_MODES)
+def test_downsampled_traces_keep_their_own_rows(mode: str) -> None:
+    df = make_data()
+    traces = ['Beam Voltage (V)', 'Total Current (A)']
+    fig = Plotter(
+        'Test', 'Time', traces, df, downsample_mode=mode, max_points=1_000
+    ).create_fig()
+
+    check_traces(fig, df, traces)
+    for trace in fig.data:
+        assert pd.Timestamp(trace.x[-1]) == df['Time'].iloc[-1]
+
+
+@pytest.mark.parametrize('mode', DOWNSAMPLE_MODES)
+def test_downsampled_traces_in_a_time_window(mode: str) -> None:
+    df = make_data()
+    traces = ['Beam Voltage (V)', 'Total Current (A)']
+    start, end = df['Time'].iloc[10_000], df['Time'].iloc[30_000]
+    fig = Plotter(
+        'Test',
+        'Time',
+        traces,
+        df,
+        downsample_mode=mode,
+        max_points=1_000,
+        start=start.to_pydatetime(),
+        end=end.to_pydatetime(),
+    ).create_fig()
+
+    check_traces(fig, df, traces)
+    for trace in fig.data:
+        x = pd.to_datetime(np.asarray(trace.x))
+        assert x.min() == start
+        assert x.max() == end
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.stats import ChannelStats, FileStats, combine
+from tests.csv_files import START_TIME
+
+
+def check_stats(stats: ChannelStats, values: np.ndarray) -> None:
+    """The running statistics must match NumPy's over every value at once."""
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (stats.minimum, stats.maximum) == (values.min(), values.max())
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 1_000, 100_000])
+def test_chunked_update_matches_numpy(chunk_rows: int) -> None:
+    values = np.random.default_rng(0).normal(30, 2, 10_000)
+    stats = ChannelStats()
+
+    for first in range(0, len(values), chunk_rows):
+        stats.update(values[first : first + chunk_rows])
+
+    check_stats(stats, values)
+
+
+def test_merge_matches_numpy() -> None:
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(mean, 1, size) for mean, size in ((5, 10), (-3, 500), (0, 1))]
+    stats = ChannelStats()
+
+    for part in parts:
+        other = ChannelStats()
+        other.update(part)
+        stats.merge(other)
+
+    check_stats(stats, np.concatenate(parts))
+
+
+def test_small_variation_around_a_large_value() -> None:
+    # Summing squares would lose this variance to rounding
+    values = 30_000 + np.random.default_rng(2).normal(0, 1e-3, 100_000)
+    stats = ChannelStats()
+
+    for first in range(0, len(values), 1_000):
+        stats.update(values[first : first + 1_000])
+
+    check_stats(stats, values)
+
+
+def test_missing_and_infinite_values_are_skipped() -> None:
+    stats = ChannelStats()
+
+    stats.update(np.array([1.0, np.nan, 3.0, np.inf, -np.inf]))
+
+    check_stats(stats, np.array([1.0, 3.0]))
+
+
+def test_a_single_value_has_no_std() -> None:
+    stats = ChannelStats()
+
+    stats.update(np.array([4.0]))
+
+    assert stats.count == 1
+    assert math.isnan(stats.std)
+
+
+def test_files_combine_to_the_stats_of_every_row() -> None:
+    df = pd.DataFrame(
+        {
+            'Time': pd.date_range(START_TIME, periods=300, freq='s'),
+            'Beam Voltage (V)': np.random.default_rng(3).normal(30, 1, 300),
+            'Status': ['Ready'] * 300,
+        }
+    )
+    files = [FileStats(str(i)) for i in range(3)]
+    for stats, first in zip(files, (0, 100, 200)):
+        stats.update(df.iloc[first : first + 100], chunk_rows=30)
+
+    total = combine(files)
+
+    assert total.rows == 300
+    assert (total.first_time, total.last_time) == (START_TIME, df['Time'].max())
+    assert list(total.channels) == ['Beam Voltage (V)']
+    check_stats(total.channels['Beam Voltage (V)'], df['Beam Voltage (V)'].to_numpy())
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from src.time_merge import is_time_sorted, merge_by_time
+
+
+def to_times(*files: list[int]) -> tuple[np.ndarray, list[int]]:
+    """The times of files stored one after another, from seconds after midnight."""
+    seconds = np.concatenate([np.asarray(file, dtype=np.int64) for file in files])
+    times = np.datetime64('2025-01-06T00:00:00', 's') + seconds
+    return times.astype('datetime64[ns]'), [len(file) for file in files]
+
+
+def merged(times: np.ndarray, lengths: list[int], duplicates=None) -> np.ndarray:
+    """The rows of every file in merged order."""
+    order = merge_by_time(times, lengths, duplicates).order
+    return np.arange(len(times)) if order is None else order
+
+
+def test_files_in_order_are_left_alone() -> None:
+    result = merge_by_time(*to_times([0, 1, 2], [3, 4]))
+
+    assert result.order is None
+    assert result.dropped == 0
+    assert result.files_sorted == [True, True]
+
+
+def test_files_picked_out_of_order_are_put_in_order() -> None:
+    times, lengths = to_times([3, 4], [0, 1, 2])
+
+    order = merged(times, lengths)
+
+    np.testing.assert_array_equal(order, [2, 3, 4, 0, 1])
+    assert is_time_sorted(times[order])
+
+
+def test_overlapping_files_are_interleaved() -> None:
+    times, lengths = to_times([0, 2, 4, 6], [1, 3, 5])
+
+    order = merged(times, lengths)
+
+    assert is_time_sorted(times[order])
+    np.testing.assert_array_equal(np.sort(order), np.arange(len(times)))
+
+
+def test_equal_times_keep_the_order_of_the_files() -> None:
+    # Several rows written in the same second, in both files
+    times, lengths = to_times([0, 1, 1, 1, 2], [1, 1, 3])
+
+    order = merged(times, lengths)
+
+    np.testing.assert_array_equal(order, [0, 1, 2, 3, 5, 6, 4, 7])
+
+
+def test_every_row_is_kept_by_default() -> None:
+    # The second file starts in the second the first one ends in
+    times, lengths = to_times([0, 1, 2, 2], [2, 3])
+
+    result = merge_by_time(times, lengths)
+
+    assert result.dropped == 0
+    assert result.order is None
+
+
+@pytest.mark.parametrize(
+    'duplicates, kept',
+    [('first', [0, 1, 2, 3, 6]), ('last', [0, 4, 5, 6])],
+)
+def test_shared_times_keep_one_file_when_asked(duplicates: str, kept: list) -> None:
+    # Two exports of the same log that overlap at seconds 1 and 2
+    times, lengths = to_times([0, 1, 2, 2], [1, 2, 3])
+
+    result = merge_by_time(times, lengths, duplicates)
+
+    assert result.order is not None
+    np.testing.assert_array_equal(result.order, kept)
+    assert result.dropped == len(times) - len(kept)
+
+
+def test_missing_times_go_last_and_are_never_dropped() -> None:
+    times, lengths = to_times([1, 2], [0, 1])
+    times[1] = np.datetime64('NaT')
+
+    result = merge_by_time(times, lengths, 'first')
+
+    assert result.order is not None
+    assert np.isnat(times[result.order[-1]])
+    assert result.dropped == 1  # the second file's second 1
+
+
+def test_unknown_duplicates_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        merge_by_time(*to_times([0], [1]), 'middle')
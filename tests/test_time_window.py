@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.time_parser import TIME_FORMAT
+from src.time_window import window_byte_range, window_rows
+from tests.csv_files import START_TIME, seconds, write_csv
+
+ROWS = 2_000
+
+
+def byte_range_rows(path, start, end) -> tuple[list[str], int, int]:
+    """The times of the rows in the bytes found for a window, and the file's size."""
+    with open(path, 'rb') as f:
+        f.readline()
+        data_start = f.tell()
+        size = f.seek(0, 2)
+        first, last = window_byte_range(f, data_start, size, 0, start, end)
+        f.seek(first)
+        lines = f.read(last - first).decode().splitlines()
+    return [line.split(',')[0] for line in lines], first, size
+
+
+def formatted(times) -> list[str]:
+    return [time.strftime(TIME_FORMAT) for time in times]
+
+
+@pytest.mark.parametrize(
+    'start, end',
+    [
+        (100, 199),
+        (0, 0),
+        (None, 10),  # open at the start
+        (1_990, None),  # open at the end
+        (-50, 5_000),  # wider than the file
+    ],
+)
+def test_bytes_hold_exactly_the_rows_of_the_window(tmp_path, start, end) -> None:
+    times = seconds(ROWS)
+    path = write_csv(tmp_path / 'run.csv', times)
+    window = [
+        START_TIME + timedelta(seconds=second) if second is not None else None
+        for second in (start, end)
+    ]
+
+    rows, _, _ = byte_range_rows(path, *window)
+
+    expected = [
+        time
+        for time in times
+        if (window[0] is None or time >= window[0])
+        and (window[1] is None or time <= window[1])
+    ]
+    assert rows == formatted(expected)
+
+
+@pytest.mark.parametrize('start', [-100, ROWS + 100])
+def test_window_outside_the_file_is_empty(tmp_path, start: int) -> None:
+    path = write_csv(tmp_path / 'run.csv', seconds(ROWS))
+    start_time = START_TIME + timedelta(seconds=start)
+
+    rows, first, size = byte_range_rows(
+        path, start_time, start_time + timedelta(seconds=50)
+    )
+
+    assert rows == []
+    assert first == size  # found without searching
+
+
+def test_repeated_seconds_are_all_in_the_window(tmp_path) -> None:
+    # Stand logs write several rows in the same second
+    times = sorted(seconds(500) * 3)
+    path = write_csv(tmp_path / 'run.csv', times)
+    start = START_TIME + timedelta(seconds=200)
+
+    rows, _, _ = byte_range_rows(path, start, start)
+
+    assert rows == formatted([start] * 3)
+
+
+def test_unsorted_file_is_read_whole(tmp_path) -> None:
+    times = seconds(ROWS // 2) + seconds(ROWS // 2, start=START_TIME)
+    path = write_csv(tmp_path / 'run.csv', times)
+    start = START_TIME + timedelta(seconds=100)
+
+    rows, _, _ = byte_range_rows(path, start, start + timedelta(seconds=10))
+
+    assert len(rows) == ROWS
+
+
+@pytest.mark.parametrize('sorted_times', [True, False])
+def test_window_rows_matches_comparing_every_row(sorted_times: bool) -> None:
+    times = pd.date_range(START_TIME, periods=ROWS, freq='s').to_numpy().copy()
+    times[-10:] = np.datetime64('NaT')
+    if not sorted_times:
+        times[: ROWS - 10] = np.random.default_rng(0).permutation(times[: ROWS - 10])
+    start, end = START_TIME + timedelta(seconds=50), START_TIME + timedelta(seconds=99)
+
+    rows = window_rows(times, start, end, sorted_times)
+
+    assert np.array_equal(
+        np.sort(times[rows]), pd.date_range(start, end, freq='s').to_numpy()
+    )